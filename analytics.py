@@ -0,0 +1,210 @@
+"""
+Usage analytics for SME Debt Management Tool
+Beacon batches from the browser are appended to a daily JSON-lines log; every
+minute a rollup adds the new log lines to per-day counts in SQLite, which the
+usage report reads
+"""
+
+import json
+import os
+import re
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+
+from sqlite_store import SQLiteStore
+
+try:
+    import fcntl
+except ImportError:  # Windows: one process, nothing to lock against
+    fcntl = None
+
+ACTIONS = ('page_view', 'form_submit', 'button_click', 'calculation')
+MAX_BEACON_BYTES = 64 * 1024  # as sent, possibly gzipped
+MAX_PAYLOAD_BYTES = 1024 * 1024  # after decompression
+MAX_EVENTS = 500  # per beacon
+ROLLUP_INTERVAL = 60.0  # seconds between rollups of the log into the usage tables
+MAX_LOG_BYTES = 64 * 1024 * 1024  # per daily log file; later events of that day are dropped
+RETENTION_DAYS = 400  # counted log files older than this are deleted; 0 keeps them all
+# Session ids as analytics.js makes them: session_<milliseconds>_<random base 36>
+SESSION_ID = re.compile(r'session_\d{1,16}_[0-9a-z]{1,12}')
+
+
+class BeaconError(ValueError):
+    """A beacon that is not a valid batch of events"""
+
+
+def parse_beacon(data, gzipped=False):
+    """Return (session id, [(action, page path)]) of a beacon body
+
+    The body is {"session": "...", "events": [{"action": ..., "page": ...}]},
+    gzipped by browsers that have CompressionStream. Events with an unknown
+    action are dropped, a session id not made by analytics.js is replaced by
+    '' (counted as no session); anything else a client sends is ignored.
+    """
+    if gzipped:
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            data = decompressor.decompress(data, MAX_PAYLOAD_BYTES)
+        except zlib.error as e:
+            raise BeaconError(f'invalid gzip data: {e}')
+        if decompressor.unconsumed_tail:
+            raise BeaconError('payload too large')
+    try:
+        payload = json.loads(data)
+    except (UnicodeDecodeError, ValueError) as e:
+        raise BeaconError(f'invalid JSON: {e}')
+    if not isinstance(payload, dict) or not isinstance(payload.get('events'), list):
+        raise BeaconError('expected an object with an events list')
+    if len(payload['events']) > MAX_EVENTS:
+        raise BeaconError(f'more than {MAX_EVENTS} events')
+
+    session = payload.get('session')
+    session = session if isinstance(session, str) and SESSION_ID.fullmatch(session) else ''
+    events = []
+    for event in payload['events']:
+        if not isinstance(event, dict) or event.get('action') not in ACTIONS:
+            continue
+        page = event.get('page')
+        events.append((event['action'], page[:200] if isinstance(page, str) else ''))
+    return session, events
+
+
+class AnalyticsLog(SQLiteStore):
+    """Append-only event log in log_dir with usage counts rolled up into SQLite
+
+    The log files are the record of every event; the usage and sessions tables
+    can be rebuilt from them by deleting the database, for the days whose logs
+    are still kept: a day's log stops growing at max_log_bytes, and the rollup
+    deletes counted logs older than retention_days. rollup_offsets says how
+    far each log file has been counted, so every line is counted exactly once
+    whichever worker runs the rollup.
+    """
+
+    SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS usage (
+        day TEXT NOT NULL,
+        tool TEXT NOT NULL,
+        lang TEXT NOT NULL,
+        action TEXT NOT NULL,
+        events INTEGER NOT NULL,
+        PRIMARY KEY (day, tool, lang, action)
+    );
+    CREATE TABLE IF NOT EXISTS sessions (
+        day TEXT NOT NULL,
+        tool TEXT NOT NULL,
+        session TEXT NOT NULL,
+        PRIMARY KEY (day, tool, session)
+    ) WITHOUT ROWID;
+    CREATE TABLE IF NOT EXISTS rollup_offsets (
+        file TEXT PRIMARY KEY,
+        offset INTEGER NOT NULL
+    );
+    '''
+
+    def __init__(self, path, log_dir, rollup_interval=ROLLUP_INTERVAL, max_log_bytes=MAX_LOG_BYTES,
+                 retention_days=RETENTION_DAYS):
+        self.log_dir = log_dir
+        self.rollup_interval = rollup_interval
+        self.max_log_bytes = max_log_bytes
+        self.retention_days = retention_days
+        self._rolled_up = time.monotonic()
+        os.makedirs(log_dir, exist_ok=True)
+        super().__init__(path)
+
+    def append(self, records):
+        """Append records (dicts with day, tool, lang, action and session) to today's log
+
+        Returns False if the records were dropped because the log is full.
+        """
+        if not records:
+            return True
+        lines = ''.join(json.dumps(record, separators=(',', ':')) + '\n' for record in records)
+        path = os.path.join(self.log_dir, f'events-{records[0]["day"]}.jsonl')
+        with open(path, 'a', encoding='utf-8') as f:
+            # One locked write per beacon, so lines of different workers never interleave
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            # json.dumps escapes non-ASCII characters, so characters are bytes
+            if os.fstat(f.fileno()).st_size + len(lines) > self.max_log_bytes:
+                return False
+            f.write(lines)
+        return True
+
+    def rollup(self):
+        """Count the log lines added since the last rollup; return how many there were"""
+        self._rolled_up = time.monotonic()
+        counted = 0
+        with self._transaction() as db:
+            offsets = dict(db.execute('SELECT file, offset FROM rollup_offsets'))
+            for name in sorted(os.listdir(self.log_dir)):
+                if not (name.startswith('events-') and name.endswith('.jsonl')):
+                    continue
+                offset = offsets.get(name, 0)
+                with open(os.path.join(self.log_dir, name), 'rb') as f:
+                    f.seek(offset)
+                    data = f.read()
+                # A line still being written is left for the next rollup
+                data = data[:data.rfind(b'\n') + 1]
+                if not data:
+                    continue
+                usage, sessions = {}, set()
+                for line in data.splitlines():
+                    try:
+                        record = json.loads(line)
+                        key = (record['day'], record['tool'], record['lang'], record['action'])
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                    usage[key] = usage.get(key, 0) + 1
+                    if record.get('session'):
+                        sessions.add((record['day'], record['tool'], record['session']))
+                    counted += 1
+                db.executemany('INSERT INTO usage (day, tool, lang, action, events) VALUES (?, ?, ?, ?, ?) '
+                               'ON CONFLICT (day, tool, lang, action) DO UPDATE SET events = events + excluded.events',
+                               [key + (count,) for key, count in usage.items()])
+                db.executemany('INSERT OR IGNORE INTO sessions (day, tool, session) VALUES (?, ?, ?)', sessions)
+                db.execute('INSERT OR REPLACE INTO rollup_offsets (file, offset) VALUES (?, ?)',
+                           (name, offset + len(data)))
+            self._expire(db)
+        return counted
+
+    def _expire(self, db):
+        """Delete the logs of days before the retention period once they are fully counted"""
+        if not self.retention_days:
+            return
+        oldest = f'events-{datetime.now(timezone.utc).date() - timedelta(days=self.retention_days)}.jsonl'
+        for name, offset in db.execute('SELECT file, offset FROM rollup_offsets WHERE file < ?',
+                                       (oldest,)).fetchall():
+            path = os.path.join(self.log_dir, name)
+            try:
+                if os.path.getsize(path) > offset:
+                    continue  # Lines not counted yet; the next rollup gets them
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            db.execute('DELETE FROM rollup_offsets WHERE file = ?', (name,))
+
+    def maybe_rollup(self):
+        """Roll up if rollup_interval has passed; cheap enough to call after every beacon"""
+        if time.monotonic() - self._rolled_up >= self.rollup_interval:
+            self.rollup()
+
+    def usage(self, since=None):
+        """{tool: {'sessions': n, 'events': {action: n}, 'languages': {lang: n}}} from day since (YYYY-MM-DD) on
+
+        sessions counts distinct session ids over the whole period.
+        """
+        since = since or ''
+        db = self._connection()
+        report = {}
+        for tool, lang, action, events in db.execute(
+                'SELECT tool, lang, action, SUM(events) FROM usage WHERE day >= ? '
+                'GROUP BY tool, lang, action ORDER BY tool', (since,)):
+            entry = report.setdefault(tool, {'sessions': 0, 'events': {}, 'languages': {}})
+            entry['events'][action] = entry['events'].get(action, 0) + events
+            entry['languages'][lang] = entry['languages'].get(lang, 0) + events
+        # A session that spans midnight is one session, not one per day
+        for tool, sessions in db.execute(
+                'SELECT tool, COUNT(DISTINCT session) FROM sessions WHERE day >= ? GROUP BY tool', (since,)):
+            report.setdefault(tool, {'sessions': 0, 'events': {}, 'languages': {}})['sessions'] = sessions
+        return report
@@ -0,0 +1,175 @@
+"""
+Fingerprinted static assets for SME Debt Management Tool
+Maps stylesheets and scripts to content-hashed file names so browsers, nginx
+and the service worker can cache them for a year and still see every change
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+
+from critical_css import inline_critical_css
+from page_cache import make_page
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+FINGERPRINTED_DIRS = ('css', 'js')
+MODULE_DIR = 'js/tools'  # ES modules, which import each other by their plain names
+HASH_LENGTH = 12
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60  # one year, in seconds
+SERVICE_WORKER = 'sw.js'
+CRITICAL_STYLESHEET = 'css/style.css'  # inlined per page as far as the page uses it
+
+# Placeholders in sw.js, filled in whenever the service worker is served or built
+_SW_VERSION = re.compile(r"^const ASSET_VERSION = .*;$", re.MULTILINE)
+_SW_URLS = re.compile(r"^const ASSET_URLS = .*;$", re.MULTILINE)
+_SW_PAGES = re.compile(r"^const PAGE_URLS = .*;$", re.MULTILINE)
+_FINGERPRINTED = re.compile(r'^(.+)\.[0-9a-f]{%d}(\.\w+)$' % HASH_LENGTH)
+
+
+def fingerprint(filename, digest):
+    """css/style.css -> css/style.<hash>.css"""
+    stem, ext = os.path.splitext(filename)
+    return f'{stem}.{digest[:HASH_LENGTH]}{ext}'
+
+
+def _file_digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class AssetManifest:
+    """Content-hashed names of the static stylesheets and scripts
+
+    Files are only hashed again when their modification time changes, so
+    refresh() is cheap enough to run on every page render.
+    """
+
+    def __init__(self, static_dir=STATIC_DIR):
+        self.static_dir = static_dir
+        self.files = {}  # css/style.css -> css/style.<hash>.css
+        self.sources = {}  # css/style.<hash>.css -> css/style.css
+        self.version = ''
+        self.mtime = 0
+        self._hashed = {}  # css/style.css -> (mtime, fingerprinted name)
+        self._pages = {}  # css/style.css -> (mtime, minified and precompressed CachedPage)
+        self._lock = threading.Lock()
+        self._pages_lock = threading.Lock()  # one thread compresses a file while the others wait
+        self.refresh()
+
+    def _scan(self):
+        """Yield (name relative to static_dir with / separators, path, mtime)"""
+        for directory in FINGERPRINTED_DIRS:
+            for root, dirs, files in os.walk(os.path.join(self.static_dir, directory)):
+                dirs.sort()
+                for name in sorted(files):
+                    path = os.path.join(root, name)
+                    relpath = os.path.relpath(path, self.static_dir).replace(os.sep, '/')
+                    yield relpath, path, os.path.getmtime(path)
+
+    def refresh(self):
+        """Re-hash assets that changed on disk; return the newest modification time
+
+        A thread that finds another one already checking uses the last known
+        state instead of queueing behind it on the lock.
+        """
+        if not self._lock.acquire(blocking=False):
+            return self.mtime
+        try:
+            hashed = {}
+            for relpath, path, mtime in self._scan():
+                known = self._hashed.get(relpath)
+                if known is None or known[0] != mtime:
+                    known = (mtime, fingerprint(relpath, _file_digest(path)))
+                hashed[relpath] = known
+
+            if hashed != self._hashed:
+                self._hashed = hashed
+                self.files = {relpath: name for relpath, (_, name) in hashed.items()}
+                self.sources = {name: relpath for relpath, name in self.files.items()}
+                self.version = hashlib.sha256(
+                    json.dumps(self.files, sort_keys=True).encode('utf-8')
+                ).hexdigest()[:HASH_LENGTH]
+                self.mtime = max((mtime for mtime, _ in hashed.values()), default=0)
+            return self.mtime
+        finally:
+            self._lock.release()
+
+    def url(self, filename):
+        """Fingerprinted name of filename, or filename itself if it is not fingerprinted"""
+        return self.files.get(filename, filename)
+
+    def modules(self):
+        """{plain name: fingerprinted name} of the JavaScript modules, for an import map"""
+        return {relpath: name for relpath, name in self.files.items() if relpath.startswith(MODULE_DIR + '/')}
+
+    def source(self, filename):
+        """The asset a fingerprinted name refers to, or None for any other name
+
+        Only the name of the file as it is on disk now counts, so an outdated
+        name is never served newer contents as immutable.
+        """
+        self.refresh()
+        relpath = self.sources.get(filename)
+        if relpath is None:
+            return None
+        path = os.path.join(self.static_dir, relpath)
+        try:
+            # A refresh running in another thread may not have seen the latest change yet
+            if (os.path.getmtime(path) != self._hashed.get(relpath, (None,))[0]
+                    and fingerprint(relpath, _file_digest(path)) != filename):
+                return None
+        except OSError:
+            return None
+        return relpath
+
+    def current_name(self, filename):
+        """The current fingerprinted name of an outdated one, or None"""
+        match = _FINGERPRINTED.match(filename)
+        if match is None:
+            return None
+        name = self.files.get(match.group(1) + match.group(2))
+        return name if name != filename else None
+
+    def page(self, filename):
+        """Minified, precompressed contents of a stylesheet or script, built once per version"""
+        path = os.path.join(self.static_dir, filename)
+        mtime = os.path.getmtime(path)
+        cached = self._pages.get(filename)
+        if cached is None or cached[0] != mtime:
+            with self._pages_lock:
+                cached = self._pages.get(filename)
+                if cached is None or cached[0] != mtime:
+                    with open(path, encoding='utf-8') as f:
+                        cached = (mtime, make_page(f.read(), mtime, filename))
+                    self._pages[filename] = cached
+        return cached[1]
+
+    def inline_critical_css(self, html):
+        """Inline the rules of CRITICAL_STYLESHEET that a rendered page uses"""
+        with open(os.path.join(self.static_dir, CRITICAL_STYLESHEET), encoding='utf-8') as f:
+            return inline_critical_css(html, f.read())
+
+    def service_worker_page(self, static_url='/static/', pages=()):
+        """The filled-in service worker as a minified, precompressed CachedPage"""
+        mtime = max(self.refresh(), os.path.getmtime(os.path.join(self.static_dir, SERVICE_WORKER)))
+        key = (SERVICE_WORKER, static_url, tuple(pages))
+        cached = self._pages.get(key)
+        if cached is None or cached[0] != (mtime, self.version):
+            with self._pages_lock:
+                cached = self._pages.get(key)
+                if cached is None or cached[0] != (mtime, self.version):
+                    source = self.service_worker(static_url, pages)
+                    cached = ((mtime, self.version), make_page(source, mtime, SERVICE_WORKER))
+                    self._pages[key] = cached
+        return cached[1]
+
+    def service_worker(self, static_url='/static/', pages=()):
+        """sw.js with the cache version, fingerprinted URLs and start pages (one per language) filled in"""
+        with open(os.path.join(self.static_dir, SERVICE_WORKER), encoding='utf-8') as f:
+            source = f.read()
+        urls = {static_url + relpath: static_url + name for relpath, name in self.files.items()}
+        source = _SW_VERSION.sub(lambda m: f"const ASSET_VERSION = '{self.version}';", source, count=1)
+        source = _SW_PAGES.sub(lambda m: f"const PAGE_URLS = {json.dumps(list(pages))};", source, count=1)
+        return _SW_URLS.sub(lambda m: f"const ASSET_URLS = {json.dumps(urls, sort_keys=True)};", source, count=1)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Amortization benchmark for SME Debt Management Tool
+Measures closed-form loan book schedules and checks them against a month-by-month loop
+Usage: python benchmarks/amortization_benchmark.py [loans]
+"""
+
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from calculations import loan_book_schedule
+
+
+def generate_loan_book(loans, seed=42):
+    """Random loans with terms of up to 40 years"""
+    rng = np.random.default_rng(seed)
+    return {
+        'principal': rng.uniform(10_000, 2_000_000, loans),
+        'interest_rate': rng.uniform(0, 12, loans),
+        'term': rng.integers(1, 41, loans),
+        'fees': rng.uniform(0, 2_000, loans),
+        'monthly_fees': rng.uniform(0, 25, loans),
+    }
+
+
+def loop_schedule(principal, interest_rate, term):
+    """Reference schedule built month by month, as the cost analysis chart used to"""
+    months = round(term * 12)
+    monthly_rate = interest_rate / 100 / 12
+    if monthly_rate == 0:
+        payment = principal / months
+    else:
+        growth = (1 + monthly_rate) ** months
+        payment = principal * monthly_rate * growth / (growth - 1)
+    balance = principal
+    interest = []
+    balances = []
+    for _ in range(months):
+        interest.append(balance * monthly_rate)
+        balance -= payment - interest[-1]
+        balances.append(balance)
+    return interest, balances
+
+
+def check_parity(book, sample=200):
+    """Compare sampled loans with the month-by-month loop"""
+    for i in range(sample):
+        schedule = loan_book_schedule(book['principal'][i], book['interest_rate'][i], book['term'][i])
+        interest, balances = loop_schedule(book['principal'][i], book['interest_rate'][i], book['term'][i])
+        months = len(balances)
+        assert np.allclose(schedule['interest'][0, :months], interest, rtol=1e-9, atol=1e-4), i
+        assert np.allclose(schedule['balance'][0, :months], balances, rtol=1e-9, atol=1e-4), i
+
+
+def timed(label, loans, **options):
+    start = time.perf_counter()
+    schedule = loan_book_schedule(**options)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {elapsed:.3f} s ({loans / elapsed:,.0f} loans/s)")
+    return schedule
+
+
+def main(loans=100_000):
+    book = generate_loan_book(loans)
+    check_parity(book)
+
+    print(f"Loans:                 {loans:,} (terms up to 40 years)")
+    yearly = timed("Yearly, per loan:", loans, yearly=True, **book)
+    totals = timed("Yearly, book total:", loans, yearly=True, total=True, **book)
+    timed("Monthly, book total:", loans, total=True, **book)
+
+    assert math.isclose(totals['principal'].sum(), book['principal'].sum(), rel_tol=1e-9)
+    assert np.allclose(yearly['interest'].sum(axis=0), totals['interest'])
+    print(f"Interest over the book: {totals['interest'].sum():,.0f}")
+    print("✅ Schedules match the month-by-month loop")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
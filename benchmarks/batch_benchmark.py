@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Portfolio batch benchmark for SME Debt Management Tool
+Measures vectorized debt brake + covenant throughput and checks the results
+against the scalar functions the tool pages use
+Usage: python benchmarks/batch_benchmark.py [rows]
+"""
+
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from calculations import check_covenants, debt_brake
+from calculations.batch import columns_from_csv, evaluate_portfolio, results_to_csv
+
+TARGET_SECONDS = 5.0  # for 1M rows, parsing excluded
+
+
+def generate_portfolio(rows, seed=42):
+    """Random but plausible company financials"""
+    rng = np.random.default_rng(seed)
+    revenue = rng.lognormal(14, 1.2, rows)
+    ebitda = revenue * rng.uniform(0.02, 0.25, rows)
+    total_debt = ebitda * rng.uniform(0.5, 6.0, rows)
+    return {
+        'company': [f'C{i}' for i in range(rows)],
+        'revenue': revenue,
+        'expenses': revenue * rng.uniform(0.6, 1.05, rows),
+        'existing_debt': revenue * rng.uniform(0, 0.01, rows),
+        'debt_service_ratio': rng.choice([0.25, 0.30, 0.35, 0.40], rows),
+        'total_debt': total_debt,
+        'ebitda': ebitda,
+        'total_assets': total_debt * rng.uniform(1.2, 4.0, rows),
+        'cash_flow': ebitda * rng.uniform(0.3, 1.0, rows),
+    }
+
+
+def check_parity(columns, results, sample=1000):
+    """Compare sampled rows with calculations.debt_brake / check_covenants"""
+    for i in range(min(sample, len(columns['revenue']))):
+        scalar = debt_brake(columns['revenue'][i], columns['expenses'][i],
+                            columns['existing_debt'][i], columns['debt_service_ratio'][i])
+        covenants = check_covenants(columns['total_debt'][i], columns['ebitda'][i],
+                                    columns['total_assets'][i], columns['cash_flow'][i])
+        for name, value in scalar.items():
+            batch_value = results[name][i]
+            if value is None:
+                assert math.isnan(batch_value), (i, name)
+            else:
+                assert math.isclose(batch_value, value, rel_tol=1e-12, abs_tol=1e-9), (i, name, batch_value, value)
+        assert results['all_compliant'][i] == covenants['all_compliant'], i
+
+
+def check_invalid_rows():
+    """Rows the scalar functions reject must come back invalid, and the others valid"""
+    base = {'revenue': 100000.0, 'expenses': 60000.0, 'existing_debt': 0.0, 'debt_service_ratio': 0.3,
+            'total_debt': 50000.0, 'ebitda': 20000.0, 'total_assets': 80000.0, 'cash_flow': 15000.0,
+            'average_interest_rate': 0.05}
+    edits = [{}, {'revenue': 0.0}, {'existing_debt': -1.0}, {'debt_service_ratio': -0.1},
+             {'expenses': math.inf}, {'total_debt': 0.0}, {'ebitda': 0.0}, {'total_assets': -1.0},
+             {'cash_flow': math.nan}, {'average_interest_rate': 0.0}, {'average_interest_rate': -0.01}]
+    rows = [{**base, **edit} for edit in edits]
+    results = evaluate_portfolio({name: np.array([row[name] for row in rows]) for name in base})
+    for i, row in enumerate(rows):
+        try:
+            debt_brake(row['revenue'], row['expenses'], row['existing_debt'], row['debt_service_ratio'])
+            brake_valid = True
+        except ValueError:
+            brake_valid = False
+        try:
+            check_covenants(row['total_debt'], row['ebitda'], row['total_assets'], row['cash_flow'],
+                            average_interest_rate=row['average_interest_rate'])
+            covenants_valid = True
+        except ValueError:
+            covenants_valid = False
+        assert results['valid'][i] == brake_valid, edits[i]
+        assert results['covenants_valid'][i] == covenants_valid, edits[i]
+
+
+def main(rows=1_000_000):
+    columns = generate_portfolio(rows)
+
+    start = time.perf_counter()
+    results = evaluate_portfolio(columns)
+    elapsed = time.perf_counter() - start
+    check_parity(columns, results)
+    check_invalid_rows()
+
+    print(f"Rows:              {rows:,}")
+    print(f"Evaluate:          {elapsed:.3f} s ({rows / elapsed:,.0f} rows/s)")
+    print(f"Within debt limit: {results['within_debt_limit'].mean():.1%}")
+    print(f"All covenants met: {results['all_compliant'].mean():.1%}")
+
+    # CSV round trip on a slice, as uploaded to /api/batch
+    csv_rows = min(rows, 100_000)
+    sliced = {name: values[:csv_rows] for name, values in columns.items()}
+    text = results_to_csv(sliced)
+    start = time.perf_counter()
+    evaluate_portfolio(columns_from_csv(text))
+    csv_elapsed = time.perf_counter() - start
+    print(f"CSV parse+eval:    {csv_elapsed:.3f} s for {csv_rows:,} rows ({csv_rows / csv_elapsed:,.0f} rows/s)")
+
+    target = TARGET_SECONDS * rows / 1_000_000
+    print(f"{'✅' if elapsed <= target else '❌'} Target: {target:.2f} s")
+    return 0 if elapsed <= target else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000))
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+First contentful paint benchmark for SME Debt Management Tool
+Estimates FCP of every page the way Lighthouse's simulated throttling does
+(Slow 4G: 150 ms round trips, 1.6 Mbit/s), for the working tree and for a git
+revision, from the HTML and the render-blocking requests in its <head>
+Usage: python benchmarks/fcp_benchmark.py [git revision to compare with, default HEAD]
+"""
+
+import gzip
+import io
+import json
+import os
+import subprocess
+import sys
+import tarfile
+import tempfile
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGES = [
+    '/en/', '/en/debt-brake', '/en/cost-analysis', '/en/debt-equity', '/en/debt-snowball',
+    '/en/funding-guidance', '/en/covenant-tracking', '/en/about', '/en/donation',
+]
+RTT = 0.150  # seconds
+THROUGHPUT = 1.6384e6 / 8  # bytes per second
+NEW_ORIGIN_ROUND_TRIPS = 3  # DNS, TCP and TLS before the first request to another host
+# Approximate gzip transfer sizes of the CDN files the templates use, in bytes
+CDN_SIZES = {
+    'bootstrap.min.css': 31_000,
+    'all.min.css': 18_000,
+    'bootstrap.bundle.min.js': 23_000,
+    'chart.js': 68_000,
+    'tippy-bundle.umd.min.js': 9_000,
+    'tippy.css': 600,
+}
+DEFAULT_CDN_SIZE = 30_000
+TOLERANCE = 0.01  # estimates within 1% count as unchanged
+
+# Runs inside the tree being measured: renders PAGES and sizes the local assets they use
+RENDER = r'''
+import gzip, json, re, sys
+from app import create_app
+app = create_app()
+client = app.test_client()
+pages, assets = {}, {}
+for path in json.loads(sys.argv[1]):
+    html = client.get(path).get_data(as_text=True)
+    pages[path] = html
+    for url in re.findall(r'(?:src|href)="(/static/[^"]+)"', html):
+        if url not in assets:
+            assets[url] = len(gzip.compress(client.get(url).get_data()))
+with open(sys.argv[2], 'w') as f:
+    json.dump({'pages': pages, 'assets': assets}, f)
+'''
+
+
+class _Resources(HTMLParser):
+    """Render-blocking stylesheets and scripts in <head>, and every script the page loads"""
+
+    def __init__(self):
+        super().__init__()
+        self.blocking = []
+        self.scripts = []
+        self._in_head = False
+        self._noscript = 0
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == 'head':
+            self._in_head = True
+        elif tag == 'body':
+            self._in_head = False
+        elif tag == 'noscript':
+            self._noscript += 1
+        elif self._noscript:
+            return  # only used with JavaScript turned off
+        elif tag == 'link' and 'stylesheet' in (attrs.get('rel') or '').split() \
+                and attrs.get('media', 'all') in ('all', 'screen') and self._in_head:
+            self.blocking.append(attrs['href'])
+        elif tag == 'script' and attrs.get('src'):
+            self.scripts.append(attrs['src'])
+            if self._in_head and 'async' not in attrs and 'defer' not in attrs \
+                    and attrs.get('type') != 'module':
+                self.blocking.append(attrs['src'])
+
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            self._in_head = False
+        elif tag == 'noscript':
+            self._noscript -= 1
+
+
+def _render(tree):
+    with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+        output = f.name
+    try:
+        subprocess.run([sys.executable, '-c', RENDER, json.dumps(PAGES), output], cwd=tree,
+                       check=True, stdout=subprocess.DEVNULL)
+        with open(output) as f:
+            return json.load(f)
+    finally:
+        os.remove(output)
+
+
+def _render_revision(revision):
+    archive = subprocess.run(['git', 'archive', '--format=tar', revision], cwd=ROOT,
+                             check=True, capture_output=True).stdout
+    with tempfile.TemporaryDirectory() as tree:
+        with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+            tar.extractall(tree)
+        return _render(tree)
+
+
+def _size(url, assets):
+    if url in assets:
+        return assets[url]
+    return CDN_SIZES.get(urlsplit(url).path.rsplit('/', 1)[-1], DEFAULT_CDN_SIZE)
+
+
+def estimate(html, assets):
+    """Return (estimated FCP in seconds, blocking requests, blocking bytes, script bytes)"""
+    resources = _Resources()
+    resources.feed(html)
+    html_bytes = len(gzip.compress(html.encode('utf-8')))
+    fcp = (NEW_ORIGIN_ROUND_TRIPS + 1) * RTT + html_bytes / THROUGHPUT
+    blocking_bytes = sum(_size(url, assets) for url in resources.blocking)
+    if resources.blocking:
+        # Blocking requests start together once the HTML is in and share the bandwidth
+        latency = max((0 if url.startswith('/') else NEW_ORIGIN_ROUND_TRIPS * RTT) + RTT
+                      for url in resources.blocking)
+        fcp += latency + blocking_bytes / THROUGHPUT
+    script_bytes = sum(_size(url, assets) for url in resources.scripts)
+    return fcp, len(resources.blocking), blocking_bytes, script_bytes
+
+
+def main(revision='HEAD'):
+    print(f"Rendering {revision} and the working tree...")
+    before, after = _render_revision(revision), _render(ROOT)
+
+    print(f"{'Page':<24}{'FCP before':>12}{'FCP after':>11}{'blocking':>14}{'scripts (KB)':>16}")
+    worse = []
+    for path in PAGES:
+        old = estimate(before['pages'][path], before['assets'])
+        new = estimate(after['pages'][path], after['assets'])
+        print(f"{path:<24}{old[0] * 1000:>10.0f}ms{new[0] * 1000:>9.0f}ms"
+              f"{old[1]:>6} -> {new[1]:<4}{old[3] / 1024:>8.0f} -> {new[3] / 1024:<4.0f}")
+        if new[0] > old[0] * (1 + TOLERANCE):
+            worse.append(path)
+
+    print(f"{'✅' if not worse else '❌'} FCP {'regressed on ' + ', '.join(worse) if worse else 'no worse on any page'}")
+    return 1 if worse else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:2]))
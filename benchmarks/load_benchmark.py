@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Load test for SME Debt Management Tool
+Starts gunicorn with gunicorn.conf.py once with sync and once with gthread
+workers and drives each with many concurrent clients, reporting requests per
+second and latency percentiles of a mix of pages and feedback submissions
+Usage: python benchmarks/load_benchmark.py [clients] [seconds]
+"""
+
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlencode
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = ('sync', 'gthread')
+PAGES = ['/en/', '/de/debt-brake', '/en/about']
+FEEDBACK_EVERY = 10  # every tenth request submits feedback
+CONNECT_TIMEOUT = 30  # seconds for gunicorn to come up
+WARMUP = (20, 2)  # clients and seconds that fill the page caches before measuring
+REQUEST_TIMEOUT = 60  # seconds before a request counts as failed
+
+
+def free_port():
+    """A TCP port on 127.0.0.1 that nothing listens on"""
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def ok(response):
+    """Whether a raw HTTP response has status 200"""
+    return response[9:12] == b'200'
+
+
+def app_environment(workdir, name):
+    """Environment for running the app in a benchmark
+
+    Mail goes nowhere, the outbox, rate limit, metrics and analytics data live in workdir,
+    and the feedback, beacon and stress test rate limits are lifted because every client has
+    the same address.
+    """
+    return {
+        'MAIL_SERVER': '127.0.0.1', 'MAIL_PORT': str(free_port()), 'MAIL_USE_TLS': 'False',
+        'MAIL_OUTBOX': os.path.join(workdir, f'{name}-outbox.sqlite3'),
+        'RATE_LIMIT_DB': os.path.join(workdir, f'{name}-rate-limit.sqlite3'),
+        'METRICS_DB': os.path.join(workdir, f'{name}-metrics.sqlite3'),
+        'ANALYTICS_DB': os.path.join(workdir, f'{name}-analytics.sqlite3'),
+        'ANALYTICS_LOG_DIR': os.path.join(workdir, f'{name}-analytics'),
+        'FEEDBACK_RATE_LIMIT': '1000000',
+        'ANALYTICS_RATE_LIMIT': '1000000',
+        'STRESS_TEST_RATE_LIMIT': '1000000',
+    }
+
+
+def start_gunicorn(mode, port, workdir):
+    """Start gunicorn.conf.py with worker class mode on port and wait until it serves pages"""
+    env = dict(os.environ, GUNICORN_WORKER_CLASS=mode, **app_environment(workdir, mode))
+    command = [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'app:app',
+               '--bind', f'127.0.0.1:{port}', '--pid', os.path.join(workdir, f'{mode}.pid'),
+               '--access-logfile', os.devnull, '--error-logfile', os.path.join(workdir, f'{mode}.log'),
+               # No restarts mid-measurement: they drop queued connections and start with empty caches
+               '--max-requests', '0']
+    server = subprocess.Popen(command, cwd=ROOT, env=env)
+    deadline = time.monotonic() + CONNECT_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1) as s:
+                s.sendall(b'GET /en/ HTTP/1.0\r\n\r\n')
+                if ok(s.recv(12)):
+                    return server
+        except OSError:
+            pass
+        time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f'gunicorn ({mode}) did not start; see {workdir}/{mode}.log')
+
+
+def _request(number, port):
+    if number % FEEDBACK_EVERY:
+        path = PAGES[number % len(PAGES)]
+        return f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nConnection: close\r\n\r\n'.encode()
+    body = urlencode({'name': f'Load {number}', 'email': f'load{number}@example.com',
+                      'message': f'Load test message {number}'}).encode()
+    return (f'POST /submit-feedback HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nConnection: close\r\n'
+            f'Content-Type: application/x-www-form-urlencoded\r\nContent-Length: {len(body)}\r\n\r\n'
+            ).encode() + body
+
+
+async def _client(port, deadline, counter, latencies, errors):
+    while time.monotonic() < deadline:
+        counter[0] += 1
+        request = _request(counter[0], port)
+        start = time.monotonic()
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection('127.0.0.1', port), REQUEST_TIMEOUT)
+            writer.write(request)
+            response = await asyncio.wait_for(reader.read(), REQUEST_TIMEOUT)
+            writer.close()
+            if not ok(response):
+                errors.append(response[:12])
+                continue
+        except (OSError, asyncio.TimeoutError) as e:
+            errors.append(type(e).__name__)
+            continue
+        latencies.append(time.monotonic() - start)
+
+
+async def _load(port, clients, seconds):
+    latencies, errors, counter = [], [], [0]
+    deadline = time.monotonic() + seconds
+    await asyncio.gather(*(_client(port, deadline, counter, latencies, errors) for _ in range(clients)))
+    return latencies, errors
+
+
+def run(mode, clients, seconds, workdir):
+    """Return (requests per second, p50 ms, p99 ms, failed requests) for one worker class"""
+    port = free_port()
+    server = start_gunicorn(mode, port, workdir)
+    try:
+        asyncio.run(_load(port, *WARMUP))
+        start = time.monotonic()
+        latencies, errors = asyncio.run(_load(port, clients, seconds))
+        elapsed = time.monotonic() - start
+    finally:
+        server.terminate()
+        server.wait()
+    percentiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else [0] * 99
+    return len(latencies) / elapsed, percentiles[49] * 1000, percentiles[98] * 1000, len(errors)
+
+
+def main(clients=500, seconds=15):
+    print(f"{clients} concurrent clients for {seconds}s against gunicorn.conf.py "
+          f"({FEEDBACK_EVERY - 1} page views to 1 feedback submission)")
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for mode in MODES:
+            results[mode] = run(mode, clients, seconds, workdir)
+            rps, p50, p99, failed = results[mode]
+            print(f"{mode:<8} {rps:>8.0f} req/s   p50 {p50:>7.0f}ms   p99 {p99:>7.0f}ms   {failed} failed")
+
+    sync, threaded = results['sync'], results['gthread']
+    ok = threaded[3] == 0 and threaded[2] <= sync[2]
+    print(f"{'✅' if ok else '❌'} gthread p99 {threaded[2]:.0f}ms vs sync {sync[2]:.0f}ms, "
+          f"{threaded[3]} failed requests")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*map(int, sys.argv[1:3])))
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Feedback mail benchmark for SME Debt Management Tool
+Posts feedback against a local SMTP stand-in that answers slowly and refuses the
+first few messages, and checks that requests return at once while the outbox
+delivers every message over few connections
+Usage: python benchmarks/mail_benchmark.py [messages]
+"""
+
+import os
+import socketserver
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+REPLY_DELAY = 0.02  # seconds the stand-in takes per SMTP reply, like a remote server
+REFUSED = 3  # DATA commands the stand-in answers with a temporary failure
+TARGET_MS = 20  # 95th percentile of the feedback request
+DELIVERY_TIMEOUT = 60  # seconds
+
+
+class _SMTPStandIn(socketserver.StreamRequestHandler):
+    """Just enough SMTP for smtplib: counts connections and accepted messages"""
+
+    def reply(self, line):
+        time.sleep(REPLY_DELAY)
+        self.wfile.write(line.encode('ascii') + b'\r\n')
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self.reply('220 localhost stand-in ready')
+        for raw in self.rfile:
+            command = raw.decode('utf-8', 'replace').strip().upper()
+            if command.startswith(('EHLO', 'HELO')):
+                self.reply('250 localhost')
+            elif command.startswith(('MAIL', 'RCPT', 'RSET', 'NOOP')):
+                self.reply('250 OK')
+            elif command == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                for line in self.rfile:
+                    if line in (b'.\r\n', b'.\n'):
+                        break
+                with server.lock:
+                    refused = server.refused < REFUSED
+                    if refused:
+                        server.refused += 1
+                    else:
+                        server.delivered += 1
+                self.reply('451 Try again later' if refused else '250 Queued')
+            elif command == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('502 Command not implemented')
+
+
+def _start_stand_in():
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), _SMTPStandIn)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = server.refused = server.delivered = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main(messages=50):
+    server = _start_stand_in()
+    workdir = tempfile.mkdtemp()
+    os.environ.update({
+        'MAIL_SERVER': '127.0.0.1',
+        'MAIL_PORT': str(server.server_address[1]),
+        'MAIL_USE_TLS': 'False',
+        'MAIL_USE_SSL': 'False',
+        'MAIL_OUTBOX': os.path.join(workdir, 'outbox.sqlite3'),
+        'MAIL_RETRY_DELAY': '0.2',
+        'RATE_LIMIT_DB': os.path.join(workdir, 'rate_limit.sqlite3'),
+        'METRICS_DB': os.path.join(workdir, 'metrics.sqlite3'),
+        'FEEDBACK_RATE_LIMIT': str(messages),  # every request comes from the same address
+    })
+    from flask_mail import Message
+    from app import create_app
+
+    app = create_app()
+    client = app.test_client()
+
+    # Before: one synchronous send, with its own connection, inside the request
+    server.refused = REFUSED
+    start = time.perf_counter()
+    with app.app_context():
+        app.mail.send(Message(subject='Feedback', recipients=['owner@example.com'], body='Hello',
+                              sender=app.config['MAIL_DEFAULT_SENDER']))
+    synchronous_ms = (time.perf_counter() - start) * 1000
+    server.connections = server.refused = server.delivered = 0
+
+    latencies = []
+    for i in range(messages):
+        start = time.perf_counter()
+        response = client.post('/submit-feedback', data={
+            'name': f'Tester {i}', 'email': f'tester{i}@example.com', 'message': 'Great tool!',
+        })
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.get_data(as_text=True)
+
+    start = time.perf_counter()
+    while (server.delivered < messages or app.mail_outbox.counts()) \
+            and time.perf_counter() - start < DELIVERY_TIMEOUT:
+        time.sleep(0.05)
+    delivery_seconds = time.perf_counter() - start
+    left = app.mail_outbox.counts()
+
+    p95 = statistics.quantiles(latencies, n=20)[-1]
+    print(f"Synchronous send (before): {synchronous_ms:.0f}ms per request")
+    print(f"Queued feedback request:   median {statistics.median(latencies):.1f}ms, p95 {p95:.1f}ms")
+    print(f"Delivered {server.delivered}/{messages} in {delivery_seconds:.1f}s over "
+          f"{server.connections} SMTP connection(s), {server.refused} refusal(s) retried, outbox {left or 'empty'}")
+
+    ok = server.delivered == messages and not left and p95 <= TARGET_MS
+    print(f"{'✅' if ok else '❌'} Feedback requests {'within' if p95 <= TARGET_MS else 'above'} {TARGET_MS}ms (p95), "
+          f"{'every message delivered' if server.delivered == messages and not left else 'messages missing'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*map(int, sys.argv[1:2])))
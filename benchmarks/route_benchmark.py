@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Route benchmark for SME Debt Management Tool
+Drives every route of create_app() in every language, first through the Flask
+test client and then against gunicorn, and compares throughput, latency and
+worker memory with the baseline in route_baseline.json
+Usage: python benchmarks/route_benchmark.py [--update-baseline] [--threshold 0.3] [--client-only]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from urllib.parse import urlencode
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCHMARK_DIR))
+
+from load_benchmark import app_environment, free_port, start_gunicorn
+
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, 'route_baseline.json')
+THRESHOLD = 0.3  # relative loss of throughput, or growth of latency or memory, that fails the run
+CLIENT_SECONDS = 0.3  # per route and round through the test client
+SERVER_SECONDS = 1.0  # per route and round against gunicorn
+SERVER_WARMUP = 0.5  # seconds per route for every worker to fill its page cache
+ROUNDS = 3  # each route keeps its best round, which filters out noise from other processes
+CONCURRENCY = 16  # connections kept busy against gunicorn
+WORKER_CLASS = 'gthread'
+STATIC_FILES = ['css/style.css', 'js/calculation-core.js', 'sw.js']
+# Inputs for the tools that calculations/corpus.json has no case for
+EXTRA_INPUTS = {
+    'debt-optimizer': {
+        'debts': [{'name': 'Card', 'balance': 8000, 'rate': 18.9, 'minimum_payment': 240},
+                  {'name': 'Loan', 'balance': 45000, 'rate': 6.5, 'minimum_payment': 900},
+                  {'name': 'Overdraft', 'balance': 12000, 'rate': 11.0, 'minimum_payment': 300}],
+        'monthly_payment': 2500, 'objective': 'average_months', 'time_budget': 0.05,
+    },
+    'covenant-stress-test': {'total_debt': 1000000, 'ebitda': 350000, 'total_assets': 2000000,
+                             'cash_flow': 150000, 'scenarios': 2000, 'seed': 1},
+}
+BATCH_ROWS = [
+    {'company': f'Company {i}', 'revenue': 1_000_000 + i * 50_000, 'expenses': 800_000 + i * 45_000,
+     'existing_debt': i * 20_000, 'total_debt': 500_000, 'ebitda': 200_000, 'total_assets': 1_500_000,
+     'cash_flow': 90_000}
+    for i in range(20)
+]
+# A typical analytics.js batch: a page view and a calculation on two tool pages
+BEACON_EVENTS = [{'action': action, 'page': page} for page in ('/en/debt-brake', '/de/cost-analysis')
+                 for action in ('page_view', 'calculation')]
+
+# body(i) returns the request body of the i-th call (None for GET)
+Route = namedtuple('Route', ['name', 'method', 'path', 'content_type', 'body'])
+
+
+def _get(path, name=None):
+    return Route(f'GET {name or path}', 'GET', path, None, lambda i: None)
+
+
+def _post_json(path, data, name=None):
+    body = json.dumps(data).encode('utf-8')
+    return Route(name or f'POST {path}', 'POST', path, 'application/json', lambda i: body)
+
+
+def routes(app):
+    """A Route for every rule of app, per language, tool and sample asset
+
+    Returns (routes, rules without a sample); a new rule with URL arguments
+    needs an entry here before it can be measured.
+    """
+    from calculations import TOOLS
+    from calculations.corpus import load_corpus
+
+    samples = {}
+    for case in load_corpus()['cases']:
+        if 'expected' in case:  # The error cases are rejected before any work is done
+            samples.setdefault(case['tool'], case['input'])
+    samples.update(EXTRA_INPUTS)
+
+    found, missing = [], []
+    with app.test_request_context():
+        from flask import url_for
+        for rule in sorted(app.url_map.iter_rules(), key=lambda rule: rule.rule):
+            endpoint, arguments = rule.endpoint, rule.arguments
+            if endpoint == 'static':
+                # Named after the source file, so the baseline survives a new fingerprint
+                found += [_get(url_for('static', filename=app.assets.url(name)), url_for('static', filename=name))
+                          for name in STATIC_FILES]
+            elif arguments == {'lang_code'}:
+                found += [_get(url_for(endpoint, lang_code=lang)) for lang in app.translator.languages]
+            elif endpoint == 'set_language':
+                found += [_get(url_for(endpoint, lang=lang)) for lang in app.translator.languages]
+            elif endpoint == 'calculate':
+                found += [_post_json(url_for(endpoint, tool=tool), samples[tool]) for tool in TOOLS]
+            elif endpoint == 'calculate_batch':
+                found.append(_post_json(url_for(endpoint), BATCH_ROWS))
+            elif endpoint == 'submit_feedback':
+                # A different message every time, or deduplication would skip the work
+                found.append(Route('POST /submit-feedback', 'POST', url_for(endpoint),
+                                   'application/x-www-form-urlencoded',
+                                   lambda i: urlencode({'name': f'Bench {i}', 'email': f'bench{i}@example.com',
+                                                        'message': f'Benchmark message {i}'}).encode()))
+            elif endpoint == 'analytics_beacon':
+                # A new session every time, as every visitor sends their own
+                found.append(Route('POST /analytics', 'POST', url_for(endpoint), 'application/json',
+                                   lambda i: json.dumps({'session': f'session_{i}_bench',
+                                                         'events': BEACON_EVENTS}).encode()))
+            elif not arguments and 'GET' in rule.methods:
+                found.append(_get(url_for(endpoint)))
+            else:
+                missing.append(rule.rule)
+    return found, missing
+
+
+def _stats(latencies, elapsed):
+    latencies = sorted(latencies)
+    percentiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {'rps': round(len(latencies) / elapsed, 1), 'p50': round(percentiles[49] * 1000, 3),
+            'p95': round(percentiles[94] * 1000, 3), 'p99': round(percentiles[98] * 1000, 3)}
+
+
+def measure_client(client, route, seconds=CLIENT_SECONDS):
+    """Throughput and latency percentiles (ms) of route called in a loop through the test client"""
+    def call(i):
+        response = client.open(route.path, method=route.method, data=route.body(i),
+                               content_type=route.content_type)
+        if response.status_code >= 400:
+            raise RuntimeError(f'{route.name} answered {response.status_code}')
+
+    for i in range(3):
+        call(-1 - i)
+    latencies = []
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        began = time.perf_counter()
+        call(len(latencies))
+        latencies.append(time.perf_counter() - began)
+    return _stats(latencies, time.perf_counter() - start)
+
+
+def _raw_request(route, i, port):
+    body = route.body(i) or b''
+    headers = f'{route.method} {route.path} HTTP/1.1\r\nHost: 127.0.0.1:{port}\r\nConnection: close\r\n'
+    if route.content_type:
+        headers += f'Content-Type: {route.content_type}\r\nContent-Length: {len(body)}\r\n'
+    return (headers + '\r\n').encode() + body
+
+
+async def _drive(route, port, seconds):
+    latencies, failures, counter = [], [], [0]
+    deadline = time.monotonic() + seconds
+
+    async def connection():
+        while time.monotonic() < deadline:
+            counter[0] += 1
+            request = _raw_request(route, counter[0], port)
+            began = time.monotonic()
+            try:
+                reader, writer = await asyncio.open_connection('127.0.0.1', port)
+                writer.write(request)
+                response = await reader.read()
+                writer.close()
+            except OSError as e:
+                failures.append(type(e).__name__)
+                continue
+            if not response[9:12].isdigit() or int(response[9:12]) >= 400:
+                failures.append(response[:12])
+                continue
+            latencies.append(time.monotonic() - began)
+
+    start = time.monotonic()
+    await asyncio.gather(*(connection() for _ in range(CONCURRENCY)))
+    return latencies, failures, time.monotonic() - start
+
+
+def measure_server(route, port, seconds=SERVER_SECONDS):
+    """Throughput and latency percentiles (ms) of route with CONCURRENCY clients against gunicorn"""
+    latencies, failures, elapsed = asyncio.run(_drive(route, port, seconds))
+    if failures:
+        raise RuntimeError(f'{route.name} failed {len(failures)} times against gunicorn: {failures[0]}')
+    return _stats(latencies, elapsed)
+
+
+def worker_memory(master_pid):
+    """Resident memory in MB of each gunicorn worker (Linux only; empty elsewhere)"""
+    memory = []
+    for pid in filter(str.isdigit, os.listdir('/proc') if os.path.isdir('/proc') else []):
+        try:
+            with open(f'/proc/{pid}/status') as f:
+                fields = dict(line.split(':', 1) for line in f if ':' in line)
+        except OSError:
+            continue
+        if fields.get('PPid', '').strip() == str(master_pid) and 'VmRSS' in fields:
+            memory.append(round(int(fields['VmRSS'].split()[0]) / 1024, 1))
+    return sorted(memory)
+
+
+def _best(rounds):
+    """Per route, the highest throughput and lowest latencies seen in any round"""
+    return {name: {key: (max if key == 'rps' else min)(stats[name][key] for stats in rounds)
+                   for key in rounds[0][name]}
+            for name in rounds[0]}
+
+
+def run(client_only=False, rounds=ROUNDS):
+    """Measure every route; return {'client': ..., 'server': ..., 'memory': ...} and the unmeasured rules"""
+    with tempfile.TemporaryDirectory() as workdir:
+        os.environ.update(app_environment(workdir, 'client'))
+        from app import create_app
+
+        app = create_app()
+        found, missing = routes(app)
+        client = app.test_client()
+        results = {'client': _best([{route.name: measure_client(client, route) for route in found}
+                                    for _ in range(rounds)])}
+        if client_only:
+            return results, missing
+
+        port = free_port()
+        server = start_gunicorn(WORKER_CLASS, port, workdir)
+        try:
+            for route in found:
+                asyncio.run(_drive(route, port, SERVER_WARMUP))
+            results['server'] = _best([{route.name: measure_server(route, port) for route in found}
+                                       for _ in range(rounds)])
+            results['memory'] = {'worker_rss_mb': worker_memory(server.pid)}
+        finally:
+            server.terminate()
+            server.wait()
+    return results, missing
+
+
+def compare(results, baseline, threshold):
+    """Human-readable regressions of results against baseline"""
+    regressions = []
+    for phase in ('client', 'server'):
+        for name, now in results.get(phase, {}).items():
+            before = baseline.get(phase, {}).get(name)
+            if before is None:
+                continue
+            if now['rps'] < before['rps'] * (1 - threshold):
+                regressions.append(f"{phase} {name}: {before['rps']:.0f} -> {now['rps']:.0f} req/s")
+            if phase == 'server' and now['p50'] > before['p50'] * (1 + threshold):
+                regressions.append(f"{phase} {name}: p50 {before['p50']:.1f} -> {now['p50']:.1f}ms")
+    before = max(baseline.get('memory', {}).get('worker_rss_mb') or [0])
+    now = max(results.get('memory', {}).get('worker_rss_mb') or [0])
+    if before and now > before * (1 + threshold):
+        regressions.append(f"worker memory: {before:.0f} -> {now:.0f} MB")
+    return regressions
+
+
+def _report(results, baseline):
+    print(f"{'Route':<40}{'client req/s':>14}{'server req/s':>14}{'p50 ms':>9}{'p99 ms':>9}")
+    server = results.get('server', {})
+    for name, stats in results['client'].items():
+        line = f"{name:<40}{stats['rps']:>14.0f}"
+        if name in server:
+            line += f"{server[name]['rps']:>14.0f}{server[name]['p50']:>9.1f}{server[name]['p99']:>9.1f}"
+        before = baseline.get('client', {}).get(name)
+        if before:
+            line += f"   ({(stats['rps'] / before['rps'] - 1) * 100:+.0f}% client)"
+        print(line)
+    if results.get('memory', {}).get('worker_rss_mb'):
+        print(f"Worker memory (MB): {', '.join(map(str, results['memory']['worker_rss_mb']))}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every route and compare with the baseline")
+    parser.add_argument('--update-baseline', action='store_true', help=f"store the results in {BASELINE_PATH}")
+    parser.add_argument('--threshold', type=float, default=THRESHOLD,
+                        help="relative change that counts as a regression (default: %(default)s)")
+    parser.add_argument('--client-only', action='store_true', help="skip the gunicorn measurements")
+    parser.add_argument('--baseline', default=BASELINE_PATH, help="baseline file to compare with")
+    args = parser.parse_args(argv)
+
+    results, missing = run(client_only=args.client_only)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    _report(results, baseline)
+
+    if missing:
+        print(f"❌ No sample request for {', '.join(missing)}; add one to routes()")
+        return 1
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"✅ Baseline written to {args.baseline}")
+        return 0
+    if not baseline:
+        print(f"⚠️ No baseline at {args.baseline}; run with --update-baseline first")
+        return 0
+    regressions = compare(results, baseline, args.threshold)
+    for regression in regressions:
+        print(f"   {regression}")
+    print(f"{'❌' if regressions else '✅'} {len(regressions)} regression(s) beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Debt snowball benchmark for SME Debt Management Tool
+Times the event-driven repayment simulation and checks it against a month-by-month loop,
+checks the repayment order optimizer against every order of small portfolios, then runs
+it on a 50-debt portfolio
+Usage: python benchmarks/snowball_benchmark.py
+"""
+
+import itertools
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculations import optimize_repayment, order_debts, repayment_plan, simulate_order
+from calculations.debt_snowball import MAX_MONTHS
+
+TARGET_MS = 1.0  # per company with a few hundred debts
+ROUNDS = 5  # the best round counts, which filters out noise from other processes
+MEASURES = {'interest': 'total_interest', 'months': 'total_months', 'average_months': 'average_months'}
+
+
+def generate_debts(count, rng):
+    """Random debts, half of them with a minimum payment"""
+    debts = []
+    for i in range(count):
+        debt = {'name': f'Debt {i}', 'balance': rng.uniform(1_000, 50_000), 'rate': rng.uniform(0, 20)}
+        if rng.random() < 0.5:
+            debt['minimum_payment'] = rng.uniform(10, 50)
+        debts.append(debt)
+    return debts
+
+
+def loop_plan(debts, monthly_payment, strategy):
+    """Reference simulation stepping through every month"""
+    ordered = [dict(debt, remaining=debt['balance'], payoff=None) for debt in order_debts(debts, strategy)]
+    for month in range(1, MAX_MONTHS + 1):
+        open_debts = [debt for debt in ordered if debt['payoff'] is None]
+        if not open_debts:
+            break
+        budget = monthly_payment
+        for debt in open_debts:
+            debt['remaining'] *= 1 + debt['rate'] / 100 / 12
+            payment = min(debt.get('minimum_payment', 0.0), debt['remaining'])
+            debt['remaining'] -= payment
+            budget -= payment
+        for debt in open_debts:
+            payment = min(budget, debt['remaining'])
+            debt['remaining'] -= payment
+            budget -= payment
+            if debt['remaining'] <= 0.01:
+                debt['payoff'] = month
+    return [debt['payoff'] for debt in ordered]
+
+
+def check_parity(rng, companies=200):
+    """Payoff months must match the month-by-month loop"""
+    for _ in range(companies):
+        debts = generate_debts(rng.randint(1, 12), rng)
+        monthly_payment = sum(debt.get('minimum_payment', 0.0) for debt in debts) + rng.uniform(100, 3_000)
+        strategy = rng.choice(['snowball', 'avalanche'])
+        plan = repayment_plan(debts, monthly_payment, strategy)['plan']
+        for entry, payoff in zip(plan, loop_plan(debts, monthly_payment, strategy)):
+            if payoff is None:
+                assert not entry['paid_off'], entry
+            else:
+                # The loop stops at a balance below one cent, the closed form solves for zero
+                assert entry['paid_off'] and abs(entry['months'] - payoff) <= 1, entry
+
+
+def _cost(plan, objective):
+    """Rank of a plan for objective, with unpaid debts first as in the optimizer"""
+    unpaid = sum(not entry['paid_off'] for entry in plan['plan'])
+    summary = {'interest': plan['total_interest'], 'months': plan['total_months'],
+               'average_months': sum(entry['months'] for entry in plan['plan'])}
+    return unpaid, summary[objective]
+
+
+def check_optimizer(rng, companies=150):
+    """An optimal result must be as good as the best of every repayment order
+
+    Half of the portfolios are underfunded: the budget barely covers the interest,
+    so some orders leave more debts unpaid than others.
+    """
+    for i in range(companies):
+        debts = generate_debts(rng.randint(2, 5), rng)
+        total = sum(debt['balance'] for debt in debts)
+        free = total * (rng.uniform(0.002, 0.02) if i % 2 else rng.uniform(0.02, 0.2))
+        monthly_payment = sum(debt.get('minimum_payment', 0.0) for debt in debts) + free
+        objective = rng.choice(list(MEASURES))
+        result = optimize_repayment(debts, monthly_payment, objective, time_budget=5.0)
+        best = min(_cost(simulate_order(list(order), monthly_payment), objective)
+                   for order in itertools.permutations(debts))
+        found = _cost(result['plan'], objective)
+        assert result['optimal'], (debts, monthly_payment, objective)
+        assert found[0] == best[0] and found[1] <= best[1] + 1e-6 * max(1.0, abs(best[1])), \
+            (debts, monthly_payment, objective, found, best)
+
+
+def main():
+    rng = random.Random(42)
+    check_parity(rng)
+    check_optimizer(rng)
+
+    slowest = 0.0
+    for count in (10, 100, 300):
+        debts = generate_debts(count, rng)
+        monthly_payment = sum(debt.get('minimum_payment', 0.0) for debt in debts) * 1.5 + 2_000
+        runs = 50
+        rounds = []
+        for _ in range(ROUNDS):
+            start = time.perf_counter()
+            for _ in range(runs):
+                repayment_plan(debts, monthly_payment, 'avalanche')
+            rounds.append((time.perf_counter() - start) / runs * 1000)
+        elapsed = min(rounds)
+        print(f"{count:>4} debts: {elapsed:.3f} ms per plan")
+        slowest = max(slowest, elapsed)
+
+    start = time.perf_counter()
+    loop_plan(debts, monthly_payment, 'avalanche')
+    print(f"Month-by-month loop, {count} debts: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    print(f"{'✅' if slowest <= TARGET_MS else '❌'} Target: {TARGET_MS:.1f} ms")
+
+    # Enough budget to clear the portfolio in a few years
+    debts = generate_debts(50, rng)
+    monthly_payment = sum(debt.get('minimum_payment', 0.0) + debt['balance'] / 36 for debt in debts)
+    for objective in MEASURES:
+        result = optimize_repayment(debts, monthly_payment, objective, time_budget=0.5)
+        measure = MEASURES[objective]
+        baseline = min(plan[measure] for plan in result['baselines'].values())
+        print(f"Optimizer, 50 debts, {measure}: {result['summary'][measure]:,.1f} "
+              f"(best of snowball/avalanche {baseline:,.1f}), {result['nodes']} nodes in {result['elapsed']:.2f} s, "
+              f"{'optimal' if result['optimal'] else 'time budget used'}")
+
+    return 0 if slowest <= TARGET_MS else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for SME Debt Management Tool
+Measures create_app() time and the extra time of the first request to every
+page (template compilation) with lazy compilation, with templates compiled up
+front, and with the Jinja bytecode cache already on disk as after a restart
+Usage: python benchmarks/startup_benchmark.py
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+from load_benchmark import app_environment
+
+PAGES = [f'/{lang}/{page}' for lang in ('en', 'de') for page in (
+    '', 'debt-brake', 'cost-analysis', 'debt-equity', 'debt-snowball',
+    'funding-guidance', 'covenant-tracking', 'about', 'donation')]
+TARGET_SHARE = 0.2  # remaining first-request penalty relative to lazy compilation
+REPEATS = 5  # warm requests per page whose median is subtracted from the first
+ROUNDS = 3  # fresh processes per scenario; the median per page is kept
+
+# Runs in a fresh process, as a restarted server or recycled worker would
+MEASURE = r'''
+import json, statistics, sys, time
+start = time.perf_counter()
+from app import create_app
+app = create_app()
+startup = time.perf_counter() - start
+client = app.test_client()
+penalties = []
+for path in json.loads(sys.argv[1]):
+    timings = []
+    for _ in range(1 + REPEATS):
+        began = time.perf_counter()
+        assert client.get(path).status_code == 200, path
+        timings.append(time.perf_counter() - began)
+    penalties.append(timings[0] - statistics.median(timings[1:]))
+print(json.dumps({'startup': startup, 'penalties': penalties}))
+'''
+
+
+def measure(workdir, precompile, cache_dir):
+    """(create_app seconds, [first minus warm request seconds per page]) in a new process"""
+    env = dict(os.environ, **app_environment(workdir, 'startup'),
+               PAGE_CACHE_SIZE='0',  # every request renders, so only compilation differs
+               PRECOMPILE_TEMPLATES=str(precompile), JINJA_CACHE_DIR=cache_dir)
+    output = subprocess.run([sys.executable, '-c', MEASURE.replace('REPEATS', str(REPEATS)),
+                             json.dumps(PAGES)], cwd=ROOT, env=env,
+                            check=True, capture_output=True, text=True).stdout
+    result = json.loads(output.splitlines()[-1])
+    return result['startup'], result['penalties']
+
+
+def main():
+    with tempfile.TemporaryDirectory() as workdir:
+        cache_dir = os.path.join(workdir, 'jinja_cache')
+        scenarios = [
+            ('lazy, no bytecode cache (before)', False, ''),
+            ('precompiled, empty bytecode cache', True, cache_dir),
+            ('precompiled, bytecode cache on disk', True, cache_dir),
+            ('lazy, bytecode cache on disk', False, cache_dir),
+        ]
+        print(f"{'':<38}{'create_app':>12}{'first-request penalty':>24}{'worst page':>12}")
+        results = {}
+        for name, precompile, directory in scenarios:
+            rounds = [measure(workdir, precompile, directory) for _ in range(ROUNDS)]
+            startup = statistics.median(startup for startup, _ in rounds)
+            penalties = [max(statistics.median(page), 0) for page in zip(*(penalties for _, penalties in rounds))]
+            results[name] = sum(penalties)
+            print(f"{name:<38}{startup * 1000:>10.0f}ms{sum(penalties) * 1000:>22.1f}ms"
+                  f"{max(penalties) * 1000:>10.1f}ms")
+
+    before = results['lazy, no bytecode cache (before)']
+    after = results['precompiled, bytecode cache on disk']
+    ok = after <= before * TARGET_SHARE
+    print(f"{'✅' if ok else '❌'} First requests to all {len(PAGES)} pages cost {after * 1000:.1f}ms extra "
+          f"instead of {before * 1000:.1f}ms")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
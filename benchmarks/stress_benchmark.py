@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Covenant stress test benchmark for SME Debt Management Tool
+Measures Monte Carlo throughput serially and across a process pool, and checks
+that the worker count does not change the result
+Usage: python benchmarks/stress_benchmark.py [scenarios]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from calculations import check_covenants, stress_test
+
+TARGET_SECONDS = 5.0  # for 100k scenarios over 8 quarters
+COMPANY = {
+    'total_debt': 1_000_000,
+    'ebitda': 350_000,
+    'total_assets': 2_000_000,
+    'cash_flow': 150_000,
+    'average_interest_rate': 0.05,
+}
+
+
+def main(scenarios=100_000):
+    # With no volatility every path stays at today's figures
+    today = check_covenants(**COMPANY)['covenants']
+    flat = stress_test(**COMPANY, scenarios=1000, ebitda_volatility=0, rate_volatility=0,
+                       cash_flow_volatility=0, seed=1)
+    for name, covenant in today.items():
+        assert flat['covenants'][name]['breach_probability'] == (0.0 if covenant['compliant'] else 1.0), name
+
+    cpus = os.cpu_count() or 1
+    timings = {}
+    results = {}
+    for workers in sorted({1, cpus}):
+        start = time.perf_counter()
+        results[workers] = stress_test(**COMPANY, scenarios=scenarios, seed=42, workers=workers)
+        timings[workers] = time.perf_counter() - start
+    assert results[1] == results[cpus], 'results depend on the worker count'
+
+    result = results[cpus]
+    print(f"Scenarios:         {scenarios:,} x {result['quarters']} quarters")
+    for workers, elapsed in timings.items():
+        print(f"{workers} worker(s):       {elapsed:.3f} s ({scenarios / elapsed:,.0f} scenarios/s)")
+    for name, covenant in result['covenants'].items():
+        print(f"  {name:<20} {covenant['breach_probability']:.2%}")
+    print(f"  {'any':<20} {result['any_breach_probability']:.2%}")
+
+    elapsed = timings[cpus]
+    target = TARGET_SECONDS * scenarios / 100_000
+    print(f"{'✅' if elapsed <= target else '❌'} Target: {target:.2f} s")
+    return 0 if elapsed <= target else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Translation micro-benchmark for SME Debt Management Tool
+Compares per-render translation cost of the old inline dictionary closure
+(which rebuilt the whole catalog on every _() call) with the cached catalog
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import session
+from app import create_app
+
+TEMPLATES = ['funding_guidance.html', 'debt_brake.html', 'covenant_tracking.html', 'index.html']
+
+
+def build_legacy_translate(catalog):
+    """Recreate the old _() closure: a dict literal evaluated on every call"""
+    entries = ',\n'.join(f'        {key!r}: {value!r}' for key, value in catalog.items())
+    source = (
+        'def legacy_translate(text):\n'
+        '    if session.get("language", "de") == "de":\n'
+        f'        translations = {{\n{entries}\n        }}\n'
+        '        return translations.get(text, text)\n'
+        '    return text\n'
+    )
+    namespace = {'session': session}
+    exec(source, namespace)
+    return namespace['legacy_translate']
+
+
+def count_calls(app, template, translate):
+    """Render template once and count the _() calls it makes"""
+    calls = []
+
+    def counting(text):
+        calls.append(text)
+        return translate(text)
+
+    app.jinja_env.globals['_'] = counting
+    app.jinja_env.get_template(template).render()
+    return calls
+
+
+def main(repeat=200):
+    app = create_app()
+    current = app.jinja_env.globals['_']
+    legacy = build_legacy_translate(app.translator.catalogs['de'])
+
+    print(f"{'template':<26}{'calls':>7}{'legacy ms':>12}{'cached ms':>12}{'speedup':>10}")
+    with app.test_request_context():
+        session['language'] = 'de'
+        for template in TEMPLATES:
+            strings = count_calls(app, template, current)
+
+            # Translation cost alone: replay the exact sequence of lookups of one render
+            legacy_ms = timeit.timeit(lambda: [legacy(s) for s in strings], number=repeat) / repeat * 1000
+            cached_ms = timeit.timeit(lambda: [current(s) for s in strings], number=repeat) / repeat * 1000
+
+            print(f"{template:<26}{len(strings):>7}{legacy_ms:>12.3f}{cached_ms:>12.3f}{legacy_ms / cached_ms:>9.1f}x")
+
+        # Full render cost with each translation function installed
+        print()
+        print(f"{'template':<26}{'render (legacy) ms':>20}{'render (cached) ms':>20}")
+        for template_name in TEMPLATES:
+            template = app.jinja_env.get_template(template_name)
+            app.jinja_env.globals['_'] = legacy
+            legacy_ms = timeit.timeit(template.render, number=repeat) / repeat * 1000
+            app.jinja_env.globals['_'] = current
+            cached_ms = timeit.timeit(template.render, number=repeat) / repeat * 1000
+            print(f"{template_name:<26}{legacy_ms:>20.3f}{cached_ms:>20.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Calculation engine for SME Debt Management Tool
+Pure functions behind every tool page, shared by the JSON API and batch jobs
+"""
+
+from .amortization import amortization_schedule, loan_book_schedule
+from .cost_analysis import annuity_payment, cost_analysis
+from .covenants import check_covenants, covenant_ratios
+from .debt_brake import debt_brake
+from .debt_equity import debt_equity_swap
+from .debt_snowball import order_debts, repayment_plan, simulate_order
+from .optimizer import optimize_repayment
+from .stress_test import stress_test
+
+# Tool name (as used in /api/<tool>) -> calculation function
+TOOLS = {
+    'debt-brake': debt_brake,
+    'cost-analysis': cost_analysis,
+    'amortization': amortization_schedule,
+    'debt-equity': debt_equity_swap,
+    'debt-snowball': repayment_plan,
+    'debt-optimizer': optimize_repayment,
+    'covenant-tracking': check_covenants,
+    'covenant-stress-test': stress_test,
+}
+
+__all__ = [
+    'TOOLS',
+    'amortization_schedule',
+    'annuity_payment',
+    'check_covenants',
+    'cost_analysis',
+    'covenant_ratios',
+    'debt_brake',
+    'debt_equity_swap',
+    'loan_book_schedule',
+    'optimize_repayment',
+    'order_debts',
+    'repayment_plan',
+    'simulate_order',
+    'stress_test',
+]
@@ -0,0 +1,155 @@
+"""
+Amortization schedules for annuity loans
+Closed-form, vectorized monthly and yearly schedules for single loans and whole loan books
+"""
+
+import numpy as np
+
+from .cost_analysis import MAX_TERM
+
+MONTHLY_COLUMNS = ('payment', 'interest', 'principal', 'fees', 'balance')
+DEFAULT_CHUNK_SIZE = 10_000  # loans per pass when summing a loan book
+
+
+def _loan_arrays(principal, interest_rate, term, fees, monthly_fees):
+    """Broadcast loan inputs to equal-length float arrays and derive the annuity terms"""
+    inputs = {'principal': principal, 'interest_rate': interest_rate, 'term': term,
+              'fees': fees, 'monthly_fees': monthly_fees}
+    principal, interest_rate, term, fees, monthly_fees = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(value, dtype=float)) for value in inputs.values())
+    )
+    for name, values in zip(inputs, (principal, interest_rate, term, fees, monthly_fees)):
+        if not np.all(np.isfinite(values)):
+            raise ValueError(f'{name} must be a finite number')
+    if np.any(principal <= 0) or np.any(term <= 0) or np.any(interest_rate < 0):
+        raise ValueError('principal and term must be positive and interest_rate must not be negative')
+    # Also keeps the month counts far from int64 overflow and schedules at most 600 rows
+    if np.any(term > MAX_TERM):
+        raise ValueError(f'term must be at most {MAX_TERM} years')
+
+    months = np.maximum(np.rint(term * 12), 1).astype(np.int64)
+    monthly_rate = interest_rate / 100 / 12
+    log_growth = np.log1p(monthly_rate)
+    # (1 + r)^n - 1, accurate for small rates; zero when the loan is interest free
+    with np.errstate(over='ignore'):
+        growth = np.expm1(months * log_growth)
+    if not np.all(np.isfinite(growth)):
+        raise ValueError('interest_rate is too high for the term')
+    interest_free = growth == 0
+    payment = np.where(
+        interest_free,
+        principal / months,
+        principal * monthly_rate * (growth + 1) / np.where(interest_free, 1.0, growth),
+    )
+    return {
+        'principal': principal,
+        'months': months,
+        'monthly_rate': monthly_rate,
+        'log_growth': log_growth,
+        'growth': growth,
+        'interest_free': interest_free,
+        'payment': payment,
+        'fees': fees,
+        'monthly_fees': monthly_fees,
+    }
+
+
+def _balances(loans, elapsed):
+    """Closed-form outstanding balance after elapsed months, shape (loans, len(elapsed))
+
+    B_k = P * ((1 + r)^n - (1 + r)^k) / ((1 + r)^n - 1), and zero once k >= n.
+    """
+    months = loans['months'][:, None]
+    k = np.minimum(elapsed[None, :], months)
+    growth = loans['growth'][:, None]
+    interest_free = loans['interest_free'][:, None]
+    paid_share = np.where(
+        interest_free,
+        k / months,
+        np.expm1(k * loans['log_growth'][:, None]) / np.where(interest_free, 1.0, growth),
+    )
+    return loans['principal'][:, None] * (1 - paid_share)
+
+
+def _monthly(loans, periods):
+    elapsed = np.arange(periods + 1)
+    balance = _balances(loans, elapsed)
+    opening = balance[:, :-1]
+    active = elapsed[None, 1:] <= loans['months'][:, None]
+    fees = np.where(active, loans['monthly_fees'][:, None], 0.0)
+    fees[:, 0] += loans['fees']
+    return {
+        'payment': np.where(active, loans['payment'][:, None], 0.0),
+        'interest': opening * loans['monthly_rate'][:, None],
+        'principal': opening - balance[:, 1:],
+        'fees': fees,
+        'balance': balance[:, 1:],
+    }
+
+
+def _yearly(loans, periods):
+    """Yearly totals straight from the balances at each year end, no monthly rows needed"""
+    balance = _balances(loans, np.arange(periods + 1) * 12)
+    months_paid = np.clip(loans['months'][:, None] - np.arange(periods)[None, :] * 12, 0, 12)
+    payment = loans['payment'][:, None] * months_paid
+    principal = balance[:, :-1] - balance[:, 1:]
+    fees = loans['monthly_fees'][:, None] * months_paid
+    fees[:, 0] += loans['fees']
+    return {
+        'payment': payment,
+        # Every payment is interest plus principal, so a year's interest is what is left over
+        'interest': payment - principal,
+        'principal': principal,
+        'fees': fees,
+        'balance': balance[:, 1:],
+    }
+
+
+def loan_book_schedule(principal, interest_rate, term, fees=0.0, monthly_fees=0.0,
+                       yearly=False, total=False, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Amortization schedules for many annuity loans at once
+
+    Inputs are scalars or equal-length arrays (one entry per loan), with
+    interest_rate in percent and term in years. Returns {column: array} with
+    one row per loan and one column per month (or year, if yearly) up to the
+    longest term; loans that are already repaid show zeros. With total=True
+    the loan book is summed per period in chunks of chunk_size loans, so
+    memory stays bounded however many loans there are.
+    """
+    loans = _loan_arrays(principal, interest_rate, term, fees, monthly_fees)
+    periods = int(loans['months'].max())
+    if yearly:
+        periods = -(-periods // 12)
+    build = _yearly if yearly else _monthly
+
+    if not total:
+        schedule = build(loans, periods)
+    else:
+        schedule = {name: np.zeros(periods) for name in MONTHLY_COLUMNS}
+        for start in range(0, len(loans['principal']), chunk_size):
+            chunk = {name: values[start:start + chunk_size] for name, values in loans.items()}
+            for name, values in build(chunk, periods).items():
+                schedule[name] += values.sum(axis=0)
+
+    period_name = 'year' if yearly else 'month'
+    return {period_name: np.arange(1, periods + 1), **schedule}
+
+
+def amortization_schedule(principal, interest_rate, term, fees=0.0, monthly_fees=0.0, yearly=False):
+    """Amortization schedule of a single annuity loan of term years
+
+    Returns the monthly payment, totals and the schedule as {column: list},
+    monthly or aggregated per year.
+    """
+    loans = _loan_arrays(principal, interest_rate, term, fees, monthly_fees)
+    if len(loans['principal']) != 1:
+        raise ValueError('use loan_book_schedule for more than one loan')
+
+    schedule = loan_book_schedule(principal, interest_rate, term, fees, monthly_fees, yearly=yearly)
+    return {
+        'monthly_payment': float(loans['payment'][0]),
+        'months': int(loans['months'][0]),
+        'total_interest': float(schedule['interest'].sum()),
+        'total_fees': float(schedule['fees'].sum()),
+        'schedule': {name: values.ravel().tolist() for name, values in schedule.items()},
+    }
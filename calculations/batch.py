@@ -0,0 +1,225 @@
+"""
+Portfolio batch evaluation
+Vectorized debt brake and covenant checks for many companies at once
+Usage: python -m calculations.batch portfolio.csv > results.csv
+"""
+
+import csv
+import io
+import math
+import sys
+
+import numpy as np
+
+from .covenants import DEFAULT_AVERAGE_INTEREST_RATE, DEFAULT_LIMITS
+from .debt_brake import DEBT_BRAKE_RATE, DEFAULT_DEBT_SERVICE_RATIO
+
+ID_COLUMN = 'company'
+REQUIRED_COLUMNS = ('revenue', 'expenses')
+COVENANT_COLUMNS = ('total_debt', 'ebitda', 'total_assets', 'cash_flow')
+
+# Optional input columns and the value used when a column is missing
+OPTIONAL_COLUMNS = {
+    'existing_debt': 0.0,
+    'debt_service_ratio': DEFAULT_DEBT_SERVICE_RATIO,
+    'average_interest_rate': DEFAULT_AVERAGE_INTEREST_RATE,
+    **DEFAULT_LIMITS,
+}
+# Every numeric input column; other columns (besides the company id) are ignored
+NUMERIC_COLUMNS = (*REQUIRED_COLUMNS, *COVENANT_COLUMNS, *OPTIONAL_COLUMNS)
+
+
+def _divide(numerator, denominator):
+    """Element-wise division that yields NaN instead of dividing by zero"""
+    result = np.full(np.broadcast(numerator, denominator).shape, np.nan)
+    np.divide(numerator, denominator, out=result, where=denominator != 0)
+    return result
+
+
+def _cell(value, missing):
+    """A JSON value or CSV string as a float: missing for None / '', NaN for anything but a finite number"""
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return missing
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        return np.nan
+    try:
+        value = float(value)
+    except (ValueError, OverflowError):
+        return np.nan
+    return value if math.isfinite(value) else np.nan
+
+
+def _floats(values, name):
+    """Convert one column to a float array; bad cells become NaN so that only their row is invalid
+
+    Empty cells of an optional column take its default, those of any other column are NaN.
+    """
+    try:
+        # Only numbers and numeric strings: one conversion for the whole column
+        if not set(map(type, values)) <= {int, float, str}:
+            raise TypeError
+        array = np.array(values, dtype=float)
+    except (ValueError, TypeError, OverflowError):
+        missing = OPTIONAL_COLUMNS.get(name, np.nan)
+        return np.array([_cell(value, missing) for value in values], dtype=float)
+    array[~np.isfinite(array)] = np.nan
+    return array
+
+
+def columns_from_rows(rows):
+    """Turn a list of {column: value} dicts into {column: array}"""
+    if not rows:
+        raise ValueError('no rows to evaluate')
+    names = set().union(*(row.keys() for row in rows))
+    columns = {}
+    for name in names:
+        if name == ID_COLUMN:
+            columns[name] = [row.get(name) for row in rows]
+        elif name in NUMERIC_COLUMNS:
+            columns[name] = _floats([row.get(name) for row in rows], name)
+    return columns
+
+
+def columns_from_csv(text):
+    """Parse CSV text with a header row into {column: array}"""
+    reader = csv.reader(io.StringIO(text))
+    try:
+        header = [name.strip() for name in next(reader)]
+    except StopIteration:
+        raise ValueError('no rows to evaluate')
+    records = [record for record in reader if record]
+    if not records:
+        raise ValueError('no rows to evaluate')
+    if any(len(record) != len(header) for record in records):
+        raise ValueError(f'every row must have {len(header)} columns')
+
+    columns = {}
+    for name, values in zip(header, zip(*records)):
+        if name == ID_COLUMN:
+            columns[name] = list(values)
+        elif name in NUMERIC_COLUMNS:
+            columns[name] = _floats(values, name)
+    return columns
+
+
+def evaluate_portfolio(columns):
+    """Evaluate debt brake limits and, if the inputs are present, covenants for every row
+
+    columns maps input names to equal-length arrays; optional columns that are
+    left out take their defaults. Rows with invalid inputs (non-positive revenue,
+    NaN or infinite values, which is how the parsers mark missing and
+    non-numeric cells) are flagged with valid=False and NaN results instead of
+    failing the whole batch. Covenant inputs only affect covenants_valid.
+    """
+    missing = [name for name in REQUIRED_COLUMNS if name not in columns]
+    if missing:
+        raise ValueError(f'missing required columns: {", ".join(missing)}')
+
+    size = len(columns['revenue'])
+    inputs = {name: np.asarray(columns[name], dtype=float) for name in REQUIRED_COLUMNS}
+    for name, default in OPTIONAL_COLUMNS.items():
+        inputs[name] = np.asarray(columns[name], dtype=float) if name in columns else np.full(size, default)
+
+    revenue = inputs['revenue']
+    existing_debt = inputs['existing_debt']
+    valid = (revenue > 0) & (existing_debt >= 0) & (inputs['debt_service_ratio'] >= 0)
+    for name in ('revenue', 'expenses', 'existing_debt', 'debt_service_ratio'):
+        valid &= np.isfinite(inputs[name])
+
+    # Debt brake, same rules as calculations.debt_brake
+    net_income = revenue - inputs['expenses']
+    max_debt_service = net_income * inputs['debt_service_ratio']
+    debt_to_income_ratio = np.where(net_income > 0, _divide(existing_debt, net_income), np.nan)
+    debt_limit = revenue * DEBT_BRAKE_RATE
+    results = {
+        'valid': valid,
+        'net_income': np.where(valid, net_income, np.nan),
+        'max_debt_service': np.where(valid, max_debt_service, np.nan),
+        'max_new_debt': np.where(valid, np.maximum(0.0, max_debt_service * 12 - existing_debt), np.nan),
+        'debt_to_income_ratio': np.where(valid, debt_to_income_ratio, np.nan),
+        'is_sustainable': valid & (debt_to_income_ratio <= inputs['debt_service_ratio']),
+        'debt_limit': np.where(valid, debt_limit, np.nan),
+        'available_capacity': np.where(valid, np.maximum(0.0, debt_limit - existing_debt), np.nan),
+        'debt_usage': np.where(valid, _divide(existing_debt, debt_limit) * 100, np.nan),
+        'within_debt_limit': valid & (existing_debt <= debt_limit),
+    }
+
+    # Covenants, same rules as calculations.check_covenants
+    if all(name in columns for name in COVENANT_COLUMNS):
+        total_debt, ebitda, total_assets, cash_flow = (
+            np.asarray(columns[name], dtype=float) for name in COVENANT_COLUMNS
+        )
+        covenant_valid = ((total_debt > 0) & (ebitda != 0) & (total_assets > 0)
+                          & (inputs['average_interest_rate'] > 0))
+        for values in (total_debt, ebitda, total_assets, cash_flow, inputs['average_interest_rate'],
+                       *(inputs[name] for name in DEFAULT_LIMITS)):
+            covenant_valid &= np.isfinite(values)
+        interest_expense = total_debt * inputs['average_interest_rate']
+        ratios = {
+            'debt_to_ebitda': _divide(total_debt, ebitda),
+            'interest_coverage': _divide(ebitda, interest_expense),
+            'debt_to_assets': _divide(total_debt, total_assets),
+            'cash_flow_coverage': _divide(cash_flow, interest_expense),
+        }
+        compliant = {
+            'debt_to_ebitda': ratios['debt_to_ebitda'] <= inputs['max_debt_to_ebitda'],
+            'interest_coverage': ratios['interest_coverage'] >= inputs['min_interest_coverage'],
+            'debt_to_assets': ratios['debt_to_assets'] <= inputs['max_debt_to_assets'],
+            'cash_flow_coverage': ratios['cash_flow_coverage'] >= inputs['min_cash_flow_coverage'],
+        }
+        all_compliant = covenant_valid.copy()
+        for name, ratio in ratios.items():
+            results[name] = np.where(covenant_valid, ratio, np.nan)
+            results[f'{name}_compliant'] = covenant_valid & compliant[name]
+            all_compliant &= compliant[name]
+        results['covenants_valid'] = covenant_valid
+        results['all_compliant'] = all_compliant
+
+    if ID_COLUMN in columns:
+        results = {ID_COLUMN: list(columns[ID_COLUMN]), **results}
+    return results
+
+
+def results_to_rows(results):
+    """Turn {column: array} results into a list of row dicts (NaN becomes None)"""
+    names = list(results)
+    columns = []
+    for name in names:
+        values = results[name]
+        if isinstance(values, np.ndarray):
+            if values.dtype.kind == 'f':
+                values = np.where(np.isnan(values), None, values)
+            values = values.tolist()
+        columns.append(values)
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+def results_to_csv(results):
+    """Render {column: array} results as CSV text"""
+    output = io.StringIO()
+    writer = csv.writer(output, lineterminator='\n')
+    writer.writerow(results)
+    columns = []
+    for values in results.values():
+        if isinstance(values, np.ndarray):
+            if values.dtype.kind == 'f':
+                values = np.where(np.isnan(values), '', values.astype(str))
+            values = values.tolist()
+        columns.append(values)
+    writer.writerows(zip(*columns))
+    return output.getvalue()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print("Usage: python -m calculations.batch portfolio.csv > results.csv", file=sys.stderr)
+        return 2
+    with open(argv[0], encoding='utf-8') as f:
+        results = evaluate_portfolio(columns_from_csv(f.read()))
+    sys.stdout.write(results_to_csv(results))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
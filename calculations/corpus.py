@@ -0,0 +1,90 @@
+"""
+Shared calculation corpus
+Checks that the Python calculations and static/js/calculation-core.js agree,
+and that the Python calculations reject invalid input with a readable message
+Usage: python -m calculations.corpus
+"""
+
+import json
+import math
+import os
+import shutil
+import subprocess
+import sys
+
+from . import TOOLS
+
+CORPUS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus.json')
+JS_CHECK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus_check.js')
+
+
+def load_corpus(path=CORPUS_PATH):
+    """Load the corpus of {name, tool, input, expected} and {name, tool, input, error} cases"""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def matches(actual, expected, tolerance):
+    """Compare results, allowing a relative tolerance on numbers"""
+    if isinstance(expected, bool) or expected is None or isinstance(expected, str):
+        return actual == expected
+    if isinstance(expected, (int, float)):
+        return isinstance(actual, (int, float)) and math.isclose(actual, expected, rel_tol=tolerance, abs_tol=tolerance)
+    if isinstance(expected, list):
+        return (isinstance(actual, list) and len(actual) == len(expected)
+                and all(matches(a, e, tolerance) for a, e in zip(actual, expected)))
+    if isinstance(expected, dict):
+        return isinstance(actual, dict) and all(matches(actual.get(k), v, tolerance) for k, v in expected.items())
+    return actual == expected
+
+
+def rejects(calculation, inputs, error):
+    """True if calculation raises ValueError(error) for inputs"""
+    try:
+        calculation(**inputs)
+    except ValueError as e:
+        return str(e) == error
+    return False
+
+
+def check_python(corpus):
+    """Return the names of cases the Python calculations get wrong"""
+    return [
+        case['name'] for case in corpus['cases']
+        if not (rejects(TOOLS[case['tool']], case['input'], case['error']) if 'error' in case
+                else matches(TOOLS[case['tool']](**case['input']), case['expected'], corpus['tolerance']))
+    ]
+
+
+def check_javascript():
+    """Return the names of cases the JS calculation core gets wrong, or None without Node.js"""
+    node = shutil.which('node')
+    if node is None:
+        return None
+    output = subprocess.run([node, JS_CHECK_PATH], capture_output=True, text=True, check=True).stdout
+    return [failure['name'] for failure in json.loads(output)['failures']]
+
+
+def main():
+    corpus = load_corpus()
+    python_failures = check_python(corpus)
+    js_failures = check_javascript()
+    # Input validation is the server's job, so the JS core only runs the cases with results
+    js_cases = sum('expected' in case for case in corpus['cases'])
+
+    print(f"Python: {len(corpus['cases']) - len(python_failures)}/{len(corpus['cases'])} cases match")
+    if js_failures is None:
+        print("JavaScript: skipped (node not found)")
+    else:
+        print(f"JavaScript: {js_cases - len(js_failures)}/{js_cases} cases match")
+
+    for name in python_failures:
+        print(f"  Python mismatch: {name}")
+    for name in js_failures or []:
+        print(f"  JavaScript mismatch: {name}")
+
+    return 1 if python_failures or js_failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,36 @@
+// Runs calculations/corpus.json through static/js/calculation-core.js and prints
+// the cases whose results differ from the expected values as JSON. Cases that
+// expect an error test the server's input validation and are skipped.
+// Usage: node calculations/corpus_check.js
+
+const fs = require('fs');
+const path = require('path');
+const core = require('../static/js/calculation-core.js');
+
+function matches(actual, expected, tolerance) {
+    if (typeof expected === 'number' && typeof actual === 'number') {
+        return Math.abs(actual - expected) <= tolerance * Math.max(1, Math.abs(expected));
+    }
+    if (Array.isArray(expected)) {
+        return Array.isArray(actual) && actual.length === expected.length &&
+            expected.every((item, index) => matches(actual[index], item, tolerance));
+    }
+    if (expected !== null && typeof expected === 'object') {
+        return actual !== null && typeof actual === 'object' &&
+            Object.keys(expected).every(key => matches(actual[key], expected[key], tolerance));
+    }
+    return actual === expected;
+}
+
+const corpus = JSON.parse(fs.readFileSync(path.join(__dirname, 'corpus.json'), 'utf8'));
+const cases = corpus.cases.filter(testCase => !('error' in testCase));
+const failures = [];
+
+cases.forEach(testCase => {
+    const actual = core.runTool(testCase.tool, testCase.input);
+    if (!matches(actual, testCase.expected, corpus.tolerance)) {
+        failures.push({ name: testCase.name, actual: actual, expected: testCase.expected });
+    }
+});
+
+console.log(JSON.stringify({ checked: cases.length, failures: failures }));
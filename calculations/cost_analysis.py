@@ -0,0 +1,55 @@
+"""
+Cost of debt calculator
+Annuity payments and the total cost of a loan including fees and opportunity cost
+"""
+
+from .validation import finite, non_negative, positive
+
+DEFAULT_OPPORTUNITY_COST = 8.0  # % per year
+MAX_TERM = 50  # years
+
+
+def annuity_payment(principal, annual_rate, months):
+    """Return the fixed monthly payment that repays principal over months
+
+    annual_rate is a percentage, e.g. 4.5 for 4.5%.
+    """
+    if months <= 0:
+        raise ValueError('months must be positive')
+
+    monthly_rate = annual_rate / 100 / 12
+    if monthly_rate == 0:
+        return principal / months
+    # Discounting rather than compounding, which underflows to 0 instead of overflowing
+    return principal * monthly_rate / (1 - (1 + monthly_rate) ** -months)
+
+
+def cost_analysis(principal, interest_rate, term, fees=0.0, monthly_fees=0.0,
+                  opportunity_cost=DEFAULT_OPPORTUNITY_COST):
+    """Analyse the total cost of an annuity loan of term years"""
+    positive('principal', principal)
+    positive('interest_rate', interest_rate)
+    if positive('term', term) > MAX_TERM:
+        raise ValueError(f'term must be at most {MAX_TERM} years')
+    non_negative('fees', fees)
+    non_negative('monthly_fees', monthly_fees)
+    finite('opportunity_cost', opportunity_cost)
+
+    months = term * 12
+    monthly_payment = annuity_payment(principal, interest_rate, months)
+    total_payment = monthly_payment * months
+    total_interest = total_payment - principal
+    total_fees = fees + monthly_fees * months
+    opportunity_cost_value = principal * opportunity_cost / 100 * term
+    total_cost = total_interest + total_fees + opportunity_cost_value
+
+    return {
+        'principal': principal,
+        'monthly_payment': monthly_payment,
+        'total_payment': total_payment,
+        'total_interest': total_interest,
+        'total_fees': total_fees,
+        'opportunity_cost': opportunity_cost_value,
+        'total_cost': total_cost,
+        'effective_rate': total_cost / principal / term * 100,
+    }
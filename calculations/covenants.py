@@ -0,0 +1,75 @@
+"""
+Debt covenant tracking
+Financial ratios checked against the limits agreed with lenders
+"""
+
+from .validation import finite, positive
+
+DEFAULT_AVERAGE_INTEREST_RATE = 0.05
+DEFAULT_LIMITS = {
+    'max_debt_to_ebitda': 3.5,
+    'min_interest_coverage': 2.5,
+    'max_debt_to_assets': 0.6,
+    'min_cash_flow_coverage': 1.2,
+}
+
+
+def covenant_ratios(total_debt, ebitda, total_assets, cash_flow,
+                    average_interest_rate=DEFAULT_AVERAGE_INTEREST_RATE):
+    """Compute the covenant ratios; interest expense is estimated from average_interest_rate"""
+    positive('total_debt', total_debt)
+    if finite('ebitda', ebitda) == 0:
+        raise ValueError('ebitda must not be zero')
+    positive('total_assets', total_assets)
+    finite('cash_flow', cash_flow)
+    # Interest expense is a denominator
+    positive('average_interest_rate', average_interest_rate)
+
+    interest_expense = total_debt * average_interest_rate
+    return {
+        'debt_to_ebitda': total_debt / ebitda,
+        'interest_coverage': ebitda / interest_expense,
+        'debt_to_assets': total_debt / total_assets,
+        'cash_flow_coverage': cash_flow / interest_expense,
+    }
+
+
+def check_covenants(total_debt, ebitda, total_assets, cash_flow,
+                    max_debt_to_ebitda=DEFAULT_LIMITS['max_debt_to_ebitda'],
+                    min_interest_coverage=DEFAULT_LIMITS['min_interest_coverage'],
+                    max_debt_to_assets=DEFAULT_LIMITS['max_debt_to_assets'],
+                    min_cash_flow_coverage=DEFAULT_LIMITS['min_cash_flow_coverage'],
+                    average_interest_rate=DEFAULT_AVERAGE_INTEREST_RATE):
+    """Check each covenant ratio against its limit"""
+    finite('max_debt_to_ebitda', max_debt_to_ebitda)
+    finite('min_interest_coverage', min_interest_coverage)
+    finite('max_debt_to_assets', max_debt_to_assets)
+    finite('min_cash_flow_coverage', min_cash_flow_coverage)
+    ratios = covenant_ratios(total_debt, ebitda, total_assets, cash_flow, average_interest_rate)
+    covenants = {
+        'debt_to_ebitda': {
+            'value': ratios['debt_to_ebitda'],
+            'limit': max_debt_to_ebitda,
+            'compliant': ratios['debt_to_ebitda'] <= max_debt_to_ebitda,
+        },
+        'interest_coverage': {
+            'value': ratios['interest_coverage'],
+            'limit': min_interest_coverage,
+            'compliant': ratios['interest_coverage'] >= min_interest_coverage,
+        },
+        'debt_to_assets': {
+            'value': ratios['debt_to_assets'],
+            'limit': max_debt_to_assets,
+            'compliant': ratios['debt_to_assets'] <= max_debt_to_assets,
+        },
+        'cash_flow_coverage': {
+            'value': ratios['cash_flow_coverage'],
+            'limit': min_cash_flow_coverage,
+            'compliant': ratios['cash_flow_coverage'] >= min_cash_flow_coverage,
+        },
+    }
+
+    return {
+        'covenants': covenants,
+        'all_compliant': all(covenant['compliant'] for covenant in covenants.values()),
+    }
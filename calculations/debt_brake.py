@@ -0,0 +1,34 @@
+"""
+Debt brake calculator
+Borrowing limits from revenue (0.35% rule) and sustainable debt service from net income
+"""
+
+from .validation import finite, non_negative, positive
+
+DEBT_BRAKE_RATE = 0.0035  # 0.35% of annual revenue
+DEFAULT_DEBT_SERVICE_RATIO = 0.30
+
+
+def debt_brake(revenue, expenses, existing_debt=0.0, debt_service_ratio=DEFAULT_DEBT_SERVICE_RATIO):
+    """Evaluate a company's debt capacity under the debt brake rules"""
+    positive('revenue', revenue)
+    finite('expenses', expenses)
+    non_negative('existing_debt', existing_debt)
+    non_negative('debt_service_ratio', debt_service_ratio)
+
+    net_income = revenue - expenses
+    max_debt_service = net_income * debt_service_ratio
+    max_new_debt = max_debt_service * 12 - existing_debt
+    debt_to_income_ratio = existing_debt / net_income if net_income > 0 else None
+    debt_limit = revenue * DEBT_BRAKE_RATE
+
+    return {
+        'net_income': net_income,
+        'max_debt_service': max_debt_service,
+        'max_new_debt': max(0.0, max_new_debt),
+        'debt_to_income_ratio': debt_to_income_ratio,
+        'is_sustainable': debt_to_income_ratio is not None and debt_to_income_ratio <= debt_service_ratio,
+        'debt_limit': debt_limit,
+        'available_capacity': max(0.0, debt_limit - existing_debt),
+        'debt_usage': existing_debt / debt_limit * 100,
+    }
@@ -0,0 +1,29 @@
+"""
+Debt-for-equity swap simulation
+Shares issued to creditors and the resulting ownership dilution
+"""
+
+from .validation import positive
+
+DEFAULT_CONVERSION_RATIO = 1.2
+
+
+def debt_equity_swap(debt_amount, company_value, existing_shares, conversion_ratio=DEFAULT_CONVERSION_RATIO):
+    """Simulate converting debt_amount into new shares"""
+    positive('debt_amount', debt_amount)
+    positive('company_value', company_value)
+    positive('existing_shares', existing_shares)
+    positive('conversion_ratio', conversion_ratio)
+
+    share_price = company_value / existing_shares
+    new_shares = debt_amount / share_price * conversion_ratio
+    total_shares = existing_shares + new_shares
+
+    return {
+        'share_price': share_price,
+        'new_shares': new_shares,
+        'total_shares': total_shares,
+        'new_share_price': company_value / total_shares,
+        'ownership_dilution': new_shares / total_shares * 100,
+        'debt_reduction': debt_amount,
+    }
@@ -0,0 +1,285 @@
+"""
+Debt snowball and avalanche repayment plans
+Orders a company's debts by strategy and simulates their repayment
+"""
+
+import heapq
+import math
+
+from .validation import non_negative, positive
+
+STRATEGIES = ('snowball', 'avalanche')
+MAX_MONTHS = 600  # 50 years
+PAID_OFF = 0.01  # balances below a cent count as repaid
+_PLAIN = (int, float)  # types of numbers as they come from JSON
+
+
+def check_debts(debts):
+    """Raise ValueError unless debts is a non-empty list of valid {'name', 'balance', 'rate'} dicts"""
+    if not isinstance(debts, (list, tuple)) or not debts:
+        raise ValueError('at least one debt is required')
+    for number, debt in enumerate(debts, 1):
+        # Dicts of plain finite numbers of at least zero, the usual case, need no closer look
+        try:
+            balance, rate, minimum = debt['balance'], debt['rate'], debt.get('minimum_payment', 0.0)
+        except (KeyError, TypeError, AttributeError):
+            _check_debt(number, debt)
+        if not (type(balance) in _PLAIN and type(rate) in _PLAIN and type(minimum) in _PLAIN
+                and balance >= 0 and rate >= 0 and minimum >= 0
+                and balance + rate + minimum < math.inf and 'name' in debt):  # NaN fails here too
+            _check_debt(number, debt)
+
+
+def _check_debt(number, debt):
+    """Raise ValueError saying what is wrong with the number-th debt"""
+    if not isinstance(debt, dict):
+        raise ValueError(f'debt {number} must be an object')
+    for field in ('name', 'balance', 'rate'):
+        if field not in debt:
+            raise ValueError(f'debt {number} has no {field}')
+    non_negative(f'balance of debt {number}', debt['balance'])
+    non_negative(f'rate of debt {number}', debt['rate'])
+    non_negative(f'minimum_payment of debt {number}', debt.get('minimum_payment', 0.0))
+
+
+def order_debts(debts, strategy='snowball'):
+    """Sort debts by balance (snowball) or by interest rate, highest first (avalanche)"""
+    if strategy not in STRATEGIES:
+        raise ValueError(f'strategy must be one of {", ".join(STRATEGIES)}')
+    check_debts(debts)
+    return _order(debts, strategy)
+
+
+def _order(debts, strategy):
+    """order_debts for debts that have been checked"""
+    if strategy == 'snowball':
+        return sorted(debts, key=lambda debt: debt['balance'])
+    return sorted(debts, key=lambda debt: -debt['rate'])
+
+
+class _Debt:
+    """Balance of one debt in closed form from its last event onwards
+
+    Between events a debt receives a constant payment, so its balance after k
+    more months is b * g^k - p * (g^k - 1) / r with g = 1 + r.
+    """
+
+    __slots__ = ('index', 'name', 'original_balance', 'balance', 'rate', 'minimum', 'payment',
+                 'since', 'paid', 'payoff', 'version')
+
+    def __init__(self, index, debt):
+        self.index = index
+        self.name = debt['name']
+        self.original_balance = debt['balance']
+        self.balance = debt['balance']
+        self.rate = debt['rate'] / 100 / 12
+        self.minimum = debt.get('minimum_payment', 0.0)
+        self.payment = self.minimum
+        self.since = 0
+        self.paid = 0.0
+        self.payoff = None
+        self.version = 0
+
+    def copy(self):
+        other = _Debt.__new__(_Debt)
+        for name in _Debt.__slots__:
+            setattr(other, name, getattr(self, name))
+        return other
+
+    def balance_at(self, month):
+        """Outstanding balance after the payment of month"""
+        k = month - self.since
+        if self.rate == 0:
+            return self.balance - self.payment * k
+        growth = math.expm1(k * math.log1p(self.rate))
+        return self.balance * (growth + 1) - self.payment * growth / self.rate
+
+    def paid_at(self, month):
+        """Total paid towards this debt up to and including month"""
+        return self.paid + self.payment * (month - self.since)
+
+    def advance(self, month, payment):
+        """Move the reference point to month and pay payment from the next month on"""
+        self.balance = self.balance_at(month)
+        self.paid += self.payment * (month - self.since)
+        self.since = month
+        self.payment = payment
+        self.version += 1
+
+    def payoff_month(self):
+        """Month in which the current payment clears the balance, or None if it never does"""
+        if self.balance <= PAID_OFF:
+            return self.since
+        if self.rate == 0:
+            if self.payment <= 0:
+                return None
+            months = self.balance / self.payment
+        else:
+            if self.payment <= self.balance * self.rate:
+                return None  # The payment does not cover the interest
+            months = -math.log1p(-self.balance * self.rate / self.payment) / math.log1p(self.rate)
+        return self.since + max(1, math.ceil(months - 1e-9))
+
+
+class _Simulation:
+    """Repayment of a set of debts that jumps from one payoff event to the next
+
+    Every open debt gets its minimum payment. The rest of the budget (free)
+    goes to the debt passed to pay_off() until that debt is repaid; money left
+    over in its final month is kept for the next debt. Between calls the state
+    only depends on which debts are open, the month and the leftover, which
+    is what the optimizer branches on.
+    """
+
+    def __init__(self, debts, monthly_payment):
+        self.debts = [_Debt(index, debt) for index, debt in enumerate(debts)]
+        self.monthly_payment = monthly_payment
+        self.free = monthly_payment - sum(debt.minimum for debt in self.debts)
+        if self.free < 0:
+            raise ValueError('monthly_payment must cover the minimum payments')
+        self.month = 0
+        self.leftover = 0.0
+        self.events = []
+        for debt in self.debts:
+            month = debt.payoff_month()
+            if month is not None and month <= MAX_MONTHS:
+                self.events.append((month, debt.index, debt.version, debt))
+        heapq.heapify(self.events)
+
+    def copy(self):
+        other = _Simulation.__new__(_Simulation)
+        other.debts = [debt.copy() for debt in self.debts]
+        other.monthly_payment = self.monthly_payment
+        other.free = self.free
+        other.month = self.month
+        other.leftover = self.leftover
+        other.events = [event[:3] + (other.debts[event[1]],) for event in self.events]
+        return other
+
+    def open_debts(self):
+        return [debt for debt in self.debts if debt.payoff is None]
+
+    def _schedule(self, debt):
+        month = debt.payoff_month()
+        if month is not None and month <= MAX_MONTHS:
+            heapq.heappush(self.events, (month, debt.index, debt.version, debt))
+
+    def _settle(self, debt, month):
+        debt.balance = 0.0
+        debt.payoff = month
+        self.free += debt.minimum
+
+    def _apply_leftover(self, debt):
+        """Put this month's leftover on debt; return True if that repays it"""
+        applied = min(self.leftover, debt.balance)
+        debt.balance -= applied
+        debt.paid += applied
+        self.leftover -= applied
+        if debt.balance > PAID_OFF:
+            return False
+        self._settle(debt, self.month)
+        return True
+
+    def pay_off(self, target):
+        """Give target the free budget until it is repaid; return its payoff month or None"""
+        if target.payoff is not None:
+            return target.payoff
+        target.advance(self.month, target.minimum + self.free)
+        if self.leftover > 0 and self._apply_leftover(target):
+            return target.payoff
+        self._schedule(target)
+
+        while self.events and target.payoff is None:
+            month, _, version, debt = heapq.heappop(self.events)
+            if version != debt.version or debt.payoff is not None:
+                continue  # Superseded by a later change of payment
+
+            # Settle every debt that is paid off this month and collect what is left over
+            finished = [debt]
+            while self.events and self.events[0][0] == month:
+                _, _, version, other = heapq.heappop(self.events)
+                if version == other.version and other.payoff is None:
+                    finished.append(other)
+            self.month = month
+            self.leftover = 0.0
+            for debt in finished:
+                if month > debt.since:
+                    due = debt.balance_at(month - 1) * (1 + debt.rate)
+                    debt.paid = debt.paid_at(month - 1) + due
+                    self.leftover += debt.payment - due
+                else:
+                    debt.paid += debt.balance
+                self._settle(debt, month)
+
+            # A minimum payment was freed up: the target gets it, plus this month's leftover
+            if target.payoff is None:
+                target.advance(month, target.minimum + self.free)
+                if not (self.leftover > 0 and self._apply_leftover(target)):
+                    self._schedule(target)
+
+        return target.payoff
+
+    def paid(self):
+        """Total paid towards all debts so far"""
+        return sum(debt.paid_at(self.month) if debt.payoff is None else debt.paid for debt in self.debts)
+
+    def plan(self):
+        """Finish the simulation and summarise it in repayment_plan's format"""
+        plan = []
+        for debt in self.debts:
+            paid_off = debt.payoff is not None
+            if not paid_off:
+                debt.advance(MAX_MONTHS, debt.payment)
+            plan.append({
+                'name': debt.name,
+                'original_balance': debt.original_balance,
+                'monthly_payment': debt.payment,
+                'months': debt.payoff if paid_off else MAX_MONTHS,
+                'interest': debt.paid + debt.balance - debt.original_balance,
+                'total_paid': debt.paid,
+                'paid_off': paid_off,
+                'remaining_balance': debt.balance,
+            })
+
+        return {
+            'plan': plan,
+            'total_interest': sum(entry['interest'] for entry in plan),
+            'total_months': max(entry['months'] for entry in plan),
+            'total_debt': sum(debt.original_balance for debt in self.debts),
+        }
+
+
+def simulate_order(debts, monthly_payment):
+    """Repay debts in the given order, each one receiving the free budget in turn"""
+    positive('monthly_payment', monthly_payment)
+    check_debts(debts)
+    return _simulate(debts, monthly_payment)
+
+
+def _simulate(debts, monthly_payment):
+    """simulate_order for inputs that have been checked"""
+    simulation = _Simulation(debts, monthly_payment)
+    for debt in simulation.debts:
+        if simulation.pay_off(debt) is None:
+            break  # The budget never clears this debt, so none of the later ones get it either
+    return simulation.plan()
+
+
+def repayment_plan(debts, monthly_payment, strategy='snowball'):
+    """Simulate paying off debts with a fixed monthly budget
+
+    debts is a list of {'name', 'balance', 'rate'} dicts with rate in percent
+    and an optional 'minimum_payment'. Every open debt gets its minimum payment
+    and the rest of the budget goes to the first open debt in strategy order.
+    When a debt is paid off, its payment and whatever was left over in that
+    month roll over to the next debt.
+
+    Instead of stepping through every month the simulation jumps from one
+    payoff to the next, solving the annuity equation for each debt, so the
+    cost grows with the number of debts rather than the number of months.
+    """
+    if strategy not in STRATEGIES:
+        raise ValueError(f'strategy must be one of {", ".join(STRATEGIES)}')
+    positive('monthly_payment', monthly_payment)
+    check_debts(debts)
+    return _simulate(_order(debts, strategy), monthly_payment)
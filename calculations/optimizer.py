@@ -0,0 +1,207 @@
+"""
+Repayment strategy optimizer
+Searches the order in which debts receive the free budget for the least interest or the quickest payoff
+"""
+
+import math
+import time
+
+from .debt_snowball import MAX_MONTHS, _order, _simulate, _Simulation, check_debts
+from .validation import positive
+
+# interest: total interest paid
+# months: months until the last debt is repaid
+# average_months: average month in which a debt is repaid (how quickly accounts are closed)
+OBJECTIVES = ('interest', 'months', 'average_months')
+DEFAULT_TIME_BUDGET = 0.5  # seconds
+MAX_TIME_BUDGET = 5.0
+_EPSILON = 1e-6
+
+
+class _SearchTimeout(Exception):
+    pass
+
+
+def _at_least(cost, best):
+    """True if cost is no better than best (lexicographic, with a small tolerance)"""
+    for value, best_value in zip(cost, best):
+        if value > best_value + _EPSILON:
+            return True
+        if value < best_value - _EPSILON:
+            return False
+    return True
+
+
+def _add(cost, other):
+    return tuple(a + b for a, b in zip(cost, other))
+
+
+def _subtract(cost, other):
+    return tuple(a - b for a, b in zip(cost, other))
+
+
+def repayment_summary(plan):
+    """The measures the optimizer can target, for a plan from repayment_plan"""
+    months = [entry['months'] for entry in plan['plan']]
+    return {
+        'total_interest': plan['total_interest'],
+        'total_months': plan['total_months'],
+        'average_months': sum(months) / len(months),
+    }
+
+
+def optimize_repayment(debts, monthly_payment, objective='interest', time_budget=DEFAULT_TIME_BUDGET):
+    """Find the repayment order that is best for objective
+
+    debts and monthly_payment are the same as for repayment_plan. Every open
+    debt gets its minimum payment and the rest of the budget goes to one debt
+    at a time, so a plan is the order in which debts receive it.
+
+    The search is a depth-first branch-and-bound over those orders. Between
+    two payoffs the state only depends on which debts are open, the month and
+    the money left over, so completed sub-plans and the bounds of fully
+    searched sub-trees are memoised per state and shared by every order that
+    reaches it. For interest and months the bound is the avalanche completion:
+    putting the free budget on the highest rate is optimal even if it could be
+    split between debts, so the search proves that plan right away. For
+    average_months the k-th debt to close can be repaid no earlier than the
+    budget allows for the k smallest balances, which leaves real branching.
+    Plans that repay fewer debts rank last, so when the heuristic completion
+    leaves debts unpaid it bounds nothing: another order may repay more of
+    them, and such sub-trees are searched without a bound.
+
+    The search stops after time_budget seconds and returns the best plan found
+    so far; 'optimal' tells whether the search finished.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f'objective must be one of {", ".join(OBJECTIVES)}')
+    if not 0 < time_budget <= MAX_TIME_BUDGET:
+        raise ValueError(f'time_budget must be between 0 and {MAX_TIME_BUDGET:g} seconds')
+    positive('monthly_payment', monthly_payment)
+    check_debts(debts)
+
+    started = time.perf_counter()
+    deadline = started + time_budget
+    source = _order(debts, 'avalanche')  # debt.index refers to this order
+    total_debt = sum(debt['balance'] for debt in debts)
+    memo = {}
+    best = {'cost': None, 'order': None}
+    nodes = 0
+
+    def key(unpaid, months, paid, months_sum):
+        """(debts never repaid, objective, tie-breaker); the amount paid stands in for interest"""
+        if objective == 'interest':
+            return (unpaid, paid, months)
+        if objective == 'months':
+            return (unpaid, months, paid)
+        return (unpaid, months_sum, paid)
+
+    def prefix_cost(simulation):
+        months_sum = sum(debt.payoff for debt in simulation.debts if debt.payoff is not None)
+        return key(0, simulation.month, simulation.paid(), months_sum)
+
+    def final_cost(plan):
+        unpaid = sum(not entry['paid_off'] for entry in plan['plan'])
+        return key(unpaid, plan['total_months'], plan['total_interest'] + total_debt,
+                   sum(entry['months'] for entry in plan['plan']))
+
+    def state_of(simulation):
+        open_debts = frozenset(debt.index for debt in simulation.debts if debt.payoff is None)
+        return (open_debts, simulation.month, round(simulation.leftover, 6))
+
+    def consider(order, cost):
+        if best['cost'] is None or not _at_least(cost, best['cost']):
+            # Debts repaid by their minimum payments alone never needed the free budget
+            taken = set(order)
+            best['cost'] = cost
+            best['order'] = order + [index for index in range(len(source)) if index not in taken]
+
+    def complete(simulation, order, entry):
+        """Finish the plan in the objective's heuristic order; return its future cost"""
+        if 'future' not in entry:
+            rest = simulation.copy()
+            if objective == 'average_months':
+                heuristic = sorted(rest.open_debts(), key=lambda debt: debt.balance_at(rest.month))
+            else:
+                heuristic = rest.open_debts()  # already in avalanche order
+            tail = []
+            for debt in heuristic:
+                if debt.payoff is None:
+                    tail.append(debt.index)
+                    if rest.pay_off(debt) is None:
+                        break  # No later debt gets the free budget either
+            entry['future'] = _subtract(final_cost(rest.plan()), prefix_cost(simulation))
+            entry['tail'] = tail
+        consider(order + entry['tail'], _add(prefix_cost(simulation), entry['future']))
+        return entry['future']
+
+    def lower_bound(simulation, completion):
+        if completion[0] > 0:
+            # The heuristic leaves debts unpaid, and another order may repay more of them:
+            # nothing is known beyond the future costing at least nothing
+            return (0, 0, 0)
+        if objective != 'average_months':
+            return completion
+        # The k-th debt to close needs at least the k smallest balances paid from the budget
+        credit = simulation.leftover
+        needed = 0.0
+        months_sum = 0
+        for balance in sorted(debt.balance_at(simulation.month) for debt in simulation.open_debts()):
+            needed += balance
+            months = max(math.ceil((needed - credit) / monthly_payment - 1e-9), 0)
+            months_sum += min(simulation.month + months, MAX_MONTHS)  # Plans are cut off at MAX_MONTHS
+        return (0, months_sum, max(needed - credit, 0.0))
+
+    def search(simulation, order):
+        nonlocal nodes
+        nodes += 1
+        if nodes % 64 == 0 and time.perf_counter() > deadline:
+            raise _SearchTimeout
+
+        open_debts = simulation.open_debts()
+        if not open_debts:
+            consider(order, final_cost(simulation.plan()))
+            return
+
+        entry = memo.setdefault(state_of(simulation), {})
+        prefix = prefix_cost(simulation)
+        future = lower_bound(simulation, complete(simulation, order, entry))
+        future = max(future, entry.get('bound', future))
+        if _at_least(_add(prefix, future), best['cost']):
+            return
+
+        if objective == 'average_months':
+            open_debts.sort(key=lambda debt: debt.balance_at(simulation.month))
+        for debt in open_debts:
+            child = simulation.copy()
+            if child.pay_off(child.debts[debt.index]) is None:
+                # The budget never clears this debt, so the remaining debts keep their minimums only
+                consider(order + [debt.index], final_cost(child.plan()))
+            else:
+                search(child, order + [debt.index])
+
+        # Every plan from this state costs at least as much as the best plan found so far
+        bound = _subtract(best['cost'], prefix)
+        entry['bound'] = max(entry.get('bound', bound), bound)
+
+    finished = True
+    try:
+        search(_Simulation(source, monthly_payment), [])
+    except _SearchTimeout:
+        finished = False
+
+    best_order = [source[index] for index in best['order']]
+    plan = _simulate(best_order, monthly_payment)
+    return {
+        'objective': objective,
+        'order': [debt['name'] for debt in best_order],
+        'optimal': finished,
+        'nodes': nodes,
+        'elapsed': time.perf_counter() - started,
+        'plan': plan,
+        'summary': repayment_summary(plan),
+        'baselines': {
+            strategy: repayment_summary(_simulate(_order(debts, strategy), monthly_payment))
+            for strategy in ('snowball', 'avalanche')
+        },
+    }
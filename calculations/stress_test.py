@@ -0,0 +1,175 @@
+"""
+Covenant stress testing
+Monte Carlo paths of EBITDA, interest rate and cash flow, checked against the covenants every quarter
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .covenants import DEFAULT_AVERAGE_INTEREST_RATE, DEFAULT_LIMITS, covenant_ratios
+from .validation import finite, non_negative
+
+DEFAULT_SCENARIOS = 10_000
+DEFAULT_QUARTERS = 8
+MAX_SCENARIOS = 1_000_000
+MAX_QUARTERS = 40
+CHUNK_SIZE = 25_000  # scenarios per task; fixed so results do not depend on the worker count
+PERCENTILES = (5, 50, 95)
+
+# Annualised volatilities of the simulated drivers
+DEFAULT_EBITDA_VOLATILITY = 0.20
+DEFAULT_RATE_VOLATILITY = 0.01  # absolute, e.g. 1 percentage point
+DEFAULT_CASH_FLOW_VOLATILITY = 0.15
+RATE_MEAN_REVERSION = 0.5  # per year, towards the starting rate
+
+COVENANTS = ('debt_to_ebitda', 'interest_coverage', 'debt_to_assets', 'cash_flow_coverage')
+
+
+def _simulate_chunk(seed, scenarios, quarters, inputs):
+    """Simulate one chunk of paths; return breach counts and final-quarter ratios"""
+    rng = np.random.default_rng(seed)
+    dt = 0.25
+    shocks = rng.standard_normal((3, scenarios, quarters))
+
+    # EBITDA: geometric Brownian motion with the given annual growth
+    ebitda_vol = inputs['ebitda_volatility']
+    log_steps = (inputs['ebitda_growth'] - ebitda_vol ** 2 / 2) * dt + ebitda_vol * np.sqrt(dt) * shocks[0]
+    ebitda = inputs['ebitda'] * np.exp(np.cumsum(log_steps, axis=1))
+
+    # Interest rate: mean-reverting towards the starting rate, never below zero
+    start_rate = inputs['average_interest_rate']
+    rate_noise = inputs['rate_volatility'] * np.sqrt(dt) * shocks[1]
+    rates = np.empty((scenarios, quarters))
+    rate = np.full(scenarios, start_rate)
+    for quarter in range(quarters):
+        rate = np.maximum(rate + RATE_MEAN_REVERSION * (start_rate - rate) * dt + rate_noise[:, quarter], 0.0)
+        rates[:, quarter] = rate
+
+    # Cash flow follows EBITDA with its own conversion noise
+    cash_vol = inputs['cash_flow_volatility']
+    conversion = np.exp(cash_vol * np.sqrt(dt) * shocks[2] - cash_vol ** 2 * dt / 2)
+    cash_flow = inputs['cash_flow'] * (ebitda / inputs['ebitda']) * conversion
+
+    total_debt = inputs['total_debt']
+    interest_expense = total_debt * rates
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratios = {
+            'debt_to_ebitda': np.where(ebitda > 0, total_debt / ebitda, np.inf),
+            'interest_coverage': np.where(interest_expense > 0, ebitda / interest_expense, np.inf),
+            'debt_to_assets': np.full((scenarios, quarters), total_debt / inputs['total_assets']),
+            'cash_flow_coverage': np.where(interest_expense > 0, cash_flow / interest_expense, np.inf),
+        }
+    breaches = {
+        'debt_to_ebitda': ratios['debt_to_ebitda'] > inputs['max_debt_to_ebitda'],
+        'interest_coverage': ratios['interest_coverage'] < inputs['min_interest_coverage'],
+        'debt_to_assets': ratios['debt_to_assets'] > inputs['max_debt_to_assets'],
+        'cash_flow_coverage': ratios['cash_flow_coverage'] < inputs['min_cash_flow_coverage'],
+    }
+
+    # Counts of paths that breached by each quarter (once breached, a path stays breached)
+    counts = {name: np.logical_or.accumulate(breached, axis=1).sum(axis=0) for name, breached in breaches.items()}
+    any_breach = np.logical_or.reduce(list(breaches.values()))
+    counts['any'] = np.logical_or.accumulate(any_breach, axis=1).sum(axis=0)
+    final = {name: ratios[name][:, -1] for name in COVENANTS}
+    return counts, final
+
+
+def _chunks(scenarios, seed):
+    sizes = [CHUNK_SIZE] * (scenarios // CHUNK_SIZE)
+    if scenarios % CHUNK_SIZE:
+        sizes.append(scenarios % CHUNK_SIZE)
+    return zip(np.random.SeedSequence(seed).spawn(len(sizes)), sizes)
+
+
+def stress_test(total_debt, ebitda, total_assets, cash_flow,
+                max_debt_to_ebitda=DEFAULT_LIMITS['max_debt_to_ebitda'],
+                min_interest_coverage=DEFAULT_LIMITS['min_interest_coverage'],
+                max_debt_to_assets=DEFAULT_LIMITS['max_debt_to_assets'],
+                min_cash_flow_coverage=DEFAULT_LIMITS['min_cash_flow_coverage'],
+                average_interest_rate=DEFAULT_AVERAGE_INTEREST_RATE,
+                scenarios=DEFAULT_SCENARIOS, quarters=DEFAULT_QUARTERS,
+                ebitda_growth=0.0, ebitda_volatility=DEFAULT_EBITDA_VOLATILITY,
+                rate_volatility=DEFAULT_RATE_VOLATILITY, cash_flow_volatility=DEFAULT_CASH_FLOW_VOLATILITY,
+                seed=None, workers=None):
+    """Estimate the probability of breaching each covenant over the coming quarters
+
+    EBITDA and cash flow are annual figures that move every quarter; the
+    average interest rate drifts back towards its starting value. Debt and
+    assets stay fixed. Scenarios are simulated in chunks of CHUNK_SIZE, spread
+    over a process pool of up to one worker per CPU when there is more
+    than one chunk. The same seed gives the same result for any
+    number of workers.
+    """
+    covenant_ratios(total_debt, ebitda, total_assets, cash_flow, average_interest_rate)  # validates inputs
+    if ebitda <= 0:
+        raise ValueError('ebitda must be positive for a stress test')
+    if not 1 <= scenarios <= MAX_SCENARIOS:
+        raise ValueError(f'scenarios must be between 1 and {MAX_SCENARIOS}')
+    if not 1 <= quarters <= MAX_QUARTERS:
+        raise ValueError(f'quarters must be between 1 and {MAX_QUARTERS}')
+    finite('max_debt_to_ebitda', max_debt_to_ebitda)
+    finite('min_interest_coverage', min_interest_coverage)
+    finite('max_debt_to_assets', max_debt_to_assets)
+    finite('min_cash_flow_coverage', min_cash_flow_coverage)
+    finite('ebitda_growth', ebitda_growth)
+    non_negative('ebitda_volatility', ebitda_volatility)
+    non_negative('rate_volatility', rate_volatility)
+    non_negative('cash_flow_volatility', cash_flow_volatility)
+    scenarios, quarters = int(scenarios), int(quarters)
+
+    inputs = {
+        'total_debt': total_debt,
+        'ebitda': ebitda,
+        'total_assets': total_assets,
+        'cash_flow': cash_flow,
+        'max_debt_to_ebitda': max_debt_to_ebitda,
+        'min_interest_coverage': min_interest_coverage,
+        'max_debt_to_assets': max_debt_to_assets,
+        'min_cash_flow_coverage': min_cash_flow_coverage,
+        'average_interest_rate': average_interest_rate,
+        'ebitda_growth': ebitda_growth,
+        'ebitda_volatility': ebitda_volatility,
+        'rate_volatility': rate_volatility,
+        'cash_flow_volatility': cash_flow_volatility,
+    }
+    chunks = list(_chunks(scenarios, seed))
+    cpus = os.cpu_count() or 1
+    workers = min(workers or cpus, cpus, len(chunks))
+
+    if workers > 1:
+        # Fork from a clean server process: a threaded web worker may hold locks a plain fork would copy
+        context = multiprocessing.get_context(
+            'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else None)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            futures = [executor.submit(_simulate_chunk, chunk_seed, size, quarters, inputs)
+                       for chunk_seed, size in chunks]
+            results = [future.result() for future in futures]
+    else:
+        results = [_simulate_chunk(chunk_seed, size, quarters, inputs) for chunk_seed, size in chunks]
+
+    counts = {name: sum(result[0][name] for result in results) for name in COVENANTS + ('any',)}
+    final = {name: np.concatenate([result[1][name] for result in results]) for name in COVENANTS}
+
+    covenants = {}
+    for name in COVENANTS:
+        by_quarter = counts[name] / scenarios
+        covenants[name] = {
+            'breach_probability': float(by_quarter[-1]),
+            'breach_probability_by_quarter': by_quarter.tolist(),
+            'final_percentiles': dict(zip(
+                (f'p{p}' for p in PERCENTILES),
+                np.percentile(final[name], PERCENTILES).tolist(),
+            )),
+        }
+
+    any_by_quarter = counts['any'] / scenarios
+    return {
+        'scenarios': scenarios,
+        'quarters': quarters,
+        'covenants': covenants,
+        'any_breach_probability': float(any_by_quarter[-1]),
+        'any_breach_probability_by_quarter': any_by_quarter.tolist(),
+    }
@@ -0,0 +1,31 @@
+"""
+Input checks shared by the calculations
+Each raises ValueError with a message the API can show to the user as it is
+"""
+
+import math
+import numbers
+
+
+def finite(name, value):
+    """Return value if it is a finite number"""
+    # JSON numbers are int or float; only anything else needs the slower ABC check
+    if type(value) not in (int, float) and (isinstance(value, bool) or not isinstance(value, numbers.Real)):
+        raise ValueError(f'{name} must be a number')
+    if not math.isfinite(value):
+        raise ValueError(f'{name} must be a finite number')
+    return value
+
+
+def positive(name, value):
+    """Return value if it is a finite number above zero"""
+    if finite(name, value) <= 0:
+        raise ValueError(f'{name} must be positive')
+    return value
+
+
+def non_negative(name, value):
+    """Return value if it is a finite number of at least zero"""
+    if finite(name, value) < 0:
+        raise ValueError(f'{name} must not be negative')
+    return value
@@ -0,0 +1,169 @@
+"""
+Critical CSS for SME Debt Management Tool
+Picks the rules of a stylesheet that match the markup of a rendered page, so
+they can be inlined and the full stylesheet loaded without blocking rendering
+"""
+
+import re
+from html.parser import HTMLParser
+
+from minify import minify_css
+
+# Empty <style> element in base.html that receives the critical rules of each page
+PLACEHOLDER = '<style id="critical-css"></style>'
+
+# Media queries that never apply to the first paint on screen
+_SKIPPED_MEDIA = re.compile(r'^\s*print\s*$', re.IGNORECASE)
+# States that need user interaction, so no element is in them when the page first paints
+_INTERACTIVE = re.compile(r':(?:hover|focus|focus-visible|focus-within|active|visited)\b', re.IGNORECASE)
+# Pseudo-classes and pseudo-elements, with any (non-nested) arguments
+_PSEUDO = re.compile(r'::?[A-Za-z-]+(?:\([^()]*\))?')
+_COMBINATORS = re.compile(r'\s*[>+~]\s*|\s+')
+_SIMPLE = re.compile(r'([.#]?)((?:\\.|[A-Za-z0-9_-])+)|\[\s*([A-Za-z0-9_-]+)[^\]]*\]|\*')
+_ANIMATION = re.compile(r'animation(?:-name)?\s*:\s*([^;}]+)', re.IGNORECASE)
+
+
+class _PageElements(HTMLParser):
+    """Tag names, ids, classes and attributes of every element in a page"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.elements = []  # (tag, id, classes, attribute names)
+        self.tags = set()
+        self.ids = set()
+        self.classes = set()
+        self.attributes = set()
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        classes = frozenset((attrs.get('class') or '').split())
+        self.elements.append((tag, attrs.get('id'), classes, frozenset(attrs)))
+        self.tags.add(tag)
+        self.ids.add(attrs.get('id'))
+        self.classes |= classes
+        self.attributes |= set(attrs)
+
+    handle_startendtag = handle_starttag
+
+
+def _compound(part):
+    """(tag, ids, classes, attributes) required by one compound selector such as a.btn.active"""
+    tag, ids, classes, attributes = None, set(), set(), set()
+    for match in _SIMPLE.finditer(part):
+        prefix, name, attribute = match.groups()
+        if attribute:
+            attributes.add(attribute.lower())
+        elif name is None:
+            continue  # universal selector
+        elif prefix == '.':
+            classes.add(name.replace('\\', ''))
+        elif prefix == '#':
+            ids.add(name.replace('\\', ''))
+        else:
+            tag = name.lower()
+    return tag, ids, classes, attributes
+
+
+def _matches(selector, page):
+    """Whether selector may match an element of page
+
+    The rightmost compound selector has to match a single element; the others
+    only have to find their parts somewhere in the page. That can keep a rule
+    too many, never one too few.
+    """
+    if _INTERACTIVE.search(selector):
+        return False
+    parts = [part for part in _COMBINATORS.split(_PSEUDO.sub('', selector).strip()) if part]
+    if not parts:
+        return True  # only pseudo-classes, such as :root
+    for part in parts[:-1]:
+        tag, ids, classes, attributes = _compound(part)
+        if (tag and tag not in page.tags) or not ids <= page.ids \
+                or not classes <= page.classes or not attributes <= page.attributes:
+            return False
+    tag, ids, classes, attributes = _compound(parts[-1])
+    return any(
+        (tag is None or tag == element_tag) and (not ids or ids == {element_id})
+        and classes <= element_classes and attributes <= element_attributes
+        for element_tag, element_id, element_classes, element_attributes in page.elements
+    )
+
+
+def _blocks(css):
+    """Split minified CSS into top-level (prelude, body) pairs; body is None for statements"""
+    i, n = 0, len(css)
+    while i < n:
+        start = i
+        while i < n and css[i] not in '{;':
+            if css[i] in '\'"':
+                quote = css[i]
+                i += 1
+                while i < n and css[i] != quote:
+                    i += 2 if css[i] == '\\' else 1
+            i += 1
+        prelude = css[start:i].strip()
+        if i >= n or css[i] == ';':
+            if prelude:
+                yield prelude, None
+            i += 1
+            continue
+        depth, i = 1, i + 1
+        body_start = i
+        while i < n and depth:
+            char = css[i]
+            if char in '\'"':
+                i += 1
+                while i < n and css[i] != char:
+                    i += 2 if css[i] == '\\' else 1
+            elif char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+            i += 1
+        yield prelude, css[body_start:i - 1]
+
+
+def _select(css, page, keyframes):
+    """Critical rules of minified css; keyframes collects the @keyframes seen for later"""
+    out = []
+    for prelude, body in _blocks(css):
+        if body is None:
+            if prelude.lower().startswith(('@charset', '@import', '@namespace')):
+                out.append(prelude + ';')
+        elif prelude.startswith('@'):
+            name = prelude.split(None, 1)[0].lower()
+            if name.endswith('keyframes'):
+                keyframes.append((prelude.split(None, 1)[1].strip(), f'{prelude}{{{body}}}'))
+            elif name in ('@media', '@supports'):
+                if name == '@media' and _SKIPPED_MEDIA.match(prelude[len(name):]):
+                    continue
+                inner = _select(body, page, keyframes)
+                if inner:
+                    out.append(f'{prelude}{{{inner}}}')
+            elif name == '@font-face':
+                out.append(f'{prelude}{{{body}}}')
+            # @page and other at-rules do not affect the first paint on screen
+        elif any(_matches(selector, page) for selector in prelude.split(',')):
+            out.append(f'{prelude}{{{body}}}')
+    return ''.join(out)
+
+
+def critical_css(css, html):
+    """Minified rules of css that apply to the elements of html (at screen sizes and initial states)"""
+    page = _PageElements()
+    page.feed(html)
+    page.close()
+    keyframes = []
+    selected = _select(minify_css(css), page, keyframes)
+    # Keep the animations the selected rules refer to
+    used = {name.strip() for value in _ANIMATION.findall(selected) for name in re.split(r'[\s,]+', value)}
+    animations = {name: rule for name, rule in keyframes if name in used}
+    return selected + ''.join(animations.values())
+
+
+def inline_critical_css(html, css):
+    """Fill the critical CSS placeholder of html with the rules of css it needs"""
+    if PLACEHOLDER not in html:
+        return html
+    rules = critical_css(css, html).replace('</', '<\\/')
+    return html.replace(PLACEHOLDER, f'<style id="critical-css">{rules}</style>', 1)
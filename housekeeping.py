@@ -0,0 +1,55 @@
+"""
+Periodic background work for SME Debt Management Tool
+Flushing a worker's metrics and rolling up usage events must also happen while
+no requests arrive; a thread per worker calls them every few seconds
+"""
+
+import os
+import threading
+
+INTERVAL = 5.0  # seconds between rounds
+
+
+class PeriodicTasks:
+    """Background thread that calls every task once per interval
+
+    Tasks decide for themselves whether there is work (Metrics.maybe_flush,
+    AnalyticsLog.maybe_rollup), and one failing does not stop the others.
+    Threads do not survive a fork, so start() is called again in every worker
+    (see post_fork in gunicorn.conf.py).
+    """
+
+    def __init__(self, interval=INTERVAL):
+        self.interval = interval
+        self.tasks = []  # (name, callable)
+        self._stop = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def add(self, name, task):
+        self.tasks.append((name, task))
+
+    def start(self):
+        """Start the thread in this process unless it is already running"""
+        with self._lock:
+            if self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._run, name='housekeeping', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def run_once(self):
+        for name, task in self.tasks:
+            try:
+                task()
+            except Exception as e:
+                print(f"Error in {name}: {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.run_once()
@@ -0,0 +1,102 @@
+"""
+Translation catalogs for SME Debt Management Tool
+Loads the gettext .po catalogs once per process and serves dictionary lookups
+"""
+
+import os
+
+TRANSLATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'translations')
+SOURCE_LANGUAGE = 'en'
+DEFAULT_LANGUAGE = 'de'
+
+_ESCAPES = {'n': '\n', 't': '\t', '"': '"', '\\': '\\'}
+
+
+def _unquote(value):
+    """Decode a quoted .po string literal"""
+    value = value.strip()[1:-1]
+    chars = []
+    escaped = False
+    for char in value:
+        if escaped:
+            chars.append(_ESCAPES.get(char, char))
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        else:
+            chars.append(char)
+    return ''.join(chars)
+
+
+def parse_po(path):
+    """Parse a .po file into a {msgid: msgstr} dictionary
+
+    Obsolete (#~) entries, the header and untranslated entries are skipped so
+    lookups fall back to the source text.
+    """
+    catalog = {}
+    msgid = msgstr = None
+    current = None
+
+    def flush():
+        if msgid and msgstr:
+            catalog[msgid] = msgstr
+
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('msgid '):
+                flush()
+                msgid, msgstr = _unquote(line[6:]), None
+                current = 'msgid'
+            elif line.startswith('msgstr '):
+                msgstr = _unquote(line[7:])
+                current = 'msgstr'
+            elif line.startswith('"'):
+                if current == 'msgid':
+                    msgid += _unquote(line)
+                elif current == 'msgstr':
+                    msgstr += _unquote(line)
+        flush()
+
+    return catalog
+
+
+def find_catalogs(directory=TRANSLATIONS_DIR):
+    """Return {lang: path} for every translations/<lang>/LC_MESSAGES/messages.po"""
+    paths = {}
+    if not os.path.isdir(directory):
+        return paths
+
+    for lang in sorted(os.listdir(directory)):
+        path = os.path.join(directory, lang, 'LC_MESSAGES', 'messages.po')
+        if os.path.isfile(path):
+            paths[lang] = path
+
+    return paths
+
+
+def load_catalogs(directory=TRANSLATIONS_DIR):
+    """Load every translations/<lang>/LC_MESSAGES/messages.po catalog"""
+    return {lang: parse_po(path) for lang, path in find_catalogs(directory).items()}
+
+
+class Translator:
+    """Per-process holder of all translation catalogs"""
+
+    def __init__(self, directory=TRANSLATIONS_DIR):
+        paths = find_catalogs(directory)
+        self.catalogs = {lang: parse_po(path) for lang, path in paths.items()}
+        self.mtime = max((os.path.getmtime(path) for path in paths.values()), default=0)
+        self.languages = (SOURCE_LANGUAGE,) + tuple(
+            lang for lang in self.catalogs if lang != SOURCE_LANGUAGE
+        )
+
+    def gettext(self, text, lang):
+        """Translate text into lang, falling back to the source text"""
+        catalog = self.catalogs.get(lang)
+        if catalog is None:
+            return text
+        return catalog.get(text, text)
@@ -0,0 +1,203 @@
+"""
+Feedback mail outbox for SME Debt Management Tool
+Requests store outgoing mail in a SQLite queue and return at once; a background
+thread in each worker sends it over one SMTP connection, retrying with backoff
+"""
+
+import json
+import os
+import smtplib
+import threading
+import time
+from collections import namedtuple
+
+from flask_mail import Connection, Message
+
+from sqlite_store import SQLiteStore
+
+BATCH_SIZE = 20  # messages claimed per database transaction
+POLL_INTERVAL = 5.0  # seconds; picks up retries and mail queued by other workers
+LEASE_SECONDS = 300  # a claimed message is offered again if its worker died while sending
+SMTP_TIMEOUT = 30  # seconds per SMTP operation
+MAX_RETRY_DELAY = 3600  # seconds
+
+OutboxItem = namedtuple('OutboxItem', ['id', 'message', 'attempts'])
+
+# Errors that concern a single message; anything else means the connection is unusable
+_MESSAGE_ERRORS = (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused, smtplib.SMTPDataError)
+
+
+class Outbox(SQLiteStore):
+    """Durable queue of outgoing mail in a SQLite database shared by all workers
+
+    Messages are dicts of flask_mail.Message keyword arguments. A sent message
+    is deleted; one that keeps failing is kept with status 'failed'.
+    """
+
+    SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS outbox (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        created REAL NOT NULL,
+        message TEXT NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        next_attempt REAL NOT NULL,
+        claimed_until REAL NOT NULL DEFAULT 0,
+        status TEXT NOT NULL DEFAULT 'pending',
+        last_error TEXT
+    );
+    CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt);
+    '''
+
+    def __init__(self, path, retry_delay=30.0, max_attempts=8):
+        self.retry_delay = retry_delay
+        self.max_attempts = max_attempts
+        super().__init__(path)
+
+    def enqueue(self, **message):
+        """Queue a message (flask_mail.Message keyword arguments); return its id"""
+        now = time.time()
+        with self._transaction() as db:
+            cursor = db.execute('INSERT INTO outbox (created, message, next_attempt) VALUES (?, ?, ?)',
+                                (now, json.dumps(message), now))
+        return cursor.lastrowid
+
+    def claim(self, limit=BATCH_SIZE):
+        """Lease up to limit due messages to the caller; return them as OutboxItems"""
+        now = time.time()
+        with self._transaction() as db:
+            rows = db.execute(
+                "SELECT id, message, attempts FROM outbox WHERE status = 'pending' "
+                "AND next_attempt <= ? AND claimed_until <= ? ORDER BY id LIMIT ?",
+                (now, now, limit),
+            ).fetchall()
+            db.executemany('UPDATE outbox SET claimed_until = ? WHERE id = ?',
+                           [(now + LEASE_SECONDS, row[0]) for row in rows])
+        return [OutboxItem(row[0], json.loads(row[1]), row[2]) for row in rows]
+
+    def delete(self, ids):
+        """Remove sent messages"""
+        if ids:
+            with self._transaction() as db:
+                db.executemany('DELETE FROM outbox WHERE id = ?', [(message_id,) for message_id in ids])
+
+    def retry(self, item, error):
+        """Schedule another attempt with exponential backoff, or give up after max_attempts"""
+        attempts = item.attempts + 1
+        delay = min(self.retry_delay * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+        status = 'failed' if attempts >= self.max_attempts else 'pending'
+        with self._transaction() as db:
+            db.execute(
+                'UPDATE outbox SET attempts = ?, next_attempt = ?, claimed_until = 0, status = ?, '
+                'last_error = ? WHERE id = ?',
+                (attempts, time.time() + delay, status, str(error), item.id),
+            )
+        if status == 'failed':
+            print(f"Giving up on outbox message {item.id} after {attempts} attempts: {error}")
+
+    def counts(self):
+        """Number of messages per status"""
+        return dict(self._connection().execute('SELECT status, COUNT(*) FROM outbox GROUP BY status'))
+
+
+class _SMTPConnection(Connection):
+    """Flask-Mail connection whose SMTP operations time out instead of hanging the sender"""
+
+    def configure_host(self):
+        if self.mail.use_ssl:
+            host = smtplib.SMTP_SSL(self.mail.server, self.mail.port, timeout=SMTP_TIMEOUT)
+        else:
+            host = smtplib.SMTP(self.mail.server, self.mail.port, timeout=SMTP_TIMEOUT)
+        host.set_debuglevel(int(self.mail.debug))
+        if self.mail.use_tls:
+            host.starttls()
+        if self.mail.username and self.mail.password:
+            host.login(self.mail.username, self.mail.password)
+        return host
+
+
+class OutboxSender:
+    """Background thread that drains the outbox over a single SMTP connection per run
+
+    Threads do not survive a fork, so start() is called again in every worker
+    (see post_fork in gunicorn.conf.py) and by wake() after each enqueue.
+    """
+
+    def __init__(self, app, outbox, poll_interval=POLL_INTERVAL):
+        self.app = app
+        self.outbox = outbox
+        self.poll_interval = poll_interval
+        self.sent = 0
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the sender thread in this process unless it is already running"""
+        with self._lock:
+            if self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._wake = threading.Event()
+            self._thread = threading.Thread(target=self._run, name='mail-outbox', daemon=True)
+            self._thread.start()
+
+    def wake(self):
+        """Send newly queued mail now rather than at the next poll"""
+        self.start()
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            try:
+                self.drain()
+            except Exception as e:
+                print(f"Error sending queued mail: {e}")
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def drain(self):
+        """Send every due message; return how many were sent"""
+        batch = self.outbox.claim()
+        if not batch:
+            return 0
+        sent = 0
+        with self.app.app_context():
+            mail = self.app.extensions['mail']
+            try:
+                with _SMTPConnection(mail) as connection:
+                    while batch:
+                        sent += self._send_batch(connection, batch)
+                        batch = self.outbox.claim()
+            except (smtplib.SMTPException, OSError) as e:
+                # The connection broke: whatever is left of the batch is tried again later
+                for item in batch:
+                    self.outbox.retry(item, e)
+        self.sent += sent
+        return sent
+
+    def _send_batch(self, connection, batch):
+        """Send batch over connection; messages the server refuses are retried later
+
+        On a connection error the unsent rest stays in batch for the caller.
+        """
+        delivered = []
+        try:
+            while batch:
+                item = batch[0]
+                outcome = 'error'
+                started = time.perf_counter()
+                try:
+                    connection.send(Message(**item.message))
+                    outcome = 'sent'
+                except _MESSAGE_ERRORS as e:
+                    outcome = 'refused'
+                    self.outbox.retry(item, e)
+                finally:
+                    self.app.metrics.observe('mail_send_duration_seconds', time.perf_counter() - started, outcome)
+                if outcome == 'sent':
+                    delivered.append(item.id)
+                batch.pop(0)
+        finally:
+            self.outbox.delete(delivered)
+        return len(delivered)
@@ -0,0 +1,155 @@
+"""
+Prometheus metrics for SME Debt Management Tool
+Each worker counts in memory and adds its counts to a SQLite database every few
+seconds, so /metrics on any worker reports the totals of all of them
+"""
+
+import bisect
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from sqlite_store import SQLiteStore
+
+FLUSH_INTERVAL = 5.0  # seconds between writes of a worker's counts to the database
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # seconds
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+_SUM = 'sum'  # sample key of a histogram's sum; its buckets are keyed by their upper bound
+
+
+def _format(value):
+    """A number in the Prometheus text format"""
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _label_text(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in list(zip(names, values)) + list(extra)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Metrics(SQLiteStore):
+    """Counters and histograms summed over every worker process, plus gauges read at scrape time
+
+    Counts are kept as deltas since the last flush; the database holds the
+    running totals, so they survive worker restarts and only ever grow.
+    Histogram buckets are stored per bucket and made cumulative for output.
+    """
+
+    SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS samples (
+        name TEXT NOT NULL,
+        labels TEXT NOT NULL,
+        sample TEXT NOT NULL,
+        value REAL NOT NULL,
+        PRIMARY KEY (name, labels, sample)
+    );
+    '''
+
+    def __init__(self, path, flush_interval=FLUSH_INTERVAL):
+        self.flush_interval = flush_interval
+        self._families = {}  # name -> (type, help, label names, buckets or gauge callback)
+        self._pending = {}  # (name, label values, sample) -> count since the last flush
+        self._pid = os.getpid()
+        self._flushed = time.monotonic()
+        self._lock = threading.Lock()
+        super().__init__(path)
+
+    def counter(self, name, help, labels=()):
+        self._families[name] = ('counter', help, tuple(labels), None)
+
+    def histogram(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        self._families[name] = ('histogram', help, tuple(labels), tuple(buckets) + (float('inf'),))
+
+    def gauge(self, name, help, labels, collect):
+        """A gauge whose {label values: value} come from collect() on every scrape"""
+        self._families[name] = ('gauge', help, tuple(labels), collect)
+
+    def inc(self, name, *labels, amount=1):
+        self._add((name, labels, ''), amount)
+
+    def observe(self, name, value, *labels):
+        buckets = self._families[name][3]
+        upper = buckets[bisect.bisect_left(buckets, value)]
+        with self._lock:
+            self._reset_after_fork()
+            for key, amount in (((name, labels, _format(upper)), 1), ((name, labels, _SUM), value)):
+                self._pending[key] = self._pending.get(key, 0) + amount
+
+    def _add(self, key, amount):
+        with self._lock:
+            self._reset_after_fork()
+            self._pending[key] = self._pending.get(key, 0) + amount
+
+    def _reset_after_fork(self):
+        # A forked worker inherits its parent's unflushed counts, which the parent reports itself
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._pending = {}
+
+    def flush(self):
+        """Add this process's counts since the last flush to the database"""
+        with self._lock:
+            self._reset_after_fork()
+            pending, self._pending = self._pending, {}
+            self._flushed = time.monotonic()
+        if not pending:
+            return
+        rows = [(name, json.dumps(labels), sample, amount) for (name, labels, sample), amount in pending.items()]
+        try:
+            with self._transaction() as db:
+                db.executemany('INSERT INTO samples (name, labels, sample, value) VALUES (?, ?, ?, ?) '
+                               'ON CONFLICT (name, labels, sample) DO UPDATE SET value = value + excluded.value',
+                               rows)
+        except sqlite3.Error:
+            # Keep the counts for the next flush
+            with self._lock:
+                for key, amount in pending.items():
+                    self._pending[key] = self._pending.get(key, 0) + amount
+            raise
+
+    def maybe_flush(self):
+        """Flush if flush_interval has passed; cheap enough to call after every request"""
+        if time.monotonic() - self._flushed < self.flush_interval:
+            return
+        try:
+            self.flush()
+        except sqlite3.Error as e:
+            print(f"Error writing metrics: {e}")
+
+    def exposition(self):
+        """All metrics in the Prometheus text format"""
+        self.flush()
+        samples = {}
+        for name, labels, sample, value in self._connection().execute(
+                'SELECT name, labels, sample, value FROM samples ORDER BY name, labels'):
+            samples.setdefault(name, {}).setdefault(tuple(json.loads(labels)), {})[sample] = value
+
+        lines = []
+        for name, (kind, help, label_names, extra) in sorted(self._families.items()):
+            lines.append(f'# HELP {name} {help}')
+            lines.append(f'# TYPE {name} {kind}')
+            if kind == 'gauge':
+                for values, value in sorted(extra().items()):
+                    lines.append(f'{name}{_label_text(label_names, values)} {_format(value)}')
+            elif kind == 'counter':
+                for values, series in samples.get(name, {}).items():
+                    lines.append(f'{name}{_label_text(label_names, values)} {_format(series.get("", 0))}')
+            else:
+                for values, series in samples.get(name, {}).items():
+                    count = 0
+                    for upper in extra:
+                        count += series.get(_format(upper), 0)
+                        le = _label_text(label_names, values, [('le', _format(upper))])
+                        lines.append(f'{name}_bucket{le} {_format(count)}')
+                    lines.append(f'{name}_sum{_label_text(label_names, values)} {_format(series.get(_SUM, 0))}')
+                    lines.append(f'{name}_count{_label_text(label_names, values)} {_format(count)}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,260 @@
+"""
+Minification and precompression for SME Debt Management Tool
+Conservative JS/CSS/HTML minifiers plus gzip and brotli variants at maximum compression
+"""
+
+import gzip
+import re
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; without it only gzip variants are produced
+    brotli = None
+
+MIN_COMPRESS_SIZE = 1024  # bytes; smaller responses are not worth compressing
+GZIP_LEVEL = 9
+BROTLI_QUALITY = 11
+
+# Extensions of the files the build minifies (where it can) and precompresses
+TEXT_TYPES = ('.html', '.css', '.js', '.json', '.txt', '.xml', '.svg')
+# File name suffix of each precompressed variant
+COMPRESSED_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+_IDENTIFIER = re.compile(r'[A-Za-z0-9_$\\\u0080-\uffff]+')
+# After these a '/' starts a regular expression rather than a division
+_REGEX_AFTER_CHARS = set('(,=:[!&|?{};+-*%<>~^}')
+_REGEX_AFTER_WORDS = {'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void',
+                      'throw', 'case', 'do', 'else', 'yield', 'await'}
+# A space next to one of these never separates two tokens that would otherwise merge
+_NO_SPACE_NEEDED = set('{}()[];,:=?!&|*%^~')
+# A line break after / before these can never end a statement (no automatic semicolon)
+_JOIN_AFTER = set('{;,([=:?&|*%^~')
+_JOIN_BEFORE = set('})],;')
+
+
+def _skip_string(source, i, quote):
+    """Index after the string literal that starts at source[i]"""
+    i += 1
+    while i < len(source):
+        char = source[i]
+        if char == '\\':
+            i += 2
+            continue
+        i += 1
+        if char == quote or char == '\n':
+            break
+    return i
+
+
+def _skip_template(source, i):
+    """Scan template literal text from source[i]; return (end, closed)
+
+    closed is True at the closing backtick and False at the start of a ${ } expression.
+    """
+    while i < len(source):
+        char = source[i]
+        if char == '\\':
+            i += 2
+        elif char == '`':
+            return i + 1, True
+        elif char == '$' and source.startswith('{', i + 1):
+            return i + 2, False
+        else:
+            i += 1
+    return i, True
+
+
+def _skip_regex(source, i):
+    """Index after the regular expression literal (and its flags) that starts at source[i]"""
+    i += 1
+    in_class = False
+    while i < len(source):
+        char = source[i]
+        if char == '\\':
+            i += 2
+            continue
+        i += 1
+        if char == '[':
+            in_class = True
+        elif char == ']':
+            in_class = False
+        elif char == '/' and not in_class:
+            break
+        elif char == '\n':
+            break
+    while i < len(source) and (source[i].isalnum() or source[i] == '_'):
+        i += 1
+    return i
+
+
+def minify_js(source):
+    """Strip comments, indentation and redundant whitespace from JavaScript
+
+    Line breaks are kept wherever automatic semicolon insertion could depend
+    on them, so the result behaves exactly like the source. Strings, template
+    literals and regular expressions are copied untouched.
+    """
+    out = []
+    last = ''  # last significant token emitted
+    pending = ''  # whitespace seen since then: '', ' ' or '\n'
+    templates = []  # brace depth inside each open ${ } expression
+    i, n = 0, len(source)
+
+    def emit(token):
+        nonlocal last, pending
+        if pending and out:
+            first = token[0]
+            if pending == '\n':
+                if last[-1] not in _JOIN_AFTER and first not in _JOIN_BEFORE:
+                    out.append('\n')
+            elif last[-1] not in _NO_SPACE_NEEDED and first not in _NO_SPACE_NEEDED:
+                out.append(' ')
+        pending = ''
+        out.append(token)
+        last = token
+
+    while i < n:
+        char = source[i]
+        if char in ' \t\r\n\f\v\ufeff':
+            if char == '\n':
+                pending = '\n'
+            elif not pending:
+                pending = ' '
+            i += 1
+        elif char == '/' and source.startswith('/', i + 1):
+            end = source.find('\n', i)
+            i = n if end == -1 else end
+        elif char == '/' and source.startswith('*', i + 1):
+            end = source.find('*/', i + 2)
+            end = n if end == -1 else end + 2
+            if '\n' in source[i:end]:
+                pending = '\n'
+            elif not pending:
+                pending = ' '
+            i = end
+        elif char == '/' and (not last or last in _REGEX_AFTER_WORDS
+                              or (last[-1] in _REGEX_AFTER_CHARS and not _IDENTIFIER.fullmatch(last))):
+            end = _skip_regex(source, i)
+            emit(source[i:end])
+            i = end
+        elif char in '\'"':
+            end = _skip_string(source, i, char)
+            emit(source[i:end])
+            i = end
+        elif char == '`':
+            end, closed = _skip_template(source, i + 1)
+            emit(source[i:end])
+            if not closed:
+                templates.append(0)
+            i = end
+        elif char == '}' and templates and templates[-1] == 0:
+            # End of a ${ } expression: continue with the template text
+            templates.pop()
+            end, closed = _skip_template(source, i + 1)
+            emit(source[i:end])
+            if not closed:
+                templates.append(0)
+            i = end
+        else:
+            match = _IDENTIFIER.match(source, i)
+            if match:
+                emit(match.group())
+                i = match.end()
+                continue
+            if templates:
+                if char == '{':
+                    templates[-1] += 1
+                elif char == '}':
+                    templates[-1] -= 1
+            emit(char)
+            i += 1
+
+    return ''.join(out)
+
+
+_CSS_TOKENS = re.compile(
+    r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|(/\*.*?\*/)|(\s+)|([^"'/\s]+|/)''',
+    re.DOTALL,
+)
+_CSS_PUNCTUATION = re.compile(r'([{};,>])')
+_CSS_NO_SPACE = set('{};,>')
+
+
+def minify_css(source):
+    """Strip comments and redundant whitespace from a stylesheet"""
+    out = []
+    pending = False
+    for string, comment, space, text in _CSS_TOKENS.findall(source):
+        if comment or space:
+            pending = True
+            continue
+        for part in (string,) if string else filter(None, _CSS_PUNCTUATION.split(text)):
+            if pending and out and out[-1][-1] not in _CSS_NO_SPACE and out[-1][-1] != ':' \
+                    and part[0] not in _CSS_NO_SPACE:
+                out.append(' ')
+            pending = False
+            if part == '}' and out and out[-1] == ';':
+                out.pop()  # the last declaration needs no semicolon
+            out.append(part)
+    return ''.join(out)
+
+
+_RAW_BLOCKS = re.compile(r'(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2\s*>)', re.DOTALL | re.IGNORECASE)
+_HTML_COMMENT = re.compile(r'<!--(?!\[if).*?-->', re.DOTALL)
+_SCRIPT_TYPE = re.compile(r'\btype\s*=\s*["\']?([^"\'\s>]+)', re.IGNORECASE)
+
+
+def _minify_markup(text):
+    """Markup between raw blocks; a line break stands in for any whitespace at either end"""
+    stripped = _HTML_COMMENT.sub('', text)
+    body = '\n'.join(line.strip() for line in stripped.splitlines() if line.strip())
+    before = '\n' if stripped[:1].isspace() else ''
+    after = '\n' if stripped[-1:].isspace() and body else ''
+    return before + body + after
+
+
+def minify_html(source):
+    """Drop comments, indentation and blank lines from HTML; minify inline scripts and styles
+
+    Line breaks between elements are kept, so whitespace between inline
+    elements renders the same. <pre> and <textarea> contents are untouched.
+    """
+    out = []
+    position = 0
+    for match in _RAW_BLOCKS.finditer(source):
+        out.append(_minify_markup(source[position:match.start()]))
+        opening, tag, content, closing = match.groups()
+        tag = tag.lower()
+        if tag == 'script':
+            script_type = _SCRIPT_TYPE.search(opening)
+            if script_type is None or 'javascript' in script_type.group(1).lower() \
+                    or script_type.group(1).lower() == 'module':
+                content = minify_js(content)
+        elif tag == 'style':
+            content = minify_css(content)
+        out.append(opening + content + closing)
+        position = match.end()
+    out.append(_minify_markup(source[position:]))
+    return ''.join(out).strip() + '\n'
+
+
+def minify(filename, text):
+    """Minify text according to the extension of filename (unknown types are returned as is)"""
+    if filename.endswith('.js'):
+        return minify_js(text)
+    if filename.endswith('.css'):
+        return minify_css(text)
+    if filename.endswith('.html'):
+        return minify_html(text)
+    return text
+
+
+def precompress(data):
+    """Return {content coding: compressed bytes} for every coding that makes data smaller"""
+    if len(data) < MIN_COMPRESS_SIZE:
+        return {}
+    variants = {}
+    if brotli is not None:
+        variants['br'] = brotli.compress(data, mode=brotli.MODE_TEXT, quality=BROTLI_QUALITY)
+    variants['gzip'] = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    return {coding: body for coding, body in variants.items() if len(body) < len(data)}
@@ -0,0 +1,158 @@
+"""
+Rendered page cache for SME Debt Management Tool
+Keeps recently rendered pages in memory so repeat hits skip Jinja entirely
+"""
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict, namedtuple
+
+from jinja2 import FileSystemBytecodeCache
+
+from minify import minify, precompress
+
+
+# Templates named literally in extends, include, import and from tags; much cheaper
+# than parsing the template, which costs more than loading its compiled bytecode
+_REFERENCE = re.compile(r'''{%-?\s*(?:extends|include|import|from)\s+["']([^"']+)["']''')
+
+CachedPage = namedtuple('CachedPage', ['body', 'etag', 'last_modified', 'encodings'])
+
+
+def make_page(body, last_modified, filename='page.html', compress=True):
+    """Minify a rendered page (or a stylesheet or script, by filename) and precompress it
+
+    Returns the body with its content-hash ETag, modification time and
+    {content coding: compressed body}, so requests never compress anything.
+    Pages that are not cached are not worth compressing (compress=False).
+    """
+    body = minify(filename, body).encode('utf-8')
+    etag = hashlib.sha256(body).hexdigest()[:32]
+    return CachedPage(body, etag, int(last_modified), precompress(body) if compress else {})
+
+
+def bytecode_cache(directory):
+    """Jinja bytecode cache in directory, shared by workers, restarts and static builds"""
+    os.makedirs(directory, exist_ok=True)
+    return FileSystemBytecodeCache(directory)
+
+
+def precompile_templates(jinja_env, tracker=None):
+    """Compile every HTML template (and resolve its dependencies for tracker); return the names
+
+    Run before gunicorn forks, so workers share the compiled templates instead
+    of each compiling them on its first requests.
+    """
+    names = jinja_env.list_templates(extensions=['html'])
+    for name in names:
+        jinja_env.get_template(name)
+        if tracker is not None:
+            tracker.files(name)
+    return names
+
+
+class PageCache:
+    """Bounded LRU cache of rendered pages keyed by (endpoint, language, mtime, ...)"""
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._rendering = {}  # key -> lock held by the thread rendering that page
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the cached page for key, or None"""
+        with self._lock:
+            page = self._entries.get(key)
+            if page is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return page
+
+    def get_or_render(self, key, render):
+        """Return the cached page for key, calling render() to build it on a miss
+
+        Threads that miss the same key at once wait for a single render rather
+        than each minifying and compressing the same page.
+        """
+        page = self.get(key)
+        if page is not None:
+            return page
+        with self._lock:
+            rendering = self._rendering.setdefault(key, threading.Lock())
+        with rendering:
+            try:
+                with self._lock:
+                    page = self._entries.get(key)  # rendered while this thread waited
+                if page is None:
+                    page = render()
+                    self.set(key, page)
+            finally:
+                with self._lock:
+                    self._rendering.pop(key, None)
+        return page
+
+    def set(self, key, page):
+        """Store page under key, evicting the least recently used entries"""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = page
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, endpoint=None, language=None):
+        """Drop cached pages for an endpoint and/or language (all pages if neither is given)"""
+        with self._lock:
+            for key in list(self._entries):
+                if endpoint is not None and key[0] != endpoint:
+                    continue
+                if language is not None and key[1] != language:
+                    continue
+                del self._entries[key]
+
+    def clear(self):
+        """Drop every cached page"""
+        self.invalidate()
+
+
+class TemplateTracker:
+    """Resolves a template's files (including extended/included templates) and their mtime"""
+
+    def __init__(self, jinja_env):
+        self.jinja_env = jinja_env
+        self._files = {}
+        self._lock = threading.Lock()
+
+    def files(self, name):
+        """Return the source paths name depends on"""
+        files = self._files.get(name)
+        if files is None:
+            files = self._resolve(name, set())
+            with self._lock:
+                self._files[name] = files
+        return files
+
+    def _resolve(self, name, seen):
+        if name in seen:
+            return ()
+        seen.add(name)
+        source, filename, _ = self.jinja_env.loader.get_source(self.jinja_env, name)
+        files = [filename]
+        for parent in _REFERENCE.findall(source):
+            files.extend(self._resolve(parent, seen))
+        return tuple(files)
+
+    def mtime(self, name):
+        """Return the newest modification time of the files name depends on"""
+        return max(os.path.getmtime(path) for path in self.files(name))
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Sampling profiler for SME Debt Management Tool
+WSGI middleware that profiles a fraction of requests by sampling their call
+stacks from a background thread, and adds the stacks to one collapsed-stack
+file per endpoint and language, ready for flame graphs
+Usage: python profiler.py on <rate> | off | svg <file.folded> [out.svg]
+"""
+
+import html
+import os
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+from collections import Counter
+
+from werkzeug.wsgi import ClosingIterator
+
+try:
+    import fcntl
+except ImportError:  # Windows: one process, nothing to lock against
+    fcntl = None
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CONTROL_FILE = os.environ.get('PROFILE_CONTROL', os.path.join(ROOT, 'instance', 'profile_rate'))
+SAMPLE_INTERVAL = 0.005  # seconds between stack samples of the profiled requests
+CONTROL_CHECK = 1.0  # seconds between looks at the control file
+FLUSH_INTERVAL = 10.0  # seconds between writes of the collected stacks
+ENVIRON_KEY = 'profiler.label'  # (endpoint, language) of a sampled request, set by the app
+
+SVG_WIDTH = 1200
+FRAME_HEIGHT = 16
+MIN_FRAME_WIDTH = 0.1  # pixels; narrower frames are left out of the SVG
+
+
+def _frame_label(code, _labels={}):
+    """'function (file:line)' for a code object; computed once per code object"""
+    label = _labels.get(code)
+    if label is None:
+        path = code.co_filename
+        if path.startswith(ROOT + os.sep):
+            path = os.path.relpath(path, ROOT)
+        else:
+            path = '/'.join(path.split(os.sep)[-2:])
+        label = f'{code.co_qualname} ({path}:{code.co_firstlineno})'.replace(';', ',')
+        _labels[code] = label
+    return label
+
+
+def collapse(frame):
+    """The stack of frame as 'outermost;...;innermost'"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame.f_code))
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+
+def parse_folded(lines):
+    """Counter of the stacks in the lines of a collapsed-stack file"""
+    stacks = Counter()
+    for line in lines:
+        stack, _, count = line.rstrip('\n').rpartition(' ')
+        if stack:
+            stacks[stack] += int(count)
+    return stacks
+
+
+def add_folded(path, stacks):
+    """Add stacks to a collapsed-stack file, locked against other workers doing the same"""
+    with open(path, 'a+', encoding='utf-8') as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        f.seek(0)
+        totals = parse_folded(f)
+        totals.update(stacks)
+        f.seek(0)
+        f.truncate()
+        f.writelines(f'{stack} {count}\n' for stack, count in sorted(totals.items()))
+
+
+class SamplingProfiler:
+    """WSGI middleware that samples the call stacks of a fraction of requests
+
+    The sample rate starts at rate and follows the number in control_file
+    while it exists, so profiling is switched on and off in all workers
+    without a restart. The app puts (endpoint, language) into
+    environ[ENVIRON_KEY] of a sampled request; its stacks are added to
+    output_dir/<endpoint>.<language>.folded every FLUSH_INTERVAL seconds.
+    """
+
+    def __init__(self, wsgi_app, output_dir, control_file=CONTROL_FILE, rate=0.0, interval=SAMPLE_INTERVAL):
+        self.wsgi_app = wsgi_app
+        self.output_dir = output_dir
+        self.control_file = control_file
+        self.default_rate = rate
+        self.rate = rate
+        self.interval = interval
+        self._control_mtime = None
+        self._checked = 0.0
+        self._active = {}  # thread id -> Counter of the stacks of the sampled request it serves
+        self._pending = {}  # (endpoint, language) -> Counter of stacks not yet written
+        self._flushed = time.monotonic()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def __call__(self, environ, start_response):
+        if not self._sampled():
+            return self.wsgi_app(environ, start_response)
+        environ[ENVIRON_KEY] = None
+        thread_id = threading.get_ident()
+        stacks = Counter()
+        with self._lock:
+            self._active[thread_id] = stacks
+        self._start()
+        self._wake.set()
+        try:
+            app_iter = self.wsgi_app(environ, start_response)
+        except BaseException:
+            self._finish(thread_id, environ, stacks)
+            raise
+        # The body may still be produced while the server iterates over it
+        return ClosingIterator(app_iter, lambda: self._finish(thread_id, environ, stacks))
+
+    def _sampled(self):
+        now = time.monotonic()
+        if now - self._checked >= CONTROL_CHECK:
+            self._checked = now
+            self._read_control()
+        return self.rate > 0 and random.random() < self.rate
+
+    def _read_control(self):
+        try:
+            mtime = os.stat(self.control_file).st_mtime
+        except OSError:
+            self.rate, self._control_mtime = self.default_rate, None
+            return
+        if mtime == self._control_mtime:
+            return
+        self._control_mtime = mtime
+        try:
+            with open(self.control_file) as f:
+                self.rate = min(max(float(f.read().strip() or 0), 0.0), 1.0)
+        except (OSError, ValueError) as e:
+            print(f"Error reading profiler control file {self.control_file}: {e}")
+
+    def _start(self):
+        # Threads do not survive a fork, so each worker starts its own sampler
+        with self._lock:
+            if self._pid == os.getpid() and self._thread.is_alive():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            # A random first delay, so short requests are sampled in proportion to their
+            # duration rather than always at their start
+            time.sleep(random.uniform(0, self.interval))
+            while self._sample():
+                time.sleep(self.interval)
+
+    def _sample(self):
+        """Record one stack of every thread serving a sampled request; False if there are none"""
+        frames = sys._current_frames()
+        with self._lock:
+            if not self._active:
+                return False
+            for thread_id, stacks in self._active.items():
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    stacks[collapse(frame)] += 1
+        return True
+
+    def _finish(self, thread_id, environ, stacks):
+        label = environ.get(ENVIRON_KEY) or ('unmatched', '-')
+        with self._lock:
+            self._active.pop(thread_id, None)
+            if stacks:
+                self._pending.setdefault(label, Counter()).update(stacks)
+        if time.monotonic() - self._flushed >= FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        """Add the stacks collected since the last flush to their files"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._flushed = time.monotonic()
+        if not pending:
+            return
+        os.makedirs(self.output_dir, exist_ok=True)
+        for label, stacks in pending.items():
+            name = '.'.join(re.sub(r'[^\w-]', '_', part) for part in label)
+            add_folded(os.path.join(self.output_dir, f'{name}.folded'), stacks)
+
+
+def _color(name):
+    """A warm colour that stays the same for a function across renders"""
+    value = zlib.crc32(name.encode())
+    return f'rgb({205 + value % 50},{(value >> 8) % 180},{(value >> 16) % 55})'
+
+
+def flamegraph(stacks, title='Flame graph'):
+    """SVG flame graph of a Counter of collapsed stacks"""
+    root = {'children': {}, 'value': 0}
+    for stack, count in stacks.items():
+        node = root
+        node['value'] += count
+        for name in stack.split(';'):
+            node = node['children'].setdefault(name, {'children': {}, 'value': 0})
+            node['value'] += count
+
+    def depth(node):
+        return 1 + max((depth(child) for child in node['children'].values()), default=0)
+
+    total = root['value'] or 1
+    scale = SVG_WIDTH / total
+    height = (depth(root) + 1) * FRAME_HEIGHT
+    frames = []
+
+    def draw(node, x, level):
+        for name, child in sorted(node['children'].items()):
+            width = child['value'] * scale
+            if width >= MIN_FRAME_WIDTH:
+                y = height - (level + 1) * FRAME_HEIGHT
+                share = 100 * child['value'] / total
+                text = name[:int(width / 7)] if width > 35 else ''
+                frames.append(
+                    f'<g><title>{html.escape(name)} ({child["value"]} samples, {share:.1f}%)</title>'
+                    f'<rect x="{x:.1f}" y="{y}" width="{width:.1f}" height="{FRAME_HEIGHT - 1}" '
+                    f'fill="{_color(name)}"/><text x="{x + 3:.1f}" y="{y + 11}">{html.escape(text)}</text></g>')
+                draw(child, x, level + 1)
+            x += width
+
+    draw(root, 0.0, 0)
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{SVG_WIDTH}" height="{height}" '
+            f'font-family="monospace" font-size="11">'
+            f'<text x="4" y="12">{html.escape(title)} ({root["value"]} samples)</text>'
+            + ''.join(frames) + '</svg>\n')
+
+
+def set_rate(rate, control_file=CONTROL_FILE):
+    """Profile rate of all requests from now on, in every worker watching control_file"""
+    os.makedirs(os.path.dirname(control_file), exist_ok=True)
+    with open(control_file, 'w') as f:
+        f.write(f'{rate}\n')
+
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else argv
+    if args[:1] == ['on'] and len(args) == 2:
+        set_rate(float(args[1]))
+        print(f"🔥 Profiling {float(args[1]):.1%} of requests (within {CONTROL_CHECK:.0f}s in every worker)")
+    elif args == ['off']:
+        set_rate(0)
+        print("✅ Profiling off")
+    elif args[:1] == ['svg'] and len(args) in (2, 3):
+        output = args[2] if len(args) == 3 else os.path.splitext(args[1])[0] + '.svg'
+        with open(args[1], encoding='utf-8') as f:
+            stacks = parse_folded(f)
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(flamegraph(stacks, os.path.basename(args[1])))
+        print(f"✅ Flame graph written to {output}")
+    else:
+        print(__doc__.strip().splitlines()[-1])
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
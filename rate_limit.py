@@ -0,0 +1,90 @@
+"""
+Rate limiting for SME Debt Management Tool
+Token buckets per client and a memory of recent message contents, kept in SQLite
+so the limits hold across all gunicorn workers without nginx in front
+"""
+
+import hashlib
+import re
+import time
+
+from sqlite_store import SQLiteStore
+
+PURGE_EVERY = 500  # calls between removals of full buckets and expired contents
+
+
+def content_digest(*parts):
+    """Hash of text parts that ignores case and differences in whitespace"""
+    text = '\x00'.join(re.sub(r'\s+', ' ', part).strip().lower() for part in parts)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class RateLimiter(SQLiteStore):
+    """Token buckets holding up to burst tokens each, refilled at burst per period seconds
+
+    A bucket that has been full for a while is the same as no bucket, so
+    those rows are purged now and then.
+    """
+
+    SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS buckets (
+        key TEXT PRIMARY KEY,
+        tokens REAL NOT NULL,
+        updated REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS contents (
+        digest TEXT PRIMARY KEY,
+        expires REAL NOT NULL
+    );
+    '''
+
+    def __init__(self, path, burst=5, period=3600.0, dedup_window=86400.0):
+        if burst < 1:
+            raise ValueError('burst must be at least 1, or no request is ever allowed')
+        if period <= 0:
+            raise ValueError('period must be positive')
+        self.burst = burst
+        self.rate = burst / period  # tokens per second
+        self.dedup_window = dedup_window
+        self._calls = 0
+        super().__init__(path)
+
+    def allow(self, key):
+        """Take a token from key's bucket; return (allowed, seconds until the next token)"""
+        now = time.time()
+        with self._transaction() as db:
+            row = db.execute('SELECT tokens, updated FROM buckets WHERE key = ?', (key,)).fetchone()
+            tokens = self.burst if row is None else min(self.burst, row[0] + (now - row[1]) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            db.execute('INSERT OR REPLACE INTO buckets (key, tokens, updated) VALUES (?, ?, ?)',
+                       (key, tokens, now))
+            self._purge(db, now)
+        return allowed, 0.0 if allowed else (1 - tokens) / self.rate
+
+    def is_duplicate(self, digest):
+        """Whether digest was seen within dedup_window; remembers it if not
+
+        Remembering it right away means that of two identical submissions
+        arriving together only one gets through. If its work then fails, call
+        forget() so that a retry is not taken for a duplicate.
+        """
+        now = time.time()
+        with self._transaction() as db:
+            db.execute('DELETE FROM contents WHERE digest = ? AND expires <= ?', (digest, now))
+            cursor = db.execute('INSERT OR IGNORE INTO contents (digest, expires) VALUES (?, ?)',
+                                (digest, now + self.dedup_window))
+            self._purge(db, now)
+        return cursor.rowcount == 0
+
+    def forget(self, digest):
+        """Drop digest, so the same content counts as new again"""
+        with self._transaction() as db:
+            db.execute('DELETE FROM contents WHERE digest = ?', (digest,))
+
+    def _purge(self, db, now):
+        self._calls += 1
+        if self._calls % PURGE_EVERY == 0:
+            db.execute('DELETE FROM buckets WHERE updated < ?', (now - self.burst / self.rate,))
+            db.execute('DELETE FROM contents WHERE expires <= ?', (now,))
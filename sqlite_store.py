@@ -0,0 +1,46 @@
+"""
+SQLite storage shared by the workers of SME Debt Management Tool
+Base class for the small databases in the instance folder (mail outbox, rate limits, metrics)
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+class SQLiteStore:
+    """A SQLite database in WAL mode with one connection per thread and process
+
+    Subclasses put their CREATE statements in SCHEMA; they run on every open.
+    """
+
+    SCHEMA = ''
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        db = self._connection()
+        db.execute('PRAGMA journal_mode=WAL')
+        db.executescript(self.SCHEMA)
+
+    def _connection(self):
+        """This thread's connection (connections must not cross a fork)"""
+        if getattr(self._local, 'pid', None) != os.getpid():
+            self._local.db = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            self._local.pid = os.getpid()
+        return self._local.db
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction; the lock is taken up front so read-modify-write cannot race"""
+        db = self._connection()
+        db.execute('BEGIN IMMEDIATE')
+        try:
+            yield db
+        except BaseException:
+            db.execute('ROLLBACK')
+            raise
+        db.execute('COMMIT')
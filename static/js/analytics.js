@@ -1,27 +1,129 @@
 // Advanced Analytics and Insights for SME Debt Management Tool
 
+// Usage events are sent to the server in batches; the static site has no endpoint (empty URL)
+const BEACON_URL = document.currentScript ? document.currentScript.dataset.beaconUrl : '';
+const BEACON_BATCH_SIZE = 20;  // events that are sent at once
+const BEACON_DELAY = 10000;  // ms an event waits for others before the batch is sent anyway
+
+// Calculations are kept in IndexedDB, at most this many of each type (oldest dropped first)
+const DB_NAME = 'smeAnalytics';
+const CALCULATIONS_PER_TYPE = 50;
+const TREND_WINDOW = 6;  // latest calculations of a type the trend insights compare
+const WRITE_TIMEOUT = 2000;  // ms queued writes may wait for the browser to become idle
+
+// Open the analytics database; resolves to null where IndexedDB is unavailable
+function openAnalyticsDB() {
+    return new Promise(resolve => {
+        if (!window.indexedDB) {
+            resolve(null);
+            return;
+        }
+        let request;
+        try {
+            request = indexedDB.open(DB_NAME, 1);
+        } catch (error) {
+            // Storage blocked, e.g. in sandboxed frames
+            resolve(null);
+            return;
+        }
+        request.onupgradeneeded = () => {
+            const store = request.result.createObjectStore('calculations', { keyPath: 'seq', autoIncrement: true });
+            store.createIndex('type', 'type');
+        };
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => resolve(null);
+        request.onblocked = () => resolve(null);
+    });
+}
+
 class SMEAnalytics {
     constructor() {
-        this.analyticsData = this.loadAnalyticsData();
+        this.analyticsData = { calculations: [] };
         this.insights = [];
         this.recommendations = [];
+        this.pendingEvents = [];
+        this.sendTimer = null;
+        this.pendingWrites = [];
+        this.writeScheduled = false;
+        this.resetInsightState();
+        // Resolves once stored calculations are loaded and their insights computed
+        this.ready = this.loadAnalyticsData();
     }
 
-    // Load analytics data from localStorage
-    loadAnalyticsData() {
-        const data = JSON.parse(localStorage.getItem('smeAnalytics') || '{}');
-        return {
-            calculations: data.calculations || [],
-            userBehavior: data.userBehavior || {},
-            trends: data.trends || {},
-            insights: data.insights || [],
-            ...data
-        };
+    // Load the stored calculations, moving those of older versions out of localStorage
+    async loadAnalyticsData() {
+        this.db = await openAnalyticsDB();
+        const legacy = JSON.parse(localStorage.getItem('smeAnalytics') || '{}').calculations || [];
+        let calculations = legacy;
+        if (this.db) {
+            calculations = await new Promise(resolve => {
+                const request = this.db.transaction('calculations').objectStore('calculations').getAll();
+                request.onsuccess = () => resolve(request.result);
+                request.onerror = () => resolve([]);
+            });
+            if (legacy.length) {
+                calculations = calculations.concat(legacy);
+                this.pendingWrites.unshift(...legacy);
+                this.saveAnalyticsData().oncomplete = () => localStorage.removeItem('smeAnalytics');
+            }
+        }
+        // Calculations tracked while loading come after the stored ones
+        const tracked = this.analyticsData.calculations;
+        this.analyticsData.calculations = [];
+        this.resetInsightState();
+        calculations.concat(tracked).forEach(calculation => this.addCalculation(calculation));
+        this.generateInsights();
+        if (this.pendingWrites.length) this.scheduleWrite();
     }
 
-    // Save analytics data
+    // Write queued calculations when the browser is idle, in one transaction
+    scheduleWrite() {
+        if (this.writeScheduled) return;
+        this.writeScheduled = true;
+        if (window.requestIdleCallback) {
+            requestIdleCallback(() => this.saveAnalyticsData(), { timeout: WRITE_TIMEOUT });
+        } else {
+            setTimeout(() => this.saveAnalyticsData(), 200);
+        }
+    }
+
+    // Save queued calculations and drop the oldest of each type beyond CALCULATIONS_PER_TYPE;
+    // returns the IndexedDB transaction, if there is one
     saveAnalyticsData() {
-        localStorage.setItem('smeAnalytics', JSON.stringify(this.analyticsData));
+        this.writeScheduled = false;
+        // Still loading: the load writes the queue when it is done
+        if (this.pendingWrites.length === 0 || this.db === undefined) return null;
+        if (this.db === null) {
+            // No IndexedDB: keep the capped list in localStorage, written once per idle period
+            localStorage.setItem('smeAnalytics', JSON.stringify({ calculations: this.analyticsData.calculations }));
+            this.pendingWrites = [];
+            return null;
+        }
+        const writes = this.pendingWrites;
+        this.pendingWrites = [];
+        const transaction = this.db.transaction('calculations', 'readwrite');
+        const store = transaction.objectStore('calculations');
+        const types = new Set();
+        writes.forEach(calculation => {
+            store.add(calculation);
+            types.add(calculation.type);
+        });
+        // Other tabs write too, so the ring is trimmed from what is stored, not from memory
+        types.forEach(type => {
+            const index = store.index('type');
+            index.count(type).onsuccess = event => {
+                let excess = event.target.result - CALCULATIONS_PER_TYPE;
+                if (excess <= 0) return;
+                index.openCursor(IDBKeyRange.only(type)).onsuccess = cursorEvent => {
+                    const cursor = cursorEvent.target.result;
+                    if (cursor && excess-- > 0) {
+                        cursor.delete();
+                        cursor.continue();
+                    }
+                };
+            };
+        });
+        return transaction;
     }
 
     // Track calculation
@@ -35,52 +137,88 @@ class SMEAnalytics {
             sessionId: this.getSessionId()
         };
 
-        this.analyticsData.calculations.push(calculation);
-        
-        // Keep only last 100 calculations
-        if (this.analyticsData.calculations.length > 100) {
-            this.analyticsData.calculations = this.analyticsData.calculations.slice(-100);
-        }
-
-        this.generateInsights();
-        this.saveAnalyticsData();
+        this.addCalculation(calculation);
+        this.updateInsights(calculation);
+        this.pendingWrites.push(calculation);
+        this.scheduleWrite();
+        this.trackUserBehavior('calculation');
     }
 
-    // Track user behavior
+    // Track user behavior: queue the event in memory for the next beacon
     trackUserBehavior(action, data = {}) {
-        if (!this.analyticsData.userBehavior[action]) {
-            this.analyticsData.userBehavior[action] = [];
-        }
+        if (!BEACON_URL) return;
 
-        this.analyticsData.userBehavior[action].push({
-            timestamp: new Date().toISOString(),
-            ...data
-        });
+        this.pendingEvents.push({ action: action, page: data.page || window.location.pathname });
 
-        this.saveAnalyticsData();
+        if (this.pendingEvents.length >= BEACON_BATCH_SIZE) {
+            this.sendEvents();
+        } else if (!this.sendTimer) {
+            this.sendTimer = setTimeout(() => this.sendEvents(), BEACON_DELAY);
+        }
     }
 
-    // Generate insights based on calculation history
-    generateInsights() {
-        this.insights = [];
-        const calculations = this.analyticsData.calculations;
+    // Send the queued events with navigator.sendBeacon, gzipped where the browser can.
+    // When the page is being hidden there is no time to compress, so final sends plain JSON.
+    sendEvents(final = false) {
+        clearTimeout(this.sendTimer);
+        this.sendTimer = null;
+        if (this.pendingEvents.length === 0 || !navigator.sendBeacon) return;
 
-        if (calculations.length < 2) return;
+        const body = JSON.stringify({ session: this.getSessionId(), events: this.pendingEvents });
+        this.pendingEvents = [];
+        const sendPlain = () => navigator.sendBeacon(BEACON_URL, new Blob([body], { type: 'application/json' }));
 
-        // Debt trend analysis
-        const debtCalculations = calculations.filter(c => c.type === 'debtBrake');
-        if (debtCalculations.length >= 2) {
-            this.analyzeDebtTrends(debtCalculations);
+        if (final || typeof CompressionStream === 'undefined') {
+            sendPlain();
+            return;
         }
+        new Response(new Blob([body]).stream().pipeThrough(new CompressionStream('gzip'))).blob()
+            .then(compressed => navigator.sendBeacon(BEACON_URL + '?encoding=gzip', compressed))
+            .catch(sendPlain);
+    }
 
-        // Cost analysis trends
-        const costCalculations = calculations.filter(c => c.type === 'costAnalysis');
-        if (costCalculations.length >= 2) {
-            this.analyzeCostTrends(costCalculations);
+    // Per-type state the insights are computed from, kept up to date one calculation at a time
+    resetInsightState() {
+        this.typeCounts = {};  // type -> calculations kept
+        this.recent = {};  // type -> the latest TREND_WINDOW calculations
+        this.insightsByType = {};  // insight type -> current insight
+    }
+
+    // Add a calculation to the in-memory list and the per-type state, dropping the
+    // oldest of its type beyond CALCULATIONS_PER_TYPE as the database does
+    addCalculation(calculation) {
+        const type = calculation.type;
+        const calculations = this.analyticsData.calculations;
+        calculations.push(calculation);
+        this.typeCounts[type] = (this.typeCounts[type] || 0) + 1;
+        if (this.typeCounts[type] > CALCULATIONS_PER_TYPE) {
+            calculations.splice(calculations.findIndex(c => c.type === type), 1);
+            this.typeCounts[type]--;
         }
+        const recent = this.recent[type] || (this.recent[type] = []);
+        recent.push(calculation);
+        if (recent.length > TREND_WINDOW) recent.shift();
+    }
 
-        // Cross-analysis insights
-        this.generateCrossAnalysisInsights();
+    // Generate insights based on calculation history
+    generateInsights() {
+        this.insightsByType = {};
+        this.updateInsights({ type: 'debtBrake' });
+        this.updateInsights({ type: 'costAnalysis' });
+    }
+
+    // Update the insights a new calculation of its type can change
+    updateInsights(calculation) {
+        if (calculation.type === 'debtBrake') {
+            this.insightsByType.debt_trend = this.analyzeDebtTrends(this.recent.debtBrake || []);
+        } else if (calculation.type === 'costAnalysis') {
+            this.insightsByType.interest_trend = this.analyzeCostTrends(this.recent.costAnalysis || []);
+        } else {
+            return;
+        }
+        this.insightsByType.capacity_warning = this.generateCrossAnalysisInsights();
+        const total = Object.values(this.typeCounts).reduce((sum, count) => sum + count, 0);
+        this.insights = total < 2 ? [] : Object.values(this.insightsByType).filter(Boolean);
     }
 
     // Analyze debt trends
@@ -95,7 +233,7 @@ class SMEAnalytics {
             const debtChange = ((recentAvgDebt - olderAvgDebt) / olderAvgDebt) * 100;
 
             if (Math.abs(debtChange) > 10) {
-                this.insights.push({
+                return {
                     type: 'debt_trend',
                     priority: debtChange > 0 ? 'high' : 'medium',
                     title: debtChange > 0 ? 'Debt Level Increasing' : 'Debt Level Decreasing',
@@ -104,9 +242,10 @@ class SMEAnalytics {
                         'Consider reviewing your spending and increasing debt payments.' : 
                         'Great job! Continue your debt reduction strategy.',
                     icon: debtChange > 0 ? 'fas fa-arrow-up text-danger' : 'fas fa-arrow-down text-success'
-                });
+                };
             }
         }
+        return null;
     }
 
     // Analyze cost trends
@@ -121,7 +260,7 @@ class SMEAnalytics {
             const rateChange = recentAvgRate - olderAvgRate;
 
             if (Math.abs(rateChange) > 0.5) {
-                this.insights.push({
+                return {
                     type: 'interest_trend',
                     priority: rateChange > 0 ? 'high' : 'low',
                     title: rateChange > 0 ? 'Interest Rates Rising' : 'Interest Rates Falling',
@@ -130,15 +269,16 @@ class SMEAnalytics {
                         'Consider locking in lower rates or refinancing existing debt.' : 
                         'Good time to consider new financing at lower rates.',
                     icon: rateChange > 0 ? 'fas fa-chart-line text-warning' : 'fas fa-chart-line text-success'
-                });
+                };
             }
         }
+        return null;
     }
 
     // Generate cross-analysis insights
     generateCrossAnalysisInsights() {
-        const debtCalculations = this.analyticsData.calculations.filter(c => c.type === 'debtBrake');
-        const costCalculations = this.analyticsData.calculations.filter(c => c.type === 'costAnalysis');
+        const debtCalculations = this.recent.debtBrake || [];
+        const costCalculations = this.recent.costAnalysis || [];
 
         if (debtCalculations.length > 0 && costCalculations.length > 0) {
             const latestDebt = debtCalculations[debtCalculations.length - 1];
@@ -149,16 +289,17 @@ class SMEAnalytics {
             const loanAmount = latestCost.inputs.principal;
 
             if (loanAmount > debtCapacity) {
-                this.insights.push({
+                return {
                     type: 'capacity_warning',
                     priority: 'high',
                     title: 'Loan Exceeds Debt Capacity',
                     message: `The loan amount (${formatCurrency(loanAmount)}) exceeds your available debt capacity (${formatCurrency(debtCapacity)}).`,
                     recommendation: 'Consider reducing the loan amount or improving your financial position first.',
                     icon: 'fas fa-exclamation-triangle text-danger'
-                });
+                };
             }
         }
+        return null;
     }
 
     // Get session ID
@@ -183,11 +324,7 @@ class SMEAnalytics {
     getAnalyticsSummary() {
         const calculations = this.analyticsData.calculations;
         const totalCalculations = calculations.length;
-        const calculationTypes = {};
-        
-        calculations.forEach(calc => {
-            calculationTypes[calc.type] = (calculationTypes[calc.type] || 0) + 1;
-        });
+        const calculationTypes = { ...this.typeCounts };
 
         const mostUsedTool = Object.keys(calculationTypes).reduce((a, b) => 
             calculationTypes[a] > calculationTypes[b] ? a : b, 'debtBrake');
@@ -264,115 +401,23 @@ class SMEAnalytics {
 
     // Clear analytics data
     clearAnalytics() {
-        this.analyticsData = {
-            calculations: [],
-            userBehavior: {},
-            trends: {},
-            insights: []
-        };
+        this.analyticsData = { calculations: [] };
         this.insights = [];
         this.recommendations = [];
-        this.saveAnalyticsData();
+        this.pendingEvents = [];
+        this.pendingWrites = [];
+        this.resetInsightState();
+        if (this.db) {
+            this.db.transaction('calculations', 'readwrite').objectStore('calculations').clear();
+        } else {
+            localStorage.removeItem('smeAnalytics');
+        }
     }
 }
 
 // Global analytics instance
 const smeAnalytics = new SMEAnalytics();
 
-// Enhanced calculation functions with analytics
-function calculateDebtBrakeWithAnalytics() {
-    const revenue = parseFloat(document.getElementById('revenue')?.value) || 0;
-    const expenses = parseFloat(document.getElementById('expenses')?.value) || 0;
-    const existingDebt = parseFloat(document.getElementById('existingDebt')?.value) || 0;
-    const debtServiceRatio = parseFloat(document.getElementById('debtServiceRatio')?.value) || 0.30;
-    
-    if (revenue > 0) {
-        const netIncome = revenue - expenses;
-        const maxDebtService = netIncome * debtServiceRatio;
-        const debtLimit = revenue * 0.0035;
-        const availableCapacity = Math.max(0, debtLimit - existingDebt);
-        const debtUsage = existingDebt > 0 ? (existingDebt / debtLimit) * 100 : 0;
-        
-        const results = {
-            debtLimit: debtLimit,
-            availableCapacity: availableCapacity,
-            debtUsage: debtUsage,
-            maxDebtService: maxDebtService,
-            netIncome: netIncome,
-            revenue: revenue,
-            expenses: expenses,
-            existingDebt: existingDebt
-        };
-        
-        const inputs = {
-            revenue: revenue,
-            expenses: expenses,
-            existingDebt: existingDebt,
-            debtServiceRatio: debtServiceRatio
-        };
-        
-        // Track calculation
-        smeAnalytics.trackCalculation('debtBrake', inputs, results);
-        
-        // Update results
-        updateDebtBrakeResults(results);
-        createDebtBrakeCharts(results);
-        
-        // Show insights
-        showInsights();
-    }
-}
-
-function calculateCostAnalysisWithAnalytics() {
-    const principal = parseFloat(document.getElementById('principal')?.value) || 0;
-    const interestRate = parseFloat(document.getElementById('interestRate')?.value) || 0;
-    const term = parseFloat(document.getElementById('term')?.value) || 0;
-    const fees = parseFloat(document.getElementById('fees')?.value) || 0;
-    const monthlyFees = parseFloat(document.getElementById('monthlyFees')?.value) || 0;
-    const opportunityCost = parseFloat(document.getElementById('opportunityCost')?.value) || 8;
-    
-    if (principal > 0 && interestRate > 0 && term > 0) {
-        const monthlyRate = interestRate / 100 / 12;
-        const numPayments = term * 12;
-        const monthlyPayment = principal * (monthlyRate * Math.pow(1 + monthlyRate, numPayments)) / (Math.pow(1 + monthlyRate, numPayments) - 1);
-        const totalPayment = monthlyPayment * numPayments;
-        const totalInterest = totalPayment - principal;
-        const totalFees = fees + (monthlyFees * numPayments);
-        const totalCost = totalInterest + totalFees;
-        
-        const results = {
-            principal: principal,
-            monthlyPayment: monthlyPayment,
-            totalPayment: totalPayment,
-            totalInterest: totalInterest,
-            totalFees: totalFees,
-            totalCost: totalCost,
-            opportunityCost: opportunityCost,
-            interestRate: interestRate,
-            term: term
-        };
-        
-        const inputs = {
-            principal: principal,
-            interestRate: interestRate,
-            term: term,
-            fees: fees,
-            monthlyFees: monthlyFees,
-            opportunityCost: opportunityCost
-        };
-        
-        // Track calculation
-        smeAnalytics.trackCalculation('costAnalysis', inputs, results);
-        
-        // Update results
-        updateCostAnalysisResults(results);
-        createCostAnalysisCharts(results);
-        
-        // Show insights
-        showInsights();
-    }
-}
-
 // Show insights in UI
 function showInsights() {
     const insights = smeAnalytics.getInsights();
@@ -451,6 +496,18 @@ function trackUserBehavior(action, data = {}) {
     smeAnalytics.trackUserBehavior(action, data);
 }
 
+// Send and store what is queued before the page goes away (pagehide also covers the back/forward cache)
+document.addEventListener('visibilitychange', function() {
+    if (document.visibilityState === 'hidden') {
+        smeAnalytics.sendEvents(true);
+        smeAnalytics.saveAnalyticsData();
+    }
+});
+window.addEventListener('pagehide', function() {
+    smeAnalytics.sendEvents(true);
+    smeAnalytics.saveAnalyticsData();
+});
+
 // Initialize analytics when DOM is loaded
 document.addEventListener('DOMContentLoaded', function() {
     // Track page view
@@ -485,7 +542,5 @@ document.addEventListener('DOMContentLoaded', function() {
 
 // Global functions
 window.smeAnalytics = smeAnalytics;
-window.calculateDebtBrakeWithAnalytics = calculateDebtBrakeWithAnalytics;
-window.calculateCostAnalysisWithAnalytics = calculateCostAnalysisWithAnalytics;
 window.trackUserBehavior = trackUserBehavior;
 window.showInsights = showInsights;
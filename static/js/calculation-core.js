@@ -0,0 +1,411 @@
+// Calculation core shared by the tool pages, the Netlify functions and the
+// parity check against the Python calculations package (calculations/corpus.json).
+// Keep every formula in step with calculations/*.py.
+
+(function(root, factory) {
+    if (typeof module === 'object' && module.exports) {
+        module.exports = factory();
+    } else {
+        root.SMECalculations = factory();
+    }
+}(typeof self !== 'undefined' ? self : this, function() {
+    const DEBT_BRAKE_RATE = 0.0035; // 0.35% of annual revenue
+    const MAX_MONTHS = 600; // 50 years
+    const PAID_OFF = 0.01; // balances below a cent count as repaid
+
+    // Same defaults as the keyword arguments in calculations/*.py
+    const DEFAULTS = {
+        'debt-brake': { existing_debt: 0, debt_service_ratio: 0.30 },
+        'cost-analysis': { fees: 0, monthly_fees: 0, opportunity_cost: 8 },
+        'amortization': { fees: 0, monthly_fees: 0, yearly: false },
+        'debt-equity': { conversion_ratio: 1.2 },
+        'debt-snowball': { strategy: 'snowball' },
+        'covenant-tracking': {
+            max_debt_to_ebitda: 3.5,
+            min_interest_coverage: 2.5,
+            max_debt_to_assets: 0.6,
+            min_cash_flow_coverage: 1.2,
+            average_interest_rate: 0.05
+        }
+    };
+
+    function debtBrake(revenue, expenses, existingDebt, debtServiceRatio) {
+        const netIncome = revenue - expenses;
+        const maxDebtService = netIncome * debtServiceRatio;
+        const maxNewDebt = maxDebtService * 12 - existingDebt;
+        const debtToIncomeRatio = netIncome > 0 ? existingDebt / netIncome : null;
+        const debtLimit = revenue * DEBT_BRAKE_RATE;
+
+        return {
+            netIncome: netIncome,
+            maxDebtService: maxDebtService,
+            maxNewDebt: Math.max(0, maxNewDebt),
+            debtToIncomeRatio: debtToIncomeRatio,
+            isSustainable: debtToIncomeRatio !== null && debtToIncomeRatio <= debtServiceRatio,
+            debtLimit: debtLimit,
+            availableCapacity: Math.max(0, debtLimit - existingDebt),
+            debtUsage: existingDebt / debtLimit * 100
+        };
+    }
+
+    function annuityPayment(principal, annualRate, months) {
+        const monthlyRate = annualRate / 100 / 12;
+        if (monthlyRate === 0) {
+            return principal / months;
+        }
+        const growth = Math.pow(1 + monthlyRate, months);
+        return principal * monthlyRate * growth / (growth - 1);
+    }
+
+    function costAnalysis(principal, interestRate, term, fees, monthlyFees, opportunityCost) {
+        const months = term * 12;
+        const monthlyPayment = annuityPayment(principal, interestRate, months);
+        const totalPayment = monthlyPayment * months;
+        const totalInterest = totalPayment - principal;
+        const totalFees = fees + monthlyFees * months;
+        const opportunityCostValue = principal * opportunityCost / 100 * term;
+        const totalCost = totalInterest + totalFees + opportunityCostValue;
+
+        return {
+            principal: principal,
+            monthlyPayment: monthlyPayment,
+            totalPayment: totalPayment,
+            totalInterest: totalInterest,
+            totalFees: totalFees,
+            opportunityCost: opportunityCostValue,
+            totalCost: totalCost,
+            effectiveRate: totalCost / principal / term * 100
+        };
+    }
+
+    // Closed-form annuity schedule, as calculations/amortization.py: the balance
+    // after k months is P * ((1 + r)^n - (1 + r)^k) / ((1 + r)^n - 1), so yearly
+    // rows come straight from the year-end balances without a monthly loop
+    function amortizationSchedule(principal, annualRate, term, fees, monthlyFees, yearly) {
+        const months = Math.max(Math.round(term * 12), 1);
+        const monthlyRate = annualRate / 100 / 12;
+        const logGrowth = Math.log1p(monthlyRate);
+        const growth = Math.expm1(months * logGrowth);
+        const payment = growth === 0 ? principal / months : principal * monthlyRate * (growth + 1) / growth;
+        const balanceAfter = k => {
+            k = Math.min(k, months);
+            return principal * (1 - (growth === 0 ? k / months : Math.expm1(k * logGrowth) / growth));
+        };
+
+        const step = yearly ? 12 : 1;
+        const periods = Math.ceil(months / step);
+        const schedule = { payment: [], interest: [], principal: [], fees: [], balance: [] };
+        schedule[yearly ? 'year' : 'month'] = [];
+        let opening = principal;
+        for (let period = 1; period <= periods; period++) {
+            const paid = Math.min(months - (period - 1) * step, step);
+            const closing = balanceAfter(period * step);
+            const periodPayment = payment * paid;
+            const principalPaid = opening - closing;
+            schedule[yearly ? 'year' : 'month'].push(period);
+            schedule.payment.push(periodPayment);
+            schedule.interest.push(yearly ? periodPayment - principalPaid : opening * monthlyRate);
+            schedule.principal.push(principalPaid);
+            schedule.fees.push(monthlyFees * paid + (period === 1 ? fees : 0));
+            schedule.balance.push(closing);
+            opening = closing;
+        }
+
+        const sum = values => values.reduce((total, value) => total + value, 0);
+        return {
+            monthlyPayment: payment,
+            months: months,
+            totalInterest: sum(schedule.interest),
+            totalFees: sum(schedule.fees),
+            schedule: schedule
+        };
+    }
+
+    function debtEquitySwap(debtAmount, companyValue, existingShares, conversionRatio) {
+        const sharePrice = companyValue / existingShares;
+        const newShares = debtAmount / sharePrice * conversionRatio;
+        const totalShares = existingShares + newShares;
+
+        return {
+            sharePrice: sharePrice,
+            newShares: newShares,
+            totalShares: totalShares,
+            newSharePrice: companyValue / totalShares,
+            ownershipDilution: newShares / totalShares * 100,
+            debtReduction: debtAmount
+        };
+    }
+
+    function covenantRatios(totalDebt, ebitda, totalAssets, cashFlow, averageInterestRate) {
+        const interestExpense = totalDebt * averageInterestRate;
+        return {
+            debtToEbitda: totalDebt / ebitda,
+            interestCoverage: ebitda / interestExpense,
+            debtToAssets: totalDebt / totalAssets,
+            cashFlowCoverage: cashFlow / interestExpense
+        };
+    }
+
+    function checkCovenants(totalDebt, ebitda, totalAssets, cashFlow, limits, averageInterestRate) {
+        const ratios = covenantRatios(totalDebt, ebitda, totalAssets, cashFlow, averageInterestRate);
+        const covenants = {
+            debtToEbitda: {
+                value: ratios.debtToEbitda,
+                limit: limits.maxDebtToEbitda,
+                compliant: ratios.debtToEbitda <= limits.maxDebtToEbitda
+            },
+            interestCoverage: {
+                value: ratios.interestCoverage,
+                limit: limits.minInterestCoverage,
+                compliant: ratios.interestCoverage >= limits.minInterestCoverage
+            },
+            debtToAssets: {
+                value: ratios.debtToAssets,
+                limit: limits.maxDebtToAssets,
+                compliant: ratios.debtToAssets <= limits.maxDebtToAssets
+            },
+            cashFlowCoverage: {
+                value: ratios.cashFlowCoverage,
+                limit: limits.minCashFlowCoverage,
+                compliant: ratios.cashFlowCoverage >= limits.minCashFlowCoverage
+            }
+        };
+
+        return {
+            covenants: covenants,
+            allCompliant: Object.values(covenants).every(covenant => covenant.compliant)
+        };
+    }
+
+    function orderDebts(debts, strategy) {
+        const ordered = debts.slice();
+        if (strategy === 'snowball') {
+            ordered.sort((a, b) => a.balance - b.balance);
+        } else {
+            ordered.sort((a, b) => b.rate - a.rate);
+        }
+        return ordered;
+    }
+
+    // Balance of one debt in closed form from its last event onwards: with a
+    // constant payment p the balance k months later is b * g^k - p * (g^k - 1) / r
+    function debtState(debt) {
+        const minimum = debt.minimumPayment || 0;
+        return {
+            name: debt.name,
+            originalBalance: debt.balance,
+            balance: debt.balance,
+            rate: debt.rate / 100 / 12,
+            minimum: minimum,
+            payment: minimum,
+            since: 0,
+            paid: 0,
+            payoff: null,
+            next: null
+        };
+    }
+
+    function balanceAt(state, month) {
+        const k = month - state.since;
+        if (state.rate === 0) {
+            return state.balance - state.payment * k;
+        }
+        const growth = Math.expm1(k * Math.log1p(state.rate));
+        return state.balance * (growth + 1) - state.payment * growth / state.rate;
+    }
+
+    function advance(state, month, payment) {
+        state.paid += state.payment * (month - state.since);
+        state.balance = balanceAt(state, month);
+        state.since = month;
+        state.payment = payment;
+    }
+
+    function payoffMonth(state) {
+        if (state.balance <= PAID_OFF) {
+            return state.since;
+        }
+        let months;
+        if (state.rate === 0) {
+            if (state.payment <= 0) {
+                return null;
+            }
+            months = state.balance / state.payment;
+        } else {
+            if (state.payment <= state.balance * state.rate) {
+                return null; // The payment does not cover the interest
+            }
+            months = -Math.log1p(-state.balance * state.rate / state.payment) / Math.log1p(state.rate);
+        }
+        const month = state.since + Math.max(1, Math.ceil(months - 1e-9));
+        return month <= MAX_MONTHS ? month : null;
+    }
+
+    // Event-driven repayment simulation, as calculations/debt_snowball.py: every
+    // open debt gets its minimum payment, the rest of the budget goes to the first
+    // open debt in strategy order and rolls over when that debt is paid off
+    function repaymentPlan(debts, monthlyPayment, strategy) {
+        const ordered = orderDebts(debts, strategy).map(debtState);
+        let free = monthlyPayment - ordered.reduce((sum, state) => sum + state.minimum, 0);
+        if (free < 0) {
+            throw new Error('monthly_payment must cover the minimum payments');
+        }
+
+        let target = 0;
+        ordered[0].payment += free;
+        ordered.forEach(state => { state.next = payoffMonth(state); });
+
+        for (;;) {
+            let month = null;
+            ordered.forEach(state => {
+                if (state.payoff === null && state.next !== null && (month === null || state.next < month)) {
+                    month = state.next;
+                }
+            });
+            if (month === null) {
+                break;
+            }
+
+            // Settle every debt that is paid off this month and collect what is left over
+            let leftover = 0;
+            ordered.forEach(state => {
+                if (state.payoff !== null || state.next !== month) {
+                    return;
+                }
+                if (month > state.since) {
+                    const due = balanceAt(state, month - 1) * (1 + state.rate);
+                    state.paid += state.payment * (month - 1 - state.since) + due;
+                    leftover += state.payment - due;
+                } else {
+                    state.paid += state.balance;
+                }
+                state.balance = 0;
+                state.payoff = month;
+                free += state.minimum;
+            });
+
+            // The leftover goes to the next open debts in the same month
+            while (target < ordered.length) {
+                const state = ordered[target];
+                if (state.payoff !== null) {
+                    target++;
+                    continue;
+                }
+                if (leftover <= 0) {
+                    break;
+                }
+                advance(state, month, state.minimum + free);
+                const applied = Math.min(leftover, state.balance);
+                state.balance -= applied;
+                state.paid += applied;
+                leftover -= applied;
+                if (state.balance > PAID_OFF) {
+                    break;
+                }
+                state.balance = 0;
+                state.payoff = month;
+                free += state.minimum;
+                target++;
+            }
+
+            if (target < ordered.length) {
+                const state = ordered[target];
+                advance(state, month, state.minimum + free);
+                state.next = payoffMonth(state);
+            }
+        }
+
+        const plan = ordered.map(state => {
+            if (state.payoff === null) {
+                advance(state, MAX_MONTHS, state.payment);
+            }
+            return {
+                name: state.name,
+                originalBalance: state.originalBalance,
+                monthlyPayment: state.payment,
+                months: state.payoff !== null ? state.payoff : MAX_MONTHS,
+                interest: state.paid + state.balance - state.originalBalance,
+                totalPaid: state.paid,
+                paidOff: state.payoff !== null,
+                remainingBalance: state.balance
+            };
+        });
+
+        return {
+            plan: plan,
+            totalInterest: plan.reduce((sum, entry) => sum + entry.interest, 0),
+            totalMonths: Math.max(...plan.map(entry => entry.months)),
+            totalDebt: debts.reduce((sum, debt) => sum + debt.balance, 0)
+        };
+    }
+
+    function snakeCase(value) {
+        if (Array.isArray(value)) {
+            return value.map(snakeCase);
+        }
+        if (value !== null && typeof value === 'object') {
+            const result = {};
+            Object.keys(value).forEach(key => {
+                result[key.replace(/[A-Z]/g, c => '_' + c.toLowerCase())] = snakeCase(value[key]);
+            });
+            return result;
+        }
+        return value;
+    }
+
+    // Run a tool with the snake_case input of the /api/<tool> endpoints and
+    // return its result in the same snake_case shape as the Python API
+    function runTool(tool, input) {
+        const i = Object.assign({}, DEFAULTS[tool], input);
+        let result;
+        switch (tool) {
+            case 'debt-brake':
+                result = debtBrake(i.revenue, i.expenses, i.existing_debt, i.debt_service_ratio);
+                break;
+            case 'cost-analysis':
+                result = costAnalysis(i.principal, i.interest_rate, i.term, i.fees, i.monthly_fees, i.opportunity_cost);
+                break;
+            case 'amortization':
+                result = amortizationSchedule(i.principal, i.interest_rate, i.term, i.fees, i.monthly_fees, i.yearly);
+                break;
+            case 'debt-equity':
+                result = debtEquitySwap(i.debt_amount, i.company_value, i.existing_shares, i.conversion_ratio);
+                break;
+            case 'debt-snowball':
+                result = repaymentPlan(i.debts.map(debt => ({
+                    name: debt.name,
+                    balance: debt.balance,
+                    rate: debt.rate,
+                    minimumPayment: debt.minimum_payment
+                })), i.monthly_payment, i.strategy);
+                break;
+            case 'covenant-tracking':
+                result = checkCovenants(i.total_debt, i.ebitda, i.total_assets, i.cash_flow, {
+                    maxDebtToEbitda: i.max_debt_to_ebitda,
+                    minInterestCoverage: i.min_interest_coverage,
+                    maxDebtToAssets: i.max_debt_to_assets,
+                    minCashFlowCoverage: i.min_cash_flow_coverage
+                }, i.average_interest_rate);
+                break;
+            default:
+                throw new Error('Unknown tool: ' + tool);
+        }
+        return snakeCase(result);
+    }
+
+    return {
+        DEBT_BRAKE_RATE: DEBT_BRAKE_RATE,
+        DEFAULTS: DEFAULTS,
+        debtBrake: debtBrake,
+        annuityPayment: annuityPayment,
+        costAnalysis: costAnalysis,
+        amortizationSchedule: amortizationSchedule,
+        debtEquitySwap: debtEquitySwap,
+        covenantRatios: covenantRatios,
+        checkCovenants: checkCovenants,
+        orderDebts: orderDebts,
+        repaymentPlan: repaymentPlan,
+        snakeCase: snakeCase,
+        runTool: runTool
+    };
+}));
@@ -0,0 +1,32 @@
+// Shared helpers of the calculator modules in static/js/tools/.
+// Every page loads this module; formatCurrency is also global for the inline page scripts.
+
+// Utility function for currency formatting
+export function formatCurrency(amount) {
+    return new Intl.NumberFormat('de-DE', {
+        style: 'currency',
+        currency: 'EUR'
+    }).format(amount);
+}
+
+// Debounce function for performance
+export function debounce(func, wait) {
+    let timeout;
+    return function executedFunction(...args) {
+        const later = () => {
+            clearTimeout(timeout);
+            func(...args);
+        };
+        clearTimeout(timeout);
+        timeout = setTimeout(later, wait);
+    };
+}
+
+// Recalculate shortly after any of the inputs matching selector changes
+export function onInputs(selector, calculate) {
+    document.querySelectorAll(selector).forEach(input => {
+        input.addEventListener('input', debounce(calculate, 500));
+    });
+}
+
+window.formatCurrency = formatCurrency;
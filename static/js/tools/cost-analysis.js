@@ -0,0 +1,225 @@
+// Cost analysis calculator with real-time results and charts
+import { formatCurrency, onInputs } from './common.js';
+import { loadCalculationHistory, registerCalculator, saveCalculation } from './history.js';
+import './export.js';
+
+// Chart instances storage
+const chartInstances = {};
+
+function calculateCostAnalysis() {
+    const principal = parseFloat(document.getElementById('principal')?.value) || 0;
+    const interestRate = parseFloat(document.getElementById('interestRate')?.value) || 0;
+    const term = parseFloat(document.getElementById('term')?.value) || 0;
+    const fees = parseFloat(document.getElementById('fees')?.value) || 0;
+    const monthlyFees = parseFloat(document.getElementById('monthlyFees')?.value) || 0;
+    const opportunityCost = parseFloat(document.getElementById('opportunityCost')?.value) || 8;
+    
+    if (principal > 0 && interestRate > 0 && term > 0) {
+        const analysis = SMECalculations.costAnalysis(principal, interestRate, term, fees, monthlyFees, opportunityCost);
+        
+        const results = {
+            principal: principal,
+            monthlyPayment: analysis.monthlyPayment,
+            totalPayment: analysis.totalPayment,
+            totalInterest: analysis.totalInterest,
+            totalFees: analysis.totalFees,
+            totalCost: analysis.totalInterest + analysis.totalFees, // Cost of borrowing, without opportunity cost
+            opportunityCost: opportunityCost,
+            interestRate: interestRate,
+            term: term
+        };
+        
+        // Update results in real-time
+        updateCostAnalysisResults(results);
+        
+        // Create charts
+        createCostAnalysisCharts(results);
+        
+        // Save calculation
+        saveCalculation('costAnalysis', results);
+    }
+}
+
+function createCostAnalysisCharts(results) {
+    // Cost Breakdown Chart
+    const costBreakdownCtx = document.getElementById('costBreakdownChart');
+    if (costBreakdownCtx) {
+        if (chartInstances.costBreakdown) {
+            chartInstances.costBreakdown.destroy();
+        }
+        
+        chartInstances.costBreakdown = new Chart(costBreakdownCtx, {
+            type: 'pie',
+            data: {
+                labels: ['Interest', 'Fees', 'Principal'],
+                datasets: [{
+                    data: [results.totalInterest, results.totalFees, results.principal],
+                    backgroundColor: ['#ffc107', '#17a2b8', '#28a745'],
+                    borderWidth: 2,
+                    borderColor: '#fff'
+                }]
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                plugins: {
+                    legend: {
+                        position: 'bottom'
+                    },
+                    tooltip: {
+                        callbacks: {
+                            label: function(context) {
+                                return context.label + ': ' + formatCurrency(context.parsed);
+                            }
+                        }
+                    }
+                }
+            }
+        });
+    }
+    
+    // Payment Timeline Chart
+    const paymentTimelineCtx = document.getElementById('paymentTimelineChart');
+    if (paymentTimelineCtx) {
+        if (chartInstances.paymentTimeline) {
+            chartInstances.paymentTimeline.destroy();
+        }
+        
+        // Year-end balances straight from the closed-form schedule
+        const yearly = SMECalculations.amortizationSchedule(results.principal, results.interestRate, results.term, 0, 0, true).schedule;
+        const labels = yearly.year.map(year => `Year ${year}`);
+        
+        chartInstances.paymentTimeline = new Chart(paymentTimelineCtx, {
+            type: 'line',
+            data: {
+                labels: labels,
+                datasets: [{
+                    label: 'Remaining Balance',
+                    data: yearly.balance,
+                    borderColor: '#dc3545',
+                    backgroundColor: 'rgba(220, 53, 69, 0.1)',
+                    fill: true,
+                    tension: 0.4
+                }]
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                scales: {
+                    y: {
+                        beginAtZero: true,
+                        ticks: {
+                            callback: function(value) {
+                                return formatCurrency(value);
+                            }
+                        }
+                    }
+                },
+                plugins: {
+                    tooltip: {
+                        callbacks: {
+                            label: function(context) {
+                                return 'Remaining Balance: ' + formatCurrency(context.parsed.y);
+                            }
+                        }
+                    }
+                }
+            }
+        });
+    }
+}
+
+function updateCostAnalysisResults(results) {
+    const resultsDiv = document.getElementById('results');
+    const resultsContent = document.getElementById('resultsContent');
+    
+    if (resultsDiv && resultsContent) {
+        resultsContent.innerHTML = `
+            <div class="row g-3">
+                <div class="col-12 col-md-6">
+                    <div class="card bg-light">
+                        <div class="card-body text-center">
+                            <h5 class="card-title text-primary">${formatCurrency(results.monthlyPayment)}</h5>
+                            <p class="card-text">Monthly Payment</p>
+                        </div>
+                    </div>
+                </div>
+                <div class="col-12 col-md-6">
+                    <div class="card bg-light">
+                        <div class="card-body text-center">
+                            <h5 class="card-title text-danger">${formatCurrency(results.totalInterest)}</h5>
+                            <p class="card-text">Total Interest</p>
+                        </div>
+                    </div>
+                </div>
+                <div class="col-12 col-md-6">
+                    <div class="card bg-light">
+                        <div class="card-body text-center">
+                            <h5 class="card-title text-warning">${formatCurrency(results.totalFees)}</h5>
+                            <p class="card-text">Total Fees</p>
+                        </div>
+                    </div>
+                </div>
+                <div class="col-12 col-md-6">
+                    <div class="card bg-light">
+                        <div class="card-body text-center">
+                            <h5 class="card-title text-dark">${formatCurrency(results.totalCost)}</h5>
+                            <p class="card-text">Total Cost</p>
+                        </div>
+                    </div>
+                </div>
+            </div>
+            
+            <!-- Charts Section -->
+            <div class="row g-3 mt-4">
+                <div class="col-12 col-md-6">
+                    <div class="card">
+                        <div class="card-header">
+                            <h6 class="mb-0"><i class="fas fa-chart-pie me-2"></i>Cost Breakdown</h6>
+                        </div>
+                        <div class="card-body">
+                            <canvas id="costBreakdownChart" height="200"></canvas>
+                        </div>
+                    </div>
+                </div>
+                <div class="col-12 col-md-6">
+                    <div class="card">
+                        <div class="card-header">
+                            <h6 class="mb-0"><i class="fas fa-chart-line me-2"></i>Payment Timeline</h6>
+                        </div>
+                        <div class="card-body">
+                            <canvas id="paymentTimelineChart" height="200"></canvas>
+                        </div>
+                    </div>
+                </div>
+            </div>
+            
+            <!-- Calculation History -->
+            <div class="row g-3 mt-4">
+                <div class="col-12">
+                    <div class="card">
+                        <div class="card-header d-flex justify-content-between align-items-center">
+                            <h6 class="mb-0"><i class="fas fa-history me-2"></i>Calculation History</h6>
+                            <button class="btn btn-outline-secondary btn-sm" onclick="clearCalculationHistory('costAnalysis')">
+                                <i class="fas fa-trash me-1"></i>Clear History
+                            </button>
+                        </div>
+                        <div class="card-body">
+                            <div id="costAnalysisHistory"></div>
+                        </div>
+                    </div>
+                </div>
+            </div>
+        `;
+        resultsDiv.style.display = 'block';
+        
+        // Load calculation history
+        loadCalculationHistory('costAnalysis');
+    }
+}
+
+onInputs('#principal, #interestRate, #term, #fees, #monthlyFees, #opportunityCost', calculateCostAnalysis);
+registerCalculator('costAnalysis', calculateCostAnalysis);
+
+// Global function for the calculate button
+window.calculateCostAnalysis = calculateCostAnalysis;
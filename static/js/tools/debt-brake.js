@@ -0,0 +1,220 @@
+// Debt brake calculator with real-time results and charts
+import { formatCurrency, onInputs } from './common.js';
+import { loadCalculationHistory, registerCalculator, saveCalculation } from './history.js';
+import './export.js';
+
+// Chart instances storage
+const chartInstances = {};
+
+function calculateDebtBrake() {
+    const revenue = parseFloat(document.getElementById('revenue')?.value) || 0;
+    const expenses = parseFloat(document.getElementById('expenses')?.value) || 0;
+    const existingDebt = parseFloat(document.getElementById('existingDebt')?.value) || 0;
+    const debtServiceRatio = parseFloat(document.getElementById('debtServiceRatio')?.value) || 0.30;
+    
+    if (revenue > 0) {
+        const brake = SMECalculations.debtBrake(revenue, expenses, existingDebt, debtServiceRatio);
+        
+        const results = {
+            debtLimit: brake.debtLimit,
+            availableCapacity: brake.availableCapacity,
+            debtUsage: brake.debtUsage,
+            maxDebtService: brake.maxDebtService,
+            netIncome: brake.netIncome,
+            revenue: revenue,
+            expenses: expenses,
+            existingDebt: existingDebt
+        };
+        
+        // Update results in real-time
+        updateDebtBrakeResults(results);
+        
+        // Create charts
+        createDebtBrakeCharts(results);
+        
+        // Save calculation
+        saveCalculation('debtBrake', results);
+    }
+}
+
+function createDebtBrakeCharts(results) {
+    // Debt Usage Chart
+    const debtUsageCtx = document.getElementById('debtUsageChart');
+    if (debtUsageCtx) {
+        if (chartInstances.debtUsage) {
+            chartInstances.debtUsage.destroy();
+        }
+        
+        chartInstances.debtUsage = new Chart(debtUsageCtx, {
+            type: 'doughnut',
+            data: {
+                labels: ['Used Debt', 'Available Capacity'],
+                datasets: [{
+                    data: [results.existingDebt, results.availableCapacity],
+                    backgroundColor: [
+                        results.debtUsage > 80 ? '#dc3545' : results.debtUsage > 60 ? '#ffc107' : '#28a745',
+                        '#e9ecef'
+                    ],
+                    borderWidth: 2,
+                    borderColor: '#fff'
+                }]
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                plugins: {
+                    legend: {
+                        position: 'bottom'
+                    },
+                    tooltip: {
+                        callbacks: {
+                            label: function(context) {
+                                return context.label + ': ' + formatCurrency(context.parsed);
+                            }
+                        }
+                    }
+                }
+            }
+        });
+    }
+    
+    // Income vs Expenses Chart
+    const incomeExpensesCtx = document.getElementById('incomeExpensesChart');
+    if (incomeExpensesCtx) {
+        if (chartInstances.incomeExpenses) {
+            chartInstances.incomeExpenses.destroy();
+        }
+        
+        chartInstances.incomeExpenses = new Chart(incomeExpensesCtx, {
+            type: 'bar',
+            data: {
+                labels: ['Revenue', 'Expenses', 'Net Income'],
+                datasets: [{
+                    label: 'Amount (€)',
+                    data: [results.revenue, results.expenses, results.netIncome],
+                    backgroundColor: ['#28a745', '#dc3545', '#007bff'],
+                    borderWidth: 1,
+                    borderColor: '#fff'
+                }]
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                scales: {
+                    y: {
+                        beginAtZero: true,
+                        ticks: {
+                            callback: function(value) {
+                                return formatCurrency(value);
+                            }
+                        }
+                    }
+                },
+                plugins: {
+                    tooltip: {
+                        callbacks: {
+                            label: function(context) {
+                                return context.label + ': ' + formatCurrency(context.parsed.y);
+                            }
+                        }
+                    }
+                }
+            }
+        });
+    }
+}
+
+function updateDebtBrakeResults(results) {
+    const resultsDiv = document.getElementById('results');
+    const resultsContent = document.getElementById('resultsContent');
+    
+    if (resultsDiv && resultsContent) {
+        resultsContent.innerHTML = `
+            <div class="row g-3">
+                <div class="col-12 col-md-6">
+                    <div class="card bg-light">
+                        <div class="card-body text-center">
+                            <h5 class="card-title text-primary">${formatCurrency(results.debtLimit)}</h5>
+                            <p class="card-text">Maximum Debt Limit</p>
+                        </div>
+                    </div>
+                </div>
+                <div class="col-12 col-md-6">
+                    <div class="card bg-light">
+                        <div class="card-body text-center">
+                            <h5 class="card-title text-success">${formatCurrency(results.availableCapacity)}</h5>
+                            <p class="card-text">Available Capacity</p>
+                        </div>
+                    </div>
+                </div>
+                <div class="col-12 col-md-6">
+                    <div class="card bg-light">
+                        <div class="card-body text-center">
+                            <h5 class="card-title text-warning">${results.debtUsage.toFixed(1)}%</h5>
+                            <p class="card-text">Current Debt Usage</p>
+                        </div>
+                    </div>
+                </div>
+                <div class="col-12 col-md-6">
+                    <div class="card bg-light">
+                        <div class="card-body text-center">
+                            <h5 class="card-title text-info">${formatCurrency(results.maxDebtService)}</h5>
+                            <p class="card-text">Max Monthly Payment</p>
+                        </div>
+                    </div>
+                </div>
+            </div>
+            
+            <!-- Charts Section -->
+            <div class="row g-3 mt-4">
+                <div class="col-12 col-md-6">
+                    <div class="card">
+                        <div class="card-header">
+                            <h6 class="mb-0"><i class="fas fa-chart-pie me-2"></i>Debt Usage</h6>
+                        </div>
+                        <div class="card-body">
+                            <canvas id="debtUsageChart" height="200"></canvas>
+                        </div>
+                    </div>
+                </div>
+                <div class="col-12 col-md-6">
+                    <div class="card">
+                        <div class="card-header">
+                            <h6 class="mb-0"><i class="fas fa-chart-bar me-2"></i>Income vs Expenses</h6>
+                        </div>
+                        <div class="card-body">
+                            <canvas id="incomeExpensesChart" height="200"></canvas>
+                        </div>
+                    </div>
+                </div>
+            </div>
+            
+            <!-- Calculation History -->
+            <div class="row g-3 mt-4">
+                <div class="col-12">
+                    <div class="card">
+                        <div class="card-header d-flex justify-content-between align-items-center">
+                            <h6 class="mb-0"><i class="fas fa-history me-2"></i>Calculation History</h6>
+                            <button class="btn btn-outline-secondary btn-sm" onclick="clearCalculationHistory('debtBrake')">
+                                <i class="fas fa-trash me-1"></i>Clear History
+                            </button>
+                        </div>
+                        <div class="card-body">
+                            <div id="debtBrakeHistory"></div>
+                        </div>
+                    </div>
+                </div>
+            </div>
+        `;
+        resultsDiv.style.display = 'block';
+        
+        // Load calculation history
+        loadCalculationHistory('debtBrake');
+    }
+}
+
+onInputs('#revenue, #expenses, #existingDebt, #debtServiceRatio', calculateDebtBrake);
+registerCalculator('debtBrake', calculateDebtBrake);
+
+// Global function for the calculate button
+window.calculateDebtBrake = calculateDebtBrake;
@@ -0,0 +1,172 @@
+// Debt snowball calculator with real-time results and charts
+import { formatCurrency, onInputs } from './common.js';
+import { loadCalculationHistory, registerCalculator, saveCalculation } from './history.js';
+
+// Chart instances storage
+const chartInstances = {};
+
+function calculateDebtSnowball() {
+    const monthlyPayment = parseFloat(document.getElementById('monthlyPayment')?.value) || 0;
+    const debtEntries = document.querySelectorAll('.debt-entry');
+    
+    if (monthlyPayment > 0 && debtEntries.length > 0) {
+        const debts = [];
+        debtEntries.forEach(entry => {
+            const name = entry.querySelector('.debt-name')?.value || '';
+            const balance = parseFloat(entry.querySelector('.debt-balance')?.value) || 0;
+            const rate = parseFloat(entry.querySelector('.debt-rate')?.value) || 0;
+            
+            if (name && balance > 0 && rate >= 0) {
+                debts.push({ name, balance, rate });
+            }
+        });
+        
+        if (debts.length > 0) {
+            const strategy = document.getElementById('strategy')?.value || 'snowball';
+            const plan = SMECalculations.repaymentPlan(debts, monthlyPayment, strategy);
+            
+            const results = {
+                totalInterest: plan.totalInterest,
+                totalPaid: plan.totalDebt + plan.totalInterest,
+                totalMonths: plan.totalMonths,
+                monthlyPayment: monthlyPayment,
+                debts: SMECalculations.orderDebts(debts, strategy)
+            };
+            
+            // Update results in real-time
+            updateDebtSnowballResults(results);
+            
+            // Create charts
+            createDebtSnowballCharts(results);
+            
+            // Save calculation
+            saveCalculation('debtSnowball', results);
+        }
+    }
+}
+
+function createDebtSnowballCharts(results) {
+    // Debt Distribution Chart
+    const debtDistributionCtx = document.getElementById('debtDistributionChart');
+    if (debtDistributionCtx) {
+        if (chartInstances.debtDistribution) {
+            chartInstances.debtDistribution.destroy();
+        }
+        
+        const colors = ['#dc3545', '#fd7e14', '#ffc107', '#28a745', '#20c997', '#0dcaf0', '#6f42c1'];
+        
+        chartInstances.debtDistribution = new Chart(debtDistributionCtx, {
+            type: 'doughnut',
+            data: {
+                labels: results.debts.map(debt => debt.name),
+                datasets: [{
+                    data: results.debts.map(debt => debt.balance),
+                    backgroundColor: colors.slice(0, results.debts.length),
+                    borderWidth: 2,
+                    borderColor: '#fff'
+                }]
+            },
+            options: {
+                responsive: true,
+                maintainAspectRatio: false,
+                plugins: {
+                    legend: {
+                        position: 'bottom'
+                    },
+                    tooltip: {
+                        callbacks: {
+                            label: function(context) {
+                                return context.label + ': ' + formatCurrency(context.parsed);
+                            }
+                        }
+                    }
+                }
+            }
+        });
+    }
+}
+
+function updateDebtSnowballResults(results) {
+    const resultsDiv = document.getElementById('results');
+    const resultsContent = document.getElementById('resultsContent');
+    
+    if (resultsDiv && resultsContent) {
+        resultsContent.innerHTML = `
+            <div class="row g-3">
+                <div class="col-12 col-md-6">
+                    <div class="card bg-light">
+                        <div class="card-body text-center">
+                            <h5 class="card-title text-danger">${formatCurrency(results.totalInterest)}</h5>
+                            <p class="card-text">Total Interest</p>
+                        </div>
+                    </div>
+                </div>
+                <div class="col-12 col-md-6">
+                    <div class="card bg-light">
+                        <div class="card-body text-center">
+                            <h5 class="card-title text-primary">${formatCurrency(results.totalPaid)}</h5>
+                            <p class="card-text">Total Paid</p>
+                        </div>
+                    </div>
+                </div>
+                <div class="col-12 col-md-6">
+                    <div class="card bg-light">
+                        <div class="card-body text-center">
+                            <h5 class="card-title text-info">${Math.ceil(results.totalMonths)}</h5>
+                            <p class="card-text">Months to Pay Off</p>
+                        </div>
+                    </div>
+                </div>
+                <div class="col-12 col-md-6">
+                    <div class="card bg-light">
+                        <div class="card-body text-center">
+                            <h5 class="card-title text-success">${formatCurrency(results.monthlyPayment)}</h5>
+                            <p class="card-text">Monthly Payment</p>
+                        </div>
+                    </div>
+                </div>
+            </div>
+            
+            <!-- Charts Section -->
+            <div class="row g-3 mt-4">
+                <div class="col-12">
+                    <div class="card">
+                        <div class="card-header">
+                            <h6 class="mb-0"><i class="fas fa-chart-pie me-2"></i>Debt Distribution</h6>
+                        </div>
+                        <div class="card-body">
+                            <canvas id="debtDistributionChart" height="200"></canvas>
+                        </div>
+                    </div>
+                </div>
+            </div>
+            
+            <!-- Calculation History -->
+            <div class="row g-3 mt-4">
+                <div class="col-12">
+                    <div class="card">
+                        <div class="card-header d-flex justify-content-between align-items-center">
+                            <h6 class="mb-0"><i class="fas fa-history me-2"></i>Calculation History</h6>
+                            <button class="btn btn-outline-secondary btn-sm" onclick="clearCalculationHistory('debtSnowball')">
+                                <i class="fas fa-trash me-1"></i>Clear History
+                            </button>
+                        </div>
+                        <div class="card-body">
+                            <div id="debtSnowballHistory"></div>
+                        </div>
+                    </div>
+                </div>
+            </div>
+        `;
+        resultsDiv.style.display = 'block';
+        
+        // Load calculation history
+        loadCalculationHistory('debtSnowball');
+    }
+}
+
+onInputs('#monthlyPayment', calculateDebtSnowball);
+registerCalculator('debtSnowball', calculateDebtSnowball);
+
+// Global function for the calculate button
+window.calculateDebtSnowball = calculateDebtSnowball;
@@ -0,0 +1,66 @@
+// Export of the results on a tool page
+function exportToPDF() {
+    const resultsContent = document.getElementById('resultsContent');
+    if (resultsContent) {
+        // Create a new window with the results
+        const printWindow = window.open('', '_blank');
+        printWindow.document.write(`
+            <html>
+                <head>
+                    <title>SME Debt Management Tool - Results</title>
+                    <style>
+                        body { font-family: Arial, sans-serif; margin: 20px; }
+                        .card { border: 1px solid #ddd; padding: 15px; margin: 10px 0; border-radius: 5px; }
+                        .text-primary { color: #007bff; }
+                        .text-success { color: #28a745; }
+                        .text-danger { color: #dc3545; }
+                        .text-warning { color: #ffc107; }
+                        .text-info { color: #17a2b8; }
+                        .text-dark { color: #343a40; }
+                        .row { display: flex; flex-wrap: wrap; }
+                        .col-12 { width: 100%; }
+                        .col-md-6 { width: 50%; }
+                        @media (max-width: 768px) { .col-md-6 { width: 100%; } }
+                    </style>
+                </head>
+                <body>
+                    <h1>SME Debt Management Tool - Results</h1>
+                    <p>Generated on: ${new Date().toLocaleDateString('de-DE')}</p>
+                    ${resultsContent.innerHTML.replace(/<canvas[^>]*><\/canvas>/g, '<p class="text-muted">Chart data available in web version</p>')}
+                </body>
+            </html>
+        `);
+        printWindow.document.close();
+        printWindow.print();
+    }
+}
+
+function exportToExcel() {
+    const resultsContent = document.getElementById('resultsContent');
+    if (resultsContent) {
+        // Create CSV data
+        const cards = resultsContent.querySelectorAll('.card .card-body');
+        let csvData = 'Metric,Value\n';
+        
+        cards.forEach(card => {
+            const title = card.querySelector('.card-title')?.textContent || '';
+            const text = card.querySelector('.card-text')?.textContent || '';
+            if (title && text && !title.includes('Chart')) {
+                csvData += `"${text}","${title}"\n`;
+            }
+        });
+        
+        // Download CSV
+        const blob = new Blob([csvData], { type: 'text/csv' });
+        const url = window.URL.createObjectURL(blob);
+        const a = document.createElement('a');
+        a.href = url;
+        a.download = 'sme-debt-results.csv';
+        a.click();
+        window.URL.revokeObjectURL(url);
+    }
+}
+
+// Global functions for the export buttons
+window.exportToPDF = exportToPDF;
+window.exportToExcel = exportToExcel;
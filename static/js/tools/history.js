@@ -0,0 +1,134 @@
+// Calculation history of the tool pages, kept in localStorage
+import { formatCurrency } from './common.js';
+
+// Calculator of each tool on this page, so a saved calculation can be run again
+const calculators = {};
+
+// Register the calculator of a tool page and show its saved calculations
+export function registerCalculator(type, calculate) {
+    calculators[type] = calculate;
+    loadCalculationHistory(type);
+}
+
+export function saveCalculation(type, results) {
+    const calculations = JSON.parse(localStorage.getItem('smeCalculations') || '{}');
+    if (!calculations[type]) {
+        calculations[type] = [];
+    }
+    
+    const calculation = {
+        id: Date.now(),
+        timestamp: new Date().toISOString(),
+        results: results,
+        inputs: getCurrentInputs(type)
+    };
+    
+    calculations[type].unshift(calculation);
+    
+    // Keep only last 10 calculations
+    if (calculations[type].length > 10) {
+        calculations[type] = calculations[type].slice(0, 10);
+    }
+    
+    localStorage.setItem('smeCalculations', JSON.stringify(calculations));
+}
+
+function getCurrentInputs(type) {
+    const inputs = {};
+    
+    if (type === 'debtBrake') {
+        inputs.revenue = document.getElementById('revenue')?.value || '';
+        inputs.expenses = document.getElementById('expenses')?.value || '';
+        inputs.existingDebt = document.getElementById('existingDebt')?.value || '';
+        inputs.debtServiceRatio = document.getElementById('debtServiceRatio')?.value || '';
+    } else if (type === 'costAnalysis') {
+        inputs.principal = document.getElementById('principal')?.value || '';
+        inputs.interestRate = document.getElementById('interestRate')?.value || '';
+        inputs.term = document.getElementById('term')?.value || '';
+        inputs.fees = document.getElementById('fees')?.value || '';
+        inputs.monthlyFees = document.getElementById('monthlyFees')?.value || '';
+        inputs.opportunityCost = document.getElementById('opportunityCost')?.value || '';
+    }
+    
+    return inputs;
+}
+
+export function loadCalculationHistory(type) {
+    const calculations = JSON.parse(localStorage.getItem('smeCalculations') || '{}');
+    const history = calculations[type] || [];
+    const historyDiv = document.getElementById(`${type}History`);
+    
+    if (historyDiv && history.length > 0) {
+        historyDiv.innerHTML = history.map(calc => `
+            <div class="card mb-2">
+                <div class="card-body">
+                    <div class="d-flex justify-content-between align-items-start">
+                        <div>
+                            <h6 class="card-title mb-1">${new Date(calc.timestamp).toLocaleString('de-DE')}</h6>
+                            <p class="card-text small text-muted mb-0">
+                                ${type === 'debtBrake' ? `Revenue: ${formatCurrency(calc.results.revenue)}` : 
+                                  type === 'costAnalysis' ? `Principal: ${formatCurrency(calc.results.principal)}` : 
+                                  `Monthly Payment: ${formatCurrency(calc.results.monthlyPayment)}`}
+                            </p>
+                        </div>
+                        <div class="btn-group btn-group-sm">
+                            <button class="btn btn-outline-primary" onclick="loadCalculation('${type}', ${calc.id})">
+                                <i class="fas fa-undo me-1"></i>Load
+                            </button>
+                            <button class="btn btn-outline-danger" onclick="deleteCalculation('${type}', ${calc.id})">
+                                <i class="fas fa-trash me-1"></i>Delete
+                            </button>
+                        </div>
+                    </div>
+                </div>
+            </div>
+        `).join('');
+    } else if (historyDiv) {
+        historyDiv.innerHTML = '<p class="text-muted text-center">No calculation history available.</p>';
+    }
+}
+
+function loadCalculation(type, id) {
+    const calculations = JSON.parse(localStorage.getItem('smeCalculations') || '{}');
+    const calculation = calculations[type]?.find(calc => calc.id === id);
+    
+    if (calculation) {
+        // Load inputs
+        Object.entries(calculation.inputs).forEach(([key, value]) => {
+            const input = document.getElementById(key);
+            if (input) {
+                input.value = value;
+            }
+        });
+        
+        // Trigger calculation
+        if (calculators[type]) {
+            calculators[type]();
+        }
+        
+        showMobileSuccess('Calculation loaded successfully!');
+    }
+}
+
+function deleteCalculation(type, id) {
+    const calculations = JSON.parse(localStorage.getItem('smeCalculations') || '{}');
+    if (calculations[type]) {
+        calculations[type] = calculations[type].filter(calc => calc.id !== id);
+        localStorage.setItem('smeCalculations', JSON.stringify(calculations));
+        loadCalculationHistory(type);
+        showMobileSuccess('Calculation deleted successfully!');
+    }
+}
+
+function clearCalculationHistory(type) {
+    const calculations = JSON.parse(localStorage.getItem('smeCalculations') || '{}');
+    calculations[type] = [];
+    localStorage.setItem('smeCalculations', JSON.stringify(calculations));
+    loadCalculationHistory(type);
+    showMobileSuccess('Calculation history cleared!');
+}
+
+// Global functions for the buttons in the history list
+window.loadCalculation = loadCalculation;
+window.deleteCalculation = deleteCalculation;
+window.clearCalculationHistory = clearCalculationHistory;
@@ -1,83 +1,195 @@
 // Service Worker for SME Debt Management Tool
-const CACHE_NAME = 'sme-debt-tool-v1';
-const urlsToCache = [
-    '/',
-    '/static/css/style.css',
-    '/static/js/main.js',
-    '/static/js/calculations.js',
-    '/static/favicon.ico',
-    '/static/manifest.json',
-    'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css',
-    'https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css',
-    'https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js',
-    'https://cdn.jsdelivr.net/npm/chart.js'
-];
-
-// Install event - cache resources
-self.addEventListener('install', function(event) {
-    event.waitUntil(
-        caches.open(CACHE_NAME)
-            .then(function(cache) {
-                console.log('Opened cache');
-                return cache.addAll(urlsToCache);
-            })
-    );
-});
+// The server fills in the asset manifest and start pages (assets.py), so every
+// change to a stylesheet or script gives the service worker new caches.
+//
+// Strategies:
+// - fingerprinted assets: precached on install, then cache-first (they never change)
+// - pages in every language: stale-while-revalidate, start pages precached for offline use
+// - other GETs (CDN libraries, favicon, manifest): cache-first for version-pinned
+//   CDN URLs, stale-while-revalidate otherwise
+// Runtime caches are kept within a byte budget, least recently used entries first.
+const ASSET_VERSION = 'dev';
+const ASSET_URLS = {};
+const PAGE_URLS = [];
 
-// Fetch event - serve from cache when offline
-self.addEventListener('fetch', function(event) {
-    event.respondWith(
-        caches.match(event.request)
-            .then(function(response) {
-                // Return cached version or fetch from network
-                if (response) {
-                    return response;
-                }
-                
-                // Clone the request
-                const fetchRequest = event.request.clone();
-                
-                return fetch(fetchRequest).then(function(response) {
-                    // Check if valid response
-                    if (!response || response.status !== 200 || response.type !== 'basic') {
-                        return response;
-                    }
-                    
-                    // Clone the response
-                    const responseToCache = response.clone();
-                    
-                    caches.open(CACHE_NAME)
-                        .then(function(cache) {
-                            cache.put(event.request, responseToCache);
-                        });
-                    
-                    return response;
-                }).catch(function() {
-                    // Return offline page for navigation requests
-                    if (event.request.destination === 'document') {
-                        return caches.match('/');
-                    }
-                });
-            })
-    );
+const CACHE_PREFIX = 'sme-debt-tool-';
+const PRECACHE = CACHE_PREFIX + 'precache-' + ASSET_VERSION;
+// Pages link the fingerprinted assets of one version, so they are cached per version too
+const PAGE_CACHE = CACHE_PREFIX + 'pages-' + ASSET_VERSION;
+const RUNTIME_CACHE = CACHE_PREFIX + 'runtime';
+const CURRENT_CACHES = [PRECACHE, PAGE_CACHE, RUNTIME_CACHE];
+
+const CACHE_BUDGETS = {};  // bytes
+CACHE_BUDGETS[PAGE_CACHE] = 2 * 1024 * 1024;
+CACHE_BUDGETS[RUNTIME_CACHE] = 8 * 1024 * 1024;
+const SIZE_HEADER = 'X-SW-Body-Size';
+
+const PRECACHED_URLS = new Set(Object.values(ASSET_URLS));
+const FINGERPRINTED = /\.[0-9a-f]{12}\.(css|js)$/;
+const CDN_HOSTS = ['cdn.jsdelivr.net', 'cdnjs.cloudflare.com'];
+// CDN URLs that name an exact version, such as bootstrap@5.3.0 or font-awesome/6.0.0
+const VERSION_PINNED = /@\d+\.\d+\.\d+|\/\d+\.\d+\.\d+\//;
+
+// Store a copy of response, recording its size, as the most recently used entry
+function store(cacheName, request, response) {
+    return response.blob().then(function(body) {
+        const headers = new Headers(response.headers);
+        headers.set(SIZE_HEADER, String(body.size));
+        const copy = new Response(body, {status: response.status, statusText: response.statusText, headers: headers});
+        return caches.open(cacheName).then(function(cache) {
+            // keys() lists entries in insertion order, so re-inserting marks an entry as used
+            return cache.delete(request)
+                .then(function() { return cache.put(request, copy); })
+                .then(function() { return trim(cache, CACHE_BUDGETS[cacheName]); });
+        });
+    });
+}
+
+// Mark a cached entry as used by moving it to the end of the cache
+function touch(cacheName, request, cached) {
+    return caches.open(cacheName).then(function(cache) {
+        return cache.delete(request).then(function() { return cache.put(request, cached); });
+    });
+}
+
+// Evict least recently used entries until the cache fits its budget
+function trim(cache, budget) {
+    if (!budget) {
+        return Promise.resolve();
+    }
+    return cache.keys().then(function(requests) {
+        return Promise.all(requests.map(function(request) {
+            return cache.match(request).then(function(response) {
+                return response ? Number(response.headers.get(SIZE_HEADER)) || 0 : 0;
+            });
+        })).then(function(sizes) {
+            let total = sizes.reduce(function(sum, size) { return sum + size; }, 0);
+            const evicted = [];
+            for (let i = 0; i < requests.length && total > budget; i++) {
+                evicted.push(cache.delete(requests[i]));
+                total -= sizes[i];
+            }
+            return Promise.all(evicted);
+        });
+    });
+}
+
+function cacheFirst(event, cacheName) {
+    const request = event.request;
+    event.respondWith(caches.open(cacheName).then(function(cache) {
+        return cache.match(request);
+    }).then(function(cached) {
+        if (cached) {
+            if (CACHE_BUDGETS[cacheName]) {
+                event.waitUntil(touch(cacheName, request, cached.clone()));
+            }
+            return cached;
+        }
+        return fetch(request).then(function(response) {
+            // Opaque (no-cors) responses are left to the HTTP cache: their size is unknown
+            if (response.ok) {
+                event.waitUntil(store(cacheName, request, response.clone()));
+            }
+            return response;
+        });
+    }));
+}
+
+function staleWhileRevalidate(event, cacheName, fallback) {
+    const request = event.request;
+    const network = fetch(request).then(function(response) {
+        if (response.ok) {
+            event.waitUntil(store(cacheName, request, response.clone()));
+        }
+        return response;
+    });
+    // Keep the worker alive until the cached copy has been refreshed
+    event.waitUntil(network.catch(function() {}));
+    event.respondWith(caches.open(cacheName).then(function(cache) {
+        return cache.match(request);
+    }).then(function(cached) {
+        return cached || network.catch(function() {
+            return fallback ? fallback(request) : Response.error();
+        });
+    }));
+}
+
+// Offline and not cached yet: the start page of the same language, if it is cached
+function offlinePage(request) {
+    const path = new URL(request.url).pathname;
+    const start = PAGE_URLS.find(function(url) {
+        const directory = url.slice(0, url.lastIndexOf('/') + 1);
+        return directory !== '/' && path.startsWith(directory);
+    }) || PAGE_URLS[0];
+    return caches.open(PAGE_CACHE).then(function(cache) {
+        return start ? cache.match(start) : undefined;
+    }).then(function(cached) {
+        return cached || Response.error();
+    });
+}
+
+// Install event - precache the fingerprinted assets and the start pages
+self.addEventListener('install', function(event) {
+    event.waitUntil(Promise.all([
+        caches.open(PRECACHE).then(function(cache) {
+            return cache.addAll(Array.from(PRECACHED_URLS));
+        }),
+        Promise.all(PAGE_URLS.map(function(url) {
+            return fetch(url).then(function(response) {
+                return response.ok ? store(PAGE_CACHE, url, response) : undefined;
+            }).catch(function() {});
+        }))
+    ]).then(function() {
+        return self.skipWaiting();
+    }));
 });
 
-// Activate event - clean up old caches
+// Activate event - remove the caches of earlier versions
 self.addEventListener('activate', function(event) {
     event.waitUntil(
         caches.keys().then(function(cacheNames) {
-            return Promise.all(
-                cacheNames.map(function(cacheName) {
-                    if (cacheName !== CACHE_NAME) {
-                        console.log('Deleting old cache:', cacheName);
-                        return caches.delete(cacheName);
-                    }
-                })
-            );
+            return Promise.all(cacheNames.map(function(cacheName) {
+                if (cacheName.startsWith(CACHE_PREFIX) && !CURRENT_CACHES.includes(cacheName)) {
+                    console.log('Deleting old cache:', cacheName);
+                    return caches.delete(cacheName);
+                }
+            }));
+        }).then(function() {
+            return self.clients.claim();
         })
     );
 });
 
+// Fetch event - pick a strategy by the kind of request
+self.addEventListener('fetch', function(event) {
+    const request = event.request;
+    if (request.method !== 'GET') {
+        return;
+    }
+    const url = new URL(request.url);
+
+    if (url.origin === self.location.origin) {
+        if (url.pathname.startsWith('/api/')) {
+            return;  // calculations always use the network
+        }
+        if (PRECACHED_URLS.has(url.pathname)) {
+            cacheFirst(event, PRECACHE);
+        } else if (FINGERPRINTED.test(url.pathname)) {
+            cacheFirst(event, RUNTIME_CACHE);  // linked from a page of another version
+        } else if (request.mode === 'navigate' || (request.headers.get('Accept') || '').includes('text/html')) {
+            staleWhileRevalidate(event, PAGE_CACHE, offlinePage);
+        } else {
+            staleWhileRevalidate(event, RUNTIME_CACHE);
+        }
+    } else if (CDN_HOSTS.includes(url.hostname)) {
+        if (VERSION_PINNED.test(url.pathname)) {
+            cacheFirst(event, RUNTIME_CACHE);
+        } else {
+            staleWhileRevalidate(event, RUNTIME_CACHE);
+        }
+    }
+});
+
 // Background sync for offline calculations
 self.addEventListener('sync', function(event) {
     if (event.tag === 'background-sync') {